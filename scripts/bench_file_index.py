@@ -0,0 +1,81 @@
+"""
+Benchmark read_directory_tool-style listings on a synthetic monorepo: the old
+rglob + sort over everything vs the ignore-aware FileIndex walker, cold and
+warm (cached) runs.
+
+    python scripts/bench_file_index.py
+    python scripts/bench_file_index.py --vendor-files 100000
+
+The tree (a small src/ plus a large node_modules/ and .venv/) is generated in
+a temporary directory and removed afterwards.
+"""
+import argparse
+import sys
+import tempfile
+import time
+from itertools import islice
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+from src.file_index import FileIndex  # noqa: E402
+
+LIMIT = 50
+
+
+def _make_tree(root: Path, vendor_files: int) -> None:
+    for i in range(40):
+        pkg = root / "src" / f"pkg{i}"
+        pkg.mkdir(parents=True)
+        for j in range(10):
+            (pkg / f"mod{j}.py").write_text("x = 1\n")
+    (root / "build").mkdir()
+    (root / ".gitignore").write_text("build/\n*.log\n")
+    per_dir = 100
+    for vendor in ("node_modules", ".venv"):
+        for d in range(vendor_files // per_dir // 2):
+            pkg = root / vendor / f"dep{d}" / "lib"
+            pkg.mkdir(parents=True)
+            for j in range(per_dir):
+                (pkg / f"f{j}.py").touch()
+
+
+def _old_listing(path: Path, pattern: str) -> list[Path]:
+    items = list(path.rglob(pattern))
+    items.sort(key=lambda p: (not p.is_dir(), str(p)))
+    return items[:LIMIT]
+
+
+def _timed(fn) -> tuple[float, int]:
+    start = time.perf_counter()
+    n = len(fn())
+    return (time.perf_counter() - start) * 1000, n
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--vendor-files", type=int, default=50000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        start = time.perf_counter()
+        _make_tree(root, args.vendor_files)
+        print(f"Generated tree with ~{args.vendor_files + 400} files in {time.perf_counter() - start:.1f}s\n")
+
+        index = FileIndex(root)
+        for pattern in ("*.py", "mod3.py"):
+            old_ms, old_n = _timed(lambda: _old_listing(root, pattern))
+            cold_ms, new_n = _timed(lambda: list(islice(index.find(pattern), LIMIT + 1)))
+            warm = [_timed(lambda: list(islice(index.find(pattern), LIMIT + 1)))[0] for _ in range(args.repeat)]
+            print(f"pattern {pattern!r}:")
+            print(f"  rglob + sort (old)   {old_ms:>9.1f} ms  ({old_n} shown)")
+            print(f"  FileIndex cold       {cold_ms:>9.1f} ms  ({min(new_n, LIMIT)} shown)")
+            print(f"  FileIndex warm       {min(warm):>9.1f} ms")
+        print(f"\nDirectory cache: {index.hits} hits, {index.misses} scans")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Measure import cost of the CLI and the main modules with `python -X importtime`,
+each in a fresh interpreter, plus the wall time of `src/main.py --help`.
+
+    python scripts/bench_import.py
+    python scripts/bench_import.py --repeat 5 --top 15 --json bench_results/import.json
+
+Per module the median total (cumulative µs of the top-level import) is shown,
+and for the first module the heaviest imports it pulls in.
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+MODULES = ["src.main", "src.agents", "src.llm", "src.tools", "src.crew"]
+
+
+def importtime(module: str) -> dict[str, tuple[int, int]]:
+    """{imported name: (self µs, cumulative µs)} for one fresh `import module`."""
+    code = f"import sys; sys.path.insert(0, {str(ROOT)!r}); import {module}"
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{proc.stderr[-2000:]}")
+    timings: dict[str, tuple[int, int]] = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        timings[name] = (int(self_us), int(cumulative))
+    return timings
+
+
+def help_wall() -> float:
+    start = time.perf_counter()
+    subprocess.run([sys.executable, str(ROOT / "src" / "main.py"), "--help"], capture_output=True, check=True)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--top", type=int, default=10, help="Heaviest imports to list for the first module")
+    parser.add_argument("--modules", nargs="+", default=MODULES)
+    parser.add_argument("--json", type=Path, default=None, help="Also write the results to this file")
+    args = parser.parse_args()
+
+    results: dict[str, dict] = {}
+    print(f"{'module':<14} {'total ms':>9} {'crewai':>7}")
+    for module in args.modules:
+        runs = [importtime(module) for _ in range(args.repeat)]
+        total = statistics.median(r[module][1] for r in runs) / 1000
+        results[module] = {"total_ms": round(total, 1), "imports_crewai": "crewai" in runs[0]}
+        print(f"{module:<14} {total:>9.1f} {'yes' if 'crewai' in runs[0] else 'no':>7}")
+        if module == args.modules[0]:
+            heaviest = sorted(runs[0].items(), key=lambda kv: -kv[1][1])[1:args.top + 1]
+            results[module]["heaviest"] = {name: round(c / 1000, 1) for name, (_, c) in heaviest}
+
+    helps = [help_wall() for _ in range(args.repeat)]
+    results["main --help"] = {"wall_ms": round(statistics.median(helps) * 1000, 1)}
+    print(f"\n`src/main.py --help` wall: {results['main --help']['wall_ms']:.1f} ms")
+    first = args.modules[0]
+    if results[first].get("heaviest"):
+        print(f"\nHeaviest imports under {first} (cumulative ms):")
+        for name, ms in results[first]["heaviest"].items():
+            print(f"  {ms:>9.1f}  {name.strip()}")
+    if args.json:
+        args.json.parent.mkdir(parents=True, exist_ok=True)
+        args.json.write_text(json.dumps(results, indent=2), encoding="utf-8")
+        print(f"\nSaved {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Simulate many runs storing slightly reworded versions of the same decisions
+and compare memory growth and retrieval latency with near-duplicate merging
+and retention on vs off (exact duplicates only, unlimited).
+
+    python scripts/bench_memory_dedup.py
+    python scripts/bench_memory_dedup.py --runs 500 --per-run 12 --decisions 300 --retention "*=200"
+
+Uses a temporary directory; project memory is untouched.
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+from src.memory_store import MemoryStore  # noqa: E402
+
+CATEGORIES = ["architecture", "api", "library", "preference", "bug_fix", "security"]
+FILLER = ["the", "our", "service", "layer", "we", "chose", "use", "for", "all", "new", "code", "default"]
+
+
+def _decisions(n: int, rng: random.Random) -> list[tuple[str, list[str]]]:
+    """`n` distinct base decisions: a category and 6-12 content words."""
+    return [
+        (rng.choice(CATEGORIES), [f"w{rng.randrange(5000)}" for _ in range(rng.randint(6, 12))])
+        for _ in range(n)
+    ]
+
+
+def _reword(words: list[str], rng: random.Random) -> str:
+    """Drop or add a filler word or two, as an LLM restating a decision would."""
+    words = list(words)
+    for _ in range(rng.randint(0, 2)):
+        if rng.random() < 0.5 and len(words) > 4:
+            words.pop(rng.randrange(len(words)))
+        else:
+            words.insert(rng.randrange(len(words) + 1), rng.choice(FILLER))
+    return " ".join(words)
+
+
+def simulate(args: argparse.Namespace, dedup: bool) -> dict:
+    os.environ["MEMORY_DEDUP_THRESHOLD"] = str(args.threshold) if dedup else "off"
+    os.environ["MEMORY_RETENTION"] = args.retention if dedup else "none"
+    rng = random.Random(7)
+    base = _decisions(args.decisions, rng)
+    with tempfile.TemporaryDirectory() as tmp:
+        store = MemoryStore(Path(tmp) / "memory.jsonl")
+        store_times = []
+        for _ in range(args.runs):
+            batch = [
+                {"category": category, "content": _reword(words, rng)}
+                for category, words in rng.sample(base, args.per_run)
+            ]
+            start = time.perf_counter()
+            store.store_many(batch)
+            store_times.append(time.perf_counter() - start)
+        queries = [" ".join(rng.sample(words, 3)) for _, words in rng.sample(base, 50)]
+        store.retrieve(queries[0])  # catch the BM25 index up with the log before timing
+        start = time.perf_counter()
+        for query in queries:
+            store.retrieve(query, limit=10)
+        retrieve_ms = (time.perf_counter() - start) / len(queries) * 1000
+        stats = store.stats()
+        return {
+            "records": stats["records"],
+            "log_kb": stats["bytes"] / 1024,
+            "store_ms": statistics.median(store_times) * 1000,
+            "retrieve_ms": retrieve_ms,
+        }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=200)
+    parser.add_argument("--per-run", type=int, default=12, help="Decisions stored per run")
+    parser.add_argument("--decisions", type=int, default=300, help="Distinct underlying decisions")
+    parser.add_argument("--threshold", type=float, default=0.65, help="MEMORY_DEDUP_THRESHOLD when on")
+    parser.add_argument("--retention", default="*=500", help="MEMORY_RETENTION when on (off by default in the store)")
+    args = parser.parse_args()
+
+    print(f"{args.runs} runs x {args.per_run} decisions, {args.decisions} distinct decisions")
+    print(f"{'mode':<20} {'records':>8} {'log KB':>8} {'store ms':>9} {'retrieve ms':>12}")
+    for label, dedup in (("exact only", False), ("near-dup + retention", True)):
+        r = simulate(args, dedup)
+        print(f"{label:<20} {r['records']:>8} {r['log_kb']:>8.0f} {r['store_ms']:>9.2f} {r['retrieve_ms']:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Benchmark keyword retrieval over project memory: BM25 inverted index vs the
+old linear substring scan, at increasing record counts.
+
+    python scripts/bench_memory_index.py
+    python scripts/bench_memory_index.py --sizes 1000 10000 100000 --queries 200
+
+Uses a synthetic corpus in a temporary directory; project memory is untouched.
+"""
+import argparse
+import json
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+from src.memory_store import MemoryStore  # noqa: E402
+
+CATEGORIES = ["architecture", "api", "library", "preference", "bug_fix", "security"]
+# Zipf-ish vocabulary: a few very common words and a long tail of rare ones.
+VOCAB = [f"term{i}" for i in range(20000)]
+WEIGHTS = [1 / (i + 1) for i in range(len(VOCAB))]
+
+
+def _write_corpus(path: Path, n: int, rng: random.Random) -> None:
+    with path.open("w", encoding="utf-8") as f:
+        for rid in range(1, n + 1):
+            words = rng.choices(VOCAB, WEIGHTS, k=rng.randint(8, 30))
+            f.write(json.dumps({
+                "id": rid,
+                "category": rng.choice(CATEGORIES),
+                "content": " ".join(words),
+                "tags": rng.choices(VOCAB[:500], k=2),
+            }) + "\n")
+
+
+def _linear_scan(store: MemoryStore, query: str, limit: int = 10) -> list[dict]:
+    q = query.lower()
+    hits = [r for r in store.records() if q in r["content"] or q in " ".join(r["tags"])]
+    return hits[-limit:]
+
+
+def _median_ms(fn, queries: list[str]) -> float:
+    times = []
+    for q in queries:
+        start = time.perf_counter()
+        fn(q)
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--scan-queries", type=int, default=5, help="Queries for the (slow) linear baseline")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    print(f"{'records':>9} {'build s':>8} {'bm25 ms':>9} {'scan ms':>9} {'speedup':>8}")
+    for n in args.sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            log = Path(tmp) / "project_memory.jsonl"
+            _write_corpus(log, n, rng)
+            store = MemoryStore(log)
+
+            start = time.perf_counter()
+            store.search_index()
+            build = time.perf_counter() - start
+
+            # Two-word queries drawn from the mid/long tail, like real lookups.
+            queries = [" ".join(rng.choices(VOCAB[50:5000], k=2)) for _ in range(args.queries)]
+            bm25 = _median_ms(lambda q: store.retrieve(q), queries)
+            scan = _median_ms(lambda q: _linear_scan(store, q), queries[: args.scan_queries])
+            print(f"{n:>9} {build:>8.2f} {bm25:>9.3f} {scan:>9.2f} {scan / bm25:>7.0f}x")
+
+
+if __name__ == "__main__":
+    main()
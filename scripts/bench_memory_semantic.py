@@ -0,0 +1,68 @@
+"""
+Benchmark semantic memory recall: embedding build time and cosine top-k
+query latency (single and batched) against record count.
+
+    python scripts/bench_memory_semantic.py
+    python scripts/bench_memory_semantic.py --sizes 1000 10000 100000 --batch 32
+
+Uses a synthetic corpus in a temporary directory; requires numpy.
+"""
+import argparse
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+from bench_memory_index import VOCAB, _write_corpus  # noqa: E402
+from src.memory_store import MemoryStore  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--batch", type=int, default=32, help="Queries per batched search")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    print(f"{'records':>9} {'embed s':>8} {'query ms':>9} {'fused ms':>9} {'batch ms/q':>11}")
+    for n in args.sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            log = Path(tmp) / "project_memory.jsonl"
+            _write_corpus(log, n, rng)
+            store = MemoryStore(log)
+            store.search_index()
+
+            start = time.perf_counter()
+            vectors = store.vector_index()
+            build = time.perf_counter() - start
+
+            queries = [" ".join(rng.choices(VOCAB[50:5000], k=2)) for _ in range(args.queries)]
+            single, fused = [], []
+            for q in queries:
+                t0 = time.perf_counter()
+                vectors.search(q)
+                t1 = time.perf_counter()
+                store.retrieve(q, semantic=True)
+                t2 = time.perf_counter()
+                single.append((t1 - t0) * 1000)
+                fused.append((t2 - t1) * 1000)
+
+            batch = queries[: args.batch]
+            t0 = time.perf_counter()
+            vectors.search_many(batch)
+            per_query = (time.perf_counter() - t0) * 1000 / len(batch)
+
+            print(
+                f"{n:>9} {build:>8.2f} {statistics.median(single):>9.2f} "
+                f"{statistics.median(fused):>9.2f} {per_query:>11.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
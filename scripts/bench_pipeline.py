@@ -0,0 +1,233 @@
+"""
+Offline benchmark of the real pipeline (create_elite_dev_crew) against the
+local fake OpenAI-compatible server: end-to-end latency, orchestration
+overhead per task (task wall time minus its LLM time), peak memory, and
+throughput of concurrent batch runs. Canned replies take the crew through
+one review/fix cycle (a critical finding, a patch, a clean re-review).
+
+    python scripts/bench_pipeline.py
+    python scripts/bench_pipeline.py --latency 0.2 --tokens-per-second 80 --repeat 5 --batch 8 --workers 4
+    python scripts/bench_pipeline.py --compare bench_results/pipeline-<commit>-<time>.json
+
+Results are written to bench_results/pipeline-<commit>-<time>.json together
+with the settings, so runs from different commits can be compared
+(--compare prints the deltas against an earlier file). Everything runs in a
+temporary working directory; project output and memory are untouched.
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Optional
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "scripts"))
+
+import fake_llm_server  # noqa: E402
+
+RESULTS_DIR = ROOT / "bench_results"
+TOPIC = "Build a factorial module"
+FINAL = "Thought: I now know the final answer\nFinal Answer: "
+
+
+def canned_replies(files: int = 5) -> list[dict]:
+    """Per-agent replies: the first review finds a critical bug, the fix patches it, the re-review is clean."""
+    modules = "".join(
+        f"\n### `src/mod{m}.py`\n```python\n"
+        + "".join(f"def f{m}_{i}(x):\n    return x + {i}\n" for i in range(40))
+        + "```\n"
+        for m in range(files)
+    )
+    code = (
+        "# Implementation\n\n### `src/app.py`\n```python\ndef factorial(n):\n    if n < 0:\n"
+        "        return None\n    return 1 if n == 0 else n * factorial(n - 1)\n```\n" + modules
+    )
+    fix = (
+        "Fixed.\n\n```diff\n--- a/src/app.py\n+++ b/src/app.py\n@@ -1,4 +1,4 @@\n def factorial(n):\n"
+        "     if n < 0:\n-        return None\n+        raise ValueError('n must be >= 0')\n"
+        "     return 1 if n == 0 else n * factorial(n - 1)\n```\n"
+    )
+    clean = 'No remaining issues. VERDICT: {"critical": 0, "high": 0, "medium": 0, "low": 0}'
+    critical = 'Negative input returns None. VERDICT: {"critical": 1, "high": 0, "medium": 0, "low": 0}'
+    return [
+        {"match": "You are Fixer Agent", "reply": FINAL + fix},
+        {"match": "You are Code Generator Agent", "reply": FINAL + code},
+        {"match": "You are Memory Agent", "reply": FINAL + "Stored 2 decisions."},
+        {"match": "raise ValueError", "reply": FINAL + clean},
+        {"match": "You are Reviewer Agent", "reply": FINAL + critical},
+        {"match": "You are Research Agent", "reply": FINAL + "Use plain Python; no dependencies."},
+        {"match": "You are Architect Agent", "reply": FINAL + "One module, src/app.py, with factorial(n)."},
+    ]
+
+
+def _git_commit() -> dict:
+    def git(*args: str) -> str:
+        try:
+            return subprocess.run(["git", *args], cwd=ROOT, capture_output=True, text=True).stdout.strip()
+        except OSError:
+            return ""
+
+    return {"commit": git("rev-parse", "--short", "HEAD") or "unknown", "dirty": bool(git("status", "--porcelain"))}
+
+
+def run_once(parallel: bool = True) -> dict:
+    """One full crew run in the current directory; returns wall time and per-task telemetry."""
+    from src.context_budget import ContextBudget
+    from src.crew import create_elite_dev_crew
+    from src.review_loop import ReviewLoop
+    from src.telemetry import Telemetry
+
+    loop = ReviewLoop(max_cycles=2)
+    crew = create_elite_dev_crew(loop=loop, verbose=False, parallel=parallel, budget=ContextBudget())
+    telemetry = Telemetry(crew.tasks)
+    start = time.perf_counter()
+    with telemetry.attached():
+        crew.kickoff(inputs={"topic": TOPIC})
+    wall = time.perf_counter() - start
+    report = telemetry.report()
+    return {
+        "wall": wall,
+        "cycles": loop.cycles_run,
+        "tasks": {r["task"]: {"wall": r["wall"], "llm": r["llm_seconds"]} for r in report["tasks"]},
+    }
+
+
+def run_batch(size: int, workers: int) -> dict:
+    from src.batch import BatchRunner
+
+    runner = BatchRunner(workers=workers, max_fix_cycles=2, stream=io.StringIO())
+    start = time.perf_counter()
+    runs = runner.run([(f"bench-{i}", f"{TOPIC} #{i}") for i in range(size)])
+    wall = time.perf_counter() - start
+    return {
+        "runs": size,
+        "workers": workers,
+        "failed": sum(r.status != "done" for r in runs),
+        "wall": round(wall, 3),
+        "runs_per_min": round(size / wall * 60, 2),
+    }
+
+
+def benchmark(args: argparse.Namespace) -> dict:
+    server = fake_llm_server.start(
+        latency=args.latency, tokens_per_second=args.tokens_per_second, replies=canned_replies(args.files)
+    )
+    os.environ.update(
+        DEEPSEEK_API_KEY="fake",
+        DEEPSEEK_BASE_URL=server.base_url,
+        LLM_CACHE_AGENTS="none",
+        LLM_STREAM="1" if args.stream else "0",
+        CREWAI_TRACING_ENABLED="false",
+        OTEL_SDK_DISABLED="true",
+    )
+    import crewai
+
+    run_once(parallel=not args.sequential)  # warm-up: imports, client pools, tokenizer
+    warmup_requests = server.stats()["requests"]
+    runs = [run_once(parallel=not args.sequential) for _ in range(args.repeat)]
+    walls = [r["wall"] for r in runs]
+    overhead = {
+        name: statistics.median(r["tasks"][name]["wall"] - r["tasks"][name]["llm"] for r in runs if name in r["tasks"])
+        for name in runs[0]["tasks"]
+    }
+    llm_stats = server.stats()
+
+    tracemalloc.start()
+    run_once(parallel=not args.sequential)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    batch = run_batch(args.batch, args.workers) if args.batch else None
+    return {
+        "meta": {
+            **_git_commit(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "crewai": getattr(crewai, "__version__", "unknown"),
+            "settings": {k: v for k, v in vars(args).items() if k != "compare"},
+        },
+        "e2e": {
+            "median": round(statistics.median(walls), 4),
+            "min": round(min(walls), 4),
+            "max": round(max(walls), 4),
+            "cycles": runs[0]["cycles"],
+            "llm_requests_per_run": (llm_stats["requests"] - warmup_requests) // args.repeat,
+        },
+        "overhead_per_task": {name: round(v, 4) for name, v in overhead.items()},
+        "overhead_total": round(sum(overhead.values()), 4),
+        "memory": {
+            "python_peak_mb": round(peak / (1 << 20), 2),
+            "max_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        },
+        "batch": batch,
+    }
+
+
+def _flatten(result: dict) -> dict[str, float]:
+    rows = {f"e2e {k}": v for k, v in result["e2e"].items() if k in ("median", "min", "max")}
+    rows["overhead total"] = result["overhead_total"]
+    rows.update({f"overhead {k}": v for k, v in result["overhead_per_task"].items()})
+    rows.update({f"memory {k}": v for k, v in result["memory"].items()})
+    if result.get("batch"):
+        rows["batch runs/min"] = result["batch"]["runs_per_min"]
+        rows["batch failed"] = result["batch"]["failed"]
+    return rows
+
+
+def print_report(result: dict, baseline: Optional[dict] = None) -> None:
+    meta = result["meta"]
+    print(f"commit {meta['commit']}{' (dirty)' if meta['dirty'] else ''}  python {meta['python']}  crewai {meta['crewai']}")
+    old = _flatten(baseline) if baseline else {}
+    if baseline:
+        print(f"baseline {baseline['meta']['commit']} ({baseline['meta']['time']})")
+    print(f"\n{'metric':<28} {'value':>10}" + (f" {'baseline':>10} {'delta':>8}" if baseline else ""))
+    for name, value in _flatten(result).items():
+        line = f"{name:<28} {value:>10}"
+        if name in old:
+            before = old[name]
+            delta = f"{(value - before) / before:+.0%}" if before else "n/a"
+            line += f" {before:>10} {delta:>8}"
+        print(line)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3, help="End-to-end runs to time")
+    parser.add_argument("--latency", type=float, default=0.05, help="Stub delay before the first token")
+    parser.add_argument("--tokens-per-second", type=float, default=0.0, help="Stub reply pacing (0 = instant)")
+    parser.add_argument("--files", type=int, default=5, help="Modules in the canned implementation")
+    parser.add_argument("--stream", action="store_true", help="Stream responses")
+    parser.add_argument("--sequential", action="store_true", help="Run tasks strictly in order")
+    parser.add_argument("--batch", type=int, default=4, help="Runs in the batch throughput test (0 = skip)")
+    parser.add_argument("--workers", type=int, default=2, help="Concurrent batch runs")
+    parser.add_argument("--compare", type=Path, default=None, help="Earlier results file to diff against")
+    args = parser.parse_args()
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)  # artifacts, checkpoints and run dirs go here
+        try:
+            result = benchmark(args)
+        finally:
+            os.chdir(cwd)
+
+    RESULTS_DIR.mkdir(exist_ok=True)
+    out = RESULTS_DIR / f"pipeline-{result['meta']['commit']}-{time.strftime('%Y%m%d-%H%M%S')}.json"
+    out.write_text(json.dumps(result, indent=2), encoding="utf-8")
+    baseline = json.loads(args.compare.read_text(encoding="utf-8")) if args.compare else None
+    print_report(result, baseline)
+    print(f"\nSaved {out}")
+
+
+if __name__ == "__main__":
+    main()
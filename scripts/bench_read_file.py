@@ -0,0 +1,75 @@
+"""
+Benchmark bounded reads (src.file_reader) on a large text file: head, a byte
+range in the middle, and a line range near the end, each without loading the
+file. Reports time and peak Python allocations per read.
+
+    python scripts/bench_read_file.py
+    python scripts/bench_read_file.py --size-mb 256 --naive
+
+The file is generated in a temporary directory (1 GB by default) and removed
+afterwards. --naive also times a full read_text() for comparison.
+"""
+import argparse
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+from src.file_reader import read_range  # noqa: E402
+
+LINE = "2026-01-01T00:00:00Z INFO request handled path=/api/items status=200 ms=12 line={:010d}\n"
+
+
+def _write_file(path: Path, size_mb: int) -> int:
+    """Write ~size_mb of log lines; return the line count."""
+    block_lines = 10000
+    lines = 0
+    target = size_mb << 20
+    with path.open("w", encoding="utf-8") as f:
+        while f.tell() < target:
+            f.write("".join(LINE.format(lines + i) for i in range(block_lines)))
+            lines += block_lines
+    return lines
+
+
+def _measure(label: str, fn) -> None:
+    tracemalloc.start()
+    start = time.perf_counter()
+    text = fn()
+    elapsed = (time.perf_counter() - start) * 1000
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"  {label:<34} {elapsed:>9.1f} ms  peak alloc {peak / 1024:>10.0f} KiB  -> {len(text):>8} chars")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size-mb", type=int, default=1024)
+    parser.add_argument("--naive", action="store_true", help="also time a full read_text()")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "big.log"
+        start = time.perf_counter()
+        lines = _write_file(path, args.size_mb)
+        size = path.stat().st_size
+        print(f"Generated {size / (1 << 20):.0f} MiB, {lines} lines in {time.perf_counter() - start:.1f}s\n")
+
+        _measure("head (default cap)", lambda: read_range(path))
+        _measure("64 KiB at the middle", lambda: read_range(path, offset=size // 2, length=65536))
+        _measure("last 5 lines (line range)", lambda: read_range(path, start_line=lines - 4))
+        _measure("lines 1000-1100", lambda: read_range(path, start_line=1000, end_line=1100))
+        if args.naive:
+            _measure("full read_text()", lambda: path.read_text(encoding="utf-8"))
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Mapped file pages count towards RSS but are page cache, not heap.
+        print(f"\nPeak RSS of this process (includes mapped file pages): {rss / 1024:.0f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Compare the review stage in "single" and "parallel" review mode (REVIEW_MODE)
+on the real pipeline against the local fake LLM server. The stub paces its
+replies (--tokens-per-second), a single review writes one section per concern
+and each specialist pass writes only its own, so the stage's wall time shows
+what running the passes side by side saves. Also reports the prompt tokens
+of the largest review call.
+
+    python scripts/bench_review.py
+    python scripts/bench_review.py --tokens-per-second 100 --words 200 --repeat 3
+
+Everything runs in a temporary working directory; project output and memory are untouched.
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "scripts"))
+
+import fake_llm_server  # noqa: E402
+from bench_pipeline import FINAL, TOPIC, canned_replies  # noqa: E402
+
+CONCERNS = ("Correctness", "Performance", "Security")
+
+
+def _section(title: str, words: int, severity: str) -> str:
+    text = " ".join(f"{title.lower()}{i}" for i in range(words))
+    return f"## {title}\n\n- [{severity}] {title} finding: {text}\n"
+
+
+def replies(words: int) -> list[dict]:
+    """First review: one high correctness issue; re-review after the fix: clean."""
+    def report(concerns: tuple[str, ...], clean: bool) -> str:
+        high = 0 if clean or "Correctness" not in concerns else 1
+        body = "".join(_section(c, words, "high" if c == "Correctness" and high else "low") for c in concerns)
+        low = sum(1 for c in concerns if not (c == "Correctness" and high))
+        return FINAL + body + f'\nVERDICT: {{"critical": 0, "high": {high}, "medium": 0, "low": {low}}}'
+
+    base = [r for r in canned_replies() if "Reviewer Agent" not in r["match"] and r["match"] != "raise ValueError"]
+    rules = base[:3]  # fixer, code generator, memory
+    rules.append({"match": "raise ValueError", "reply": report(CONCERNS, clean=True)})  # after the fix
+    for concern in CONCERNS:
+        rules.append({"match": f"You are {concern} Reviewer", "reply": report((concern,), clean=False)})
+    rules.append({"match": "You are Reviewer Agent", "reply": report(CONCERNS, clean=False)})
+    return rules + base[3:]
+
+
+def run_once(mode: str) -> dict:
+    from src.context_budget import ContextBudget
+    from src.crew import create_elite_dev_crew
+    from src.review_loop import ReviewLoop
+    from src.telemetry import Telemetry
+
+    loop, budget = ReviewLoop(max_cycles=1), ContextBudget()
+    crew = create_elite_dev_crew(loop=loop, verbose=False, budget=budget, review_mode=mode)
+    telemetry = Telemetry(crew.tasks)
+    start = time.perf_counter()
+    with telemetry.attached():
+        crew.kickoff(inputs={"topic": TOPIC})
+    wall = time.perf_counter() - start
+    tasks = {r["task"]: r for r in telemetry.report()["tasks"]}
+    review_calls = [r for r in budget.report() if r["task"].startswith("review_")]
+    return {
+        "wall": wall,
+        "review_wall": tasks["review_1"]["wall"],
+        "verdicts": [v.source for v in loop.verdicts],
+        "cycles": loop.cycles_run,
+        "max_prompt": max((r["prompt_tokens"] // max(r["llm_calls"], 1) for r in review_calls), default=0),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--latency", type=float, default=0.05, help="Stub delay before the first token")
+    parser.add_argument("--tokens-per-second", type=float, default=150.0, help="Stub reply pacing")
+    parser.add_argument("--words", type=int, default=150, help="Words per review section")
+    args = parser.parse_args()
+
+    server = fake_llm_server.start(
+        latency=args.latency, tokens_per_second=args.tokens_per_second, replies=replies(args.words)
+    )
+    os.environ.update(
+        DEEPSEEK_API_KEY="fake",
+        DEEPSEEK_BASE_URL=server.base_url,
+        LLM_CACHE_AGENTS="none",
+        LLM_STREAM="0",
+        CREWAI_TRACING_ENABLED="false",
+        OTEL_SDK_DISABLED="true",
+    )
+    cwd = os.getcwd()
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            for mode in ("single", "parallel"):
+                run_once(mode)  # warm-up
+                results[mode] = [run_once(mode) for _ in range(args.repeat)]
+        finally:
+            os.chdir(cwd)
+
+    print(f"{args.repeat} runs per mode, {args.words} words per review section at {args.tokens_per_second:g} tok/s")
+    print(f"{'mode':<10} {'review_1 s':>10} {'run s':>7} {'cycles':>6} {'max prompt tok':>14}")
+    for mode, runs in results.items():
+        print(
+            f"{mode:<10} {statistics.median(r['review_wall'] for r in runs):>10.2f} "
+            f"{statistics.median(r['wall'] for r in runs):>7.2f} {runs[0]['cycles']:>6} {runs[0]['max_prompt']:>14}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Per-request overhead of the server mode (src/server.py) against a fresh CLI
+process per request, both against the local fake LLM server. Overhead is a
+request's wall time minus the time the stub spent generating its replies.
+
+    python scripts/bench_server.py
+    python scripts/bench_server.py --requests 5 --latency 0.2
+
+Runs execute one at a time in a temporary working directory, so the stub's
+busy time can be attributed to a single request.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "scripts"))
+
+import fake_llm_server  # noqa: E402
+from bench_pipeline import TOPIC, canned_replies  # noqa: E402
+
+
+def _timed(server: fake_llm_server.FakeLLMServer, run) -> tuple[float, float]:
+    """(wall, overhead) of one request; `run` blocks until the request is finished."""
+    busy = server.stats()["busy_seconds"]
+    start = time.perf_counter()
+    run()
+    wall = time.perf_counter() - start
+    return wall, wall - (server.stats()["busy_seconds"] - busy)
+
+
+def cold(server: fake_llm_server.FakeLLMServer, n: int, env: dict) -> list[tuple[float, float]]:
+    cmd = [sys.executable, "-W", "ignore", str(ROOT / "src" / "main.py"), "--quiet", "--no-stream", TOPIC]
+    return [
+        _timed(server, lambda: subprocess.run(cmd, env=env, capture_output=True, check=True))
+        for _ in range(n)
+    ]
+
+
+def warm(server: fake_llm_server.FakeLLMServer, n: int, workers: int) -> tuple[float, list[tuple[float, float]]]:
+    """Startup seconds (imports, warm-up) and (wall, overhead) per request over HTTP."""
+    start = time.perf_counter()
+    from src.server import CrewService, make_server
+
+    service = CrewService(workers=workers)
+    service.warm_up()
+    startup = time.perf_counter() - start
+    http = make_server(service, port=0)
+    threading.Thread(target=http.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{http.server_address[1]}"
+
+    def request(run_id: str) -> None:
+        body = json.dumps({"topic": TOPIC, "id": run_id}).encode("utf-8")
+        urllib.request.urlopen(urllib.request.Request(f"{base}/runs", data=body, method="POST")).read()
+        with urllib.request.urlopen(f"{base}/runs/{run_id}/events") as events:
+            last = [json.loads(line) for line in events][-1]
+        if last.get("status") != "done":
+            raise RuntimeError(f"run {run_id} ended {last.get('status')}: {last.get('error')}")
+
+    try:
+        with service.tool_cache.activated():
+            request("warm-up")  # the first kickoff pays crewai's one-time lazy setup
+            return startup, [_timed(server, lambda i=i: request(f"bench-{i}")) for i in range(n)]
+    finally:
+        http.shutdown()
+        service.shutdown()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=3)
+    parser.add_argument("--latency", type=float, default=0.05, help="Stub delay before the first token")
+    parser.add_argument("--workers", type=int, default=1)
+    args = parser.parse_args()
+
+    server = fake_llm_server.start(latency=args.latency, replies=canned_replies())
+    env = {
+        **os.environ,
+        "DEEPSEEK_API_KEY": "fake",
+        "DEEPSEEK_BASE_URL": server.base_url,
+        "LLM_CACHE_AGENTS": "none",
+        "LLM_STREAM": "0",
+        "CREWAI_TRACING_ENABLED": "false",
+        "OTEL_SDK_DISABLED": "true",
+    }
+    os.environ.update(env)
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            cold_runs = cold(server, args.requests, env)
+            startup, warm_runs = warm(server, args.requests, args.workers)
+        finally:
+            os.chdir(cwd)
+
+    print(f"{'mode':<8} {'wall s':>8} {'overhead s':>10}   (median of {args.requests})")
+    for mode, runs in (("cli", cold_runs), ("server", warm_runs)):
+        print(f"{mode:<8} {statistics.median(w for w, _ in runs):>8.3f} {statistics.median(o for _, o in runs):>10.3f}")
+    print(f"\nServer startup (imports + warm-up, paid once): {startup:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
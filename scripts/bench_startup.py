@@ -0,0 +1,70 @@
+"""
+Measure crew construction cost: the pooled build (one agent per role, one
+shared provider client) against the previous per-task build (a fresh agent
+and LLM client for every task plus the crew's agent list).
+
+    python scripts/bench_startup.py --repeat 5
+
+No LLM calls are made; a placeholder API key is used if none is set.
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+os.environ.setdefault("DEEPSEEK_API_KEY", "bench-placeholder")
+
+from src import llm  # noqa: E402
+from src.crew import AgentRegistry, create_elite_dev_crew  # noqa: E402
+
+# Agent roles per task in the pipeline, then the crew's own agent list.
+PER_TASK_ROLES = [
+    "research", "architect", "code_generator", "reviewer", "fixer",
+    "reviewer", "fixer", "reviewer", "memory",
+] + list(AgentRegistry.FACTORIES)
+
+
+def _per_task_build() -> tuple[int, int]:
+    agents = []
+    for role in PER_TASK_ROLES:
+        llm._provider_llm.cache_clear()  # previous behaviour: new client per agent
+        agents.append(AgentRegistry.factory(role)())
+    return len(agents), len({id(a.llm.inner) for a in agents})
+
+
+def _pooled_build() -> tuple[int, int]:
+    llm._provider_llm.cache_clear()
+    crew = create_elite_dev_crew()
+    return len(crew.agents), len({id(a.llm.inner) for a in crew.agents})
+
+
+def _measure(build, repeat: int) -> tuple[float, int, int]:
+    build()  # warm imports and pydantic schemas
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        agents, clients = build()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1000, agents, clients
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'build':<10} {'ms':>8} {'agents':>7} {'clients':>8}")
+    before = _measure(_per_task_build, args.repeat)
+    after = _measure(_pooled_build, args.repeat)
+    for name, (ms, agents, clients) in (("per-task", before), ("pooled", after)):
+        print(f"{name:<10} {ms:>8.1f} {agents:>7} {clients:>8}")
+    print(f"speedup: {before[0] / after[0]:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Exercise the LLM response cache end to end against the local fake
+OpenAI-compatible server: a repeated request must be served from the cache
+(no second HTTP call), a changed request must miss, and an agent with caching
+switched off must always reach the endpoint.
+
+    python scripts/check_llm_cache.py
+"""
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+import fake_llm_server  # noqa: E402
+
+
+def main() -> None:
+    server = fake_llm_server.start(latency=0.05)
+    os.environ.update(
+        DEEPSEEK_API_KEY="fake",
+        DEEPSEEK_BASE_URL=server.base_url,
+        LLM_CACHE_DIR=tempfile.mkdtemp(),
+        LLM_CACHE_AGENTS="research",
+    )
+    from src.llm import get_llm
+    from src.llm_cache import get_cache
+
+    research, fixer = get_llm("research"), get_llm("fixer")
+    prompt = [{"role": "user", "content": "Summarize FastAPI 0.110 changes"}]
+
+    first = research.call(prompt)
+    second = research.call(prompt)
+    assert first == second, "cached reply differs"
+    assert server.requests == 1, f"expected 1 request, saw {server.requests}"
+
+    research.call([{"role": "user", "content": "Summarize Django 5 changes"}])
+    assert server.requests == 2, "changed prompt should miss"
+
+    fixer.call(prompt)
+    fixer.call(prompt)
+    assert server.requests == 4, "fixer has caching off and must always call the endpoint"
+
+    stats = get_cache().stats()
+    assert (stats["hits"], stats["misses"]) == (1, 2), stats
+    print(f"OK: {server.requests} endpoint calls, cache {stats}")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
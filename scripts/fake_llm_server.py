@@ -0,0 +1,203 @@
+"""
+Local OpenAI-compatible stub for exercising the crew without DeepSeek.
+Serves POST /v1/chat/completions (plain and streaming) with a canned reply
+after a configurable delay, and GET /stats with the number of requests seen.
+With --fail-after N every request after the first N gets a 503, which is
+handy for exercising checkpoint/resume. --replies takes a JSON file of
+[{"match": "Fixer Agent", "reply": "..."}]: the first rule whose text occurs
+in the request's messages picks the reply, so each agent can get its own.
+--latency is the delay before the first token; --tokens-per-second then paces
+the reply (one "token" per whitespace-separated word), streamed or not.
+
+    python scripts/fake_llm_server.py --port 8765 --latency 0.2 --tokens-per-second 50
+    DEEPSEEK_BASE_URL=http://127.0.0.1:8765/v1 DEEPSEEK_API_KEY=fake python -m src.main "..."
+"""
+import argparse
+import json
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+DEFAULT_REPLY = "Thought: I now know the final answer\nFinal Answer: OK"
+
+
+class FakeLLMServer(ThreadingHTTPServer):
+    """ThreadingHTTPServer carrying the stub's settings and request counter."""
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address: tuple[str, int],
+        reply: str = DEFAULT_REPLY,
+        latency: float = 0.0,
+        fail_after: Optional[int] = None,
+        replies: Optional[list[dict]] = None,
+        tokens_per_second: float = 0.0,
+    ):
+        super().__init__(address, _Handler)
+        self.reply = reply
+        self.replies = replies or []
+        self.latency = latency
+        self.tokens_per_second = tokens_per_second
+        self.fail_after = fail_after
+        self.requests = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.busy_seconds = 0.0  # simulated generation time across requests
+        self._lock = threading.Lock()
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def reply_for(self, messages: list[dict]) -> str:
+        text = "\n".join(str(m.get("content", "")) for m in messages)
+        for rule in self.replies:
+            if rule["match"] in text:
+                return rule["reply"]
+        return self.reply
+
+    def count(self) -> int:
+        with self._lock:
+            self.requests += 1
+            return self.requests
+
+    def record(self, usage: dict, seconds: float) -> None:
+        with self._lock:
+            self.prompt_tokens += usage["prompt_tokens"]
+            self.completion_tokens += usage["completion_tokens"]
+            self.busy_seconds += seconds
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "prompt_tokens": self.prompt_tokens,
+                "completion_tokens": self.completion_tokens,
+                "busy_seconds": round(self.busy_seconds, 4),
+            }
+
+    def token_delay(self) -> float:
+        return 1.0 / self.tokens_per_second if self.tokens_per_second > 0 else 0.0
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: FakeLLMServer
+
+    def log_message(self, *args) -> None:  # keep benchmark output clean
+        pass
+
+    def _json(self, status: int, payload: dict) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self) -> None:
+        if self.path.rstrip("/") == "/stats":
+            self._json(200, self.server.stats())
+        else:
+            self._json(404, {"error": "not found"})
+
+    def do_POST(self) -> None:
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self._json(404, {"error": "not found"})
+            return
+        request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        seen = self.server.count()
+        if self.server.fail_after is not None and seen > self.server.fail_after:
+            self._json(503, {"error": {"message": "stub: failing on purpose", "type": "server_error"}})
+            return
+        started = time.perf_counter()
+        time.sleep(self.server.latency)
+        reply = self.server.reply_for(request.get("messages", []))
+        prompt_tokens = sum(len(str(m.get("content", "")).split()) for m in request.get("messages", []))
+        usage = {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": len(reply.split()),
+            "total_tokens": prompt_tokens + len(reply.split()),
+        }
+        model = request.get("model", "fake")
+        cid = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+        delay = self.server.token_delay()
+        if not request.get("stream"):
+            time.sleep(delay * usage["completion_tokens"])
+            self.server.record(usage, time.perf_counter() - started)
+            self._json(200, {
+                "id": cid,
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": reply},
+                    "finish_reason": "stop",
+                }],
+                "usage": usage,
+            })
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.end_headers()
+        for i, word in enumerate(reply.split(" ")):
+            if delay and i:
+                time.sleep(delay)
+            self._chunk(cid, model, {"content": word if i == 0 else " " + word}, None)
+        self._chunk(cid, model, {}, "stop", usage)
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.server.record(usage, time.perf_counter() - started)
+
+    def _chunk(self, cid: str, model: str, delta: dict, finish: Optional[str], usage: Optional[dict] = None) -> None:
+        payload = {
+            "id": cid,
+            "object": "chat.completion.chunk",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{"index": 0, "delta": delta, "finish_reason": finish}],
+        }
+        if usage:
+            payload["usage"] = usage
+        self.wfile.write(f"data: {json.dumps(payload)}\n\n".encode("utf-8"))
+        self.wfile.flush()
+
+
+def start(port: int = 0, **settings) -> FakeLLMServer:
+    """Start the stub on a background thread; port 0 picks a free port."""
+    server = FakeLLMServer(("127.0.0.1", port), **settings)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="OpenAI-compatible stub server.")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds before the first token")
+    parser.add_argument("--tokens-per-second", type=float, default=0.0, help="Reply pacing (0 = instant)")
+    parser.add_argument("--reply", default=DEFAULT_REPLY, help="Canned assistant reply")
+    parser.add_argument("--fail-after", type=int, default=None, help="Answer 503 after this many requests")
+    parser.add_argument("--replies", default=None, help="JSON file of {match, reply} rules")
+    args = parser.parse_args()
+    replies = json.loads(open(args.replies, encoding="utf-8").read()) if args.replies else None
+    server = FakeLLMServer(
+        ("127.0.0.1", args.port),
+        reply=args.reply,
+        latency=args.latency,
+        fail_after=args.fail_after,
+        replies=replies,
+        tokens_per_second=args.tokens_per_second,
+    )
+    print(f"Fake LLM listening on {server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+Multi-process stress test for project memory writes: N processes x T threads
+store unique decisions into one log at the same time (optionally while
+another process keeps compacting it), then the log is checked for lost
+records, id collisions and torn lines. Prints the throughput achieved.
+
+    python scripts/stress_memory.py
+    python scripts/stress_memory.py --procs 8 --threads 4 --records 250 --compact-every 0.5 --bulk 10
+
+Uses a temporary directory unless --path is given; project memory is untouched.
+Exits 1 if any check fails.
+"""
+import argparse
+import multiprocessing as mp
+import os
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+
+def _content(proc: int, thread: int, i: int) -> str:
+    return f"stress p{proc} t{thread} r{i} " + " ".join(uuid.uuid4().hex[:10] for _ in range(5))
+
+
+def worker(path: str, proc: int, threads: int, records: int, bulk: int, start_at: float) -> dict:
+    """Store `records` decisions from `threads` threads; returns {content: id} and timing."""
+    from src.memory_store import MemoryStore
+
+    store = MemoryStore(Path(path))
+    stored: dict[str, int] = {}
+    lock = threading.Lock()
+
+    def run(thread: int) -> None:
+        mine = [_content(proc, thread, i) for i in range(thread, records, threads)]
+        for start in range(0, len(mine), bulk):
+            chunk = [{"category": "stress", "content": c} for c in mine[start:start + bulk]]
+            if bulk == 1:
+                results = [{"id": store.store("stress", chunk[0]["content"])}]
+            else:
+                results = store.store_many(chunk)
+            with lock:
+                stored.update((d["content"], r["id"]) for d, r in zip(chunk, results))
+
+    time.sleep(max(start_at - time.time(), 0))  # start every process together
+    began = time.perf_counter()
+    pool = [threading.Thread(target=run, args=(t,)) for t in range(threads)]
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    return {"stored": stored, "seconds": time.perf_counter() - began, "commits": store._writes.commits}
+
+
+def compactor(path: str, every: float, stop_at: float) -> int:
+    from src.memory_store import MemoryStore
+
+    store, runs = MemoryStore(Path(path)), 0
+    while time.time() < stop_at:
+        time.sleep(every)
+        if Path(path).exists():
+            store.compact()
+            runs += 1
+    return runs
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--procs", type=int, default=6)
+    parser.add_argument("--threads", type=int, default=4, help="Writer threads per process")
+    parser.add_argument("--records", type=int, default=200, help="Decisions stored per process")
+    parser.add_argument("--bulk", type=int, default=1, help="Decisions per store call (1 = store())")
+    parser.add_argument("--compact-every", type=float, default=0.0, help="Seconds between compactions (0 = none)")
+    parser.add_argument("--path", type=Path, default=None, help="Memory log to write (default: a temp file)")
+    args = parser.parse_args()
+
+    os.environ["MEMORY_RETENTION"] = "none"  # count every record
+    tmp = tempfile.TemporaryDirectory()
+    path = str(args.path or Path(tmp.name) / "memory.jsonl")
+    ctx = mp.get_context("spawn")
+    start_at = time.time() + 2.0  # time for the spawned interpreters to import
+    with ctx.Pool(args.procs + 1) as pool:
+        jobs = [
+            pool.apply_async(worker, (path, p, args.threads, args.records, args.bulk, start_at))
+            for p in range(args.procs)
+        ]
+        compactions = None
+        if args.compact_every:
+            compactions = pool.apply_async(compactor, (path, args.compact_every, start_at + 3600))
+        results = [job.get() for job in jobs]
+        wall = max(r["seconds"] for r in results)
+        if compactions is not None:
+            pool.terminate()
+
+    from src.memory_store import MemoryStore
+
+    store = MemoryStore(Path(path))
+    live = {r["content"]: r["id"] for r in store.records()}
+    expected: dict[str, int] = {}
+    for r in results:
+        expected.update(r["stored"])
+    ids = list(expected.values())
+    lost = [c for c in expected if c not in live]
+    moved = [c for c, rid in expected.items() if c in live and live[c] != rid]
+    collisions = len(ids) - len(set(ids))
+    lines = Path(path).read_bytes().splitlines()
+    torn = sum(1 for line in lines if line.strip() and not line.strip().startswith(b"{"))
+    total = len(expected)
+    commits = sum(r["commits"] for r in results)
+
+    print(f"{args.procs} processes x {args.threads} threads, {args.records} decisions each, "
+          f"{'store()' if args.bulk == 1 else f'store_many() x{args.bulk}'}"
+          + (f", compacting every {args.compact_every}s" if args.compact_every else ""))
+    print(f"stored:      {total} decisions in {wall:.2f}s = {total / wall:.0f} stores/s")
+    print(f"commits:     {commits} (avg {total / max(commits, 1):.1f} decisions per fsync'd append)")
+    print(f"lost:        {len(lost)}")
+    print(f"id changes:  {len(moved)}")
+    print(f"collisions:  {collisions}")
+    print(f"torn lines:  {torn}")
+    print(f"live:        {len(live)} records, {store.stats()['bytes']} bytes")
+    tmp.cleanup()
+    ok = total == args.procs * args.records and not lost and not moved and not collisions and not torn
+    print("OK" if ok else "FAILED")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,26 @@
-"""Elite AI Software Development Team agents."""
+"""Elite AI Software Development Team agents.
 
-from .research import research_agent
-from .architect import architect_agent
-from .code_generator import code_generator_agent
-from .reviewer import reviewer_agent
-from .fixer import fixer_agent
-from .memory_agent import memory_agent
+Each factory is imported on first access, so importing the package does not
+pull in crewai and the tools until an agent is actually built.
+"""
+from importlib import import_module
 
-__all__ = [
-    "research_agent",
-    "architect_agent",
-    "code_generator_agent",
-    "reviewer_agent",
-    "fixer_agent",
-    "memory_agent",
-]
+_MODULES = {
+    "research_agent": ".research",
+    "architect_agent": ".architect",
+    "code_generator_agent": ".code_generator",
+    "reviewer_agent": ".reviewer",
+    "review_panel_agent": ".reviewer",
+    "fixer_agent": ".fixer",
+    "memory_agent": ".memory_agent",
+}
+
+__all__ = list(_MODULES)
+
+
+def __getattr__(name: str):
+    if name not in _MODULES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    factory = getattr(import_module(_MODULES[name], __name__), name)
+    globals()[name] = factory
+    return factory
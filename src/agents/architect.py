@@ -8,7 +8,7 @@ from src.tools import read_file_tool, retrieve_decisions_tool
 
 def architect_agent() -> Agent:
     return Agent(
-        llm=get_llm(),
+        llm=get_llm("architect"),
         role="Architect Agent",
         goal="Design scalable, modular architecture. Define folder structure, APIs, interfaces. Select correct libraries and versions.",
         backstory=(
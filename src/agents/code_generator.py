@@ -8,7 +8,7 @@ from src.tools import read_file_tool, read_directory_tool, retrieve_decisions_to
 
 def code_generator_agent() -> Agent:
     return Agent(
-        llm=get_llm(),
+        llm=get_llm("code_generator"),
         role="Code Generator Agent",
         goal="Write clean, production-ready code. Follow the architecture exactly. Add comments, typing, and validation. Follow best practices.",
         backstory=(
@@ -8,7 +8,7 @@ from src.tools import read_file_tool, read_directory_tool, retrieve_decisions_to
 
 def fixer_agent() -> Agent:
     return Agent(
-        llm=get_llm(),
+        llm=get_llm("fixer"),
         role="Fixer Agent",
         goal="Deliver optimal fixes: root-cause solutions, best-practice implementations, and production-grade corrections. Never apply band-aid or superficial fixes.",
         backstory=(
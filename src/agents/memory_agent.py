@@ -3,12 +3,17 @@
 from crewai import Agent
 
 from src.llm import get_llm
-from src.tools import store_decision_tool, retrieve_decisions_tool
+from src.tools import (
+    retrieve_decisions_bulk_tool,
+    retrieve_decisions_tool,
+    store_decision_tool,
+    store_decisions_bulk_tool,
+)
 
 
 def memory_agent() -> Agent:
     return Agent(
-        llm=get_llm(),
+        llm=get_llm("memory"),
         role="Memory Agent",
         goal="Retrieve relevant past project decisions. Store architecture and design decisions. Store user preferences. Update memory after each completed task.",
         backstory=(
@@ -16,7 +21,7 @@ def memory_agent() -> Agent:
             "categories and tags. You retrieve relevant context for other agents. "
             "You ensure nothing important is lost."
         ),
-        tools=[store_decision_tool, retrieve_decisions_tool],
+        tools=[store_decisions_bulk_tool, retrieve_decisions_bulk_tool, store_decision_tool, retrieve_decisions_tool],
         verbose=True,
         allow_delegation=False,
     )
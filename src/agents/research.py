@@ -8,7 +8,7 @@ from src.tools import read_file_tool, read_directory_tool
 
 def research_agent() -> Agent:
     return Agent(
-        llm=get_llm(),
+        llm=get_llm("research"),
         role="Research Agent",
         goal="Fetch latest official documentation, identify version changes and breaking updates, provide structured technical summaries.",
         backstory=(
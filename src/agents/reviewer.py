@@ -1,14 +1,34 @@
 """Reviewer Agent - Reviews for bugs, performance, security, suggests refinements."""
 
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
 from crewai import Agent
+from pydantic import Field
 
+from src.context_budget import BudgetedTask
 from src.llm import get_llm
-from src.tools import read_file_tool, retrieve_decisions_tool
+from src.review_panel import (
+    SPECIALISTS,
+    Specialist,
+    merge_reviews,
+    specialist_description,
+    specialist_expected_output,
+)
+from src.tools import (
+    changed_files_tool,
+    list_generated_files_tool,
+    read_file_tool,
+    retrieve_decisions_tool,
+)
+
+REVIEW_TOOLS = [read_file_tool, retrieve_decisions_tool, changed_files_tool, list_generated_files_tool]
 
 
 def reviewer_agent() -> Agent:
     return Agent(
-        llm=get_llm(),
+        llm=get_llm("reviewer"),
         role="Reviewer Agent",
         goal="Review for bugs, improve performance, enforce security best practices, suggest refinements.",
         backstory=(
@@ -16,7 +36,70 @@ def reviewer_agent() -> Agent:
             "and security gaps. You suggest concrete improvements without changing "
             "the architecture. Your feedback is actionable and prioritized."
         ),
-        tools=[read_file_tool, retrieve_decisions_tool],
+        tools=REVIEW_TOOLS,
+        verbose=True,
+        allow_delegation=False,
+    )
+
+
+def specialist_reviewer_agent(specialist: Specialist) -> Agent:
+    return Agent(
+        llm=get_llm("reviewer"),
+        role=f"{specialist.title} Reviewer",
+        goal=f"Find every {specialist.key} issue in the generated code and give a concrete fix for each.",
+        backstory=(
+            f"You are a code reviewer specialised in {specialist.key}. You check for "
+            f"{specialist.checklist}. Other reviewers cover everything else, so your "
+            "report stays short, precise and prioritized."
+        ),
+        tools=REVIEW_TOOLS,
+        verbose=True,
+        allow_delegation=False,
+    )
+
+
+class ReviewPanel(Agent):
+    """Runs a review task as concurrent specialist passes and returns the merged report."""
+
+    specialists: list[Any] = Field(default_factory=list, exclude=True)
+
+    def copy(self) -> "ReviewPanel":
+        clone = super().copy()
+        clone.specialists = [agent.copy() for agent in self.specialists]
+        return clone
+
+    def execute_task(self, task: Any, context: Any = None, tools: Any = None) -> str:
+        passes = [
+            BudgetedTask(
+                description=specialist_description(spec, task.description),
+                expected_output=specialist_expected_output(spec),
+                name=f"{task.name or 'review'}.{spec.key}",
+                budget=getattr(task, "budget", None),
+                agent=agent,
+            )
+            for spec, agent in zip(SPECIALISTS, self.specialists)
+        ]
+        for agent in self.specialists:
+            agent.crew = self.crew
+            agent.verbose = self.verbose
+        with ThreadPoolExecutor(max_workers=len(passes), thread_name_prefix="review-pass") as pool:
+            # Each pass gets its own copy of the caller's context (current task, telemetry).
+            futures = [
+                pool.submit(contextvars.copy_context().run, p.agent.execute_task, p, context)
+                for p in passes
+            ]
+            reports = [future.result() for future in futures]
+        return merge_reviews([(spec, str(report)) for spec, report in zip(SPECIALISTS, reports)])
+
+
+def review_panel_agent() -> Agent:
+    return ReviewPanel(
+        llm=get_llm("reviewer"),
+        role="Reviewer Agent",
+        goal="Review the generated code through parallel correctness, performance and security passes.",
+        backstory="You coordinate specialist reviewers and merge their findings into one report.",
+        tools=[],
         verbose=True,
         allow_delegation=False,
+        specialists=[specialist_reviewer_agent(spec) for spec in SPECIALISTS],
     )
@@ -0,0 +1,106 @@
+"""
+File-tree artifacts for generated implementations.
+After the Code Generator and every Fixer, the fenced file blocks of
+implementation.md are written out as real files under <output_dir>/files/.
+<output_dir>/manifest.json keeps the sha256 of every file; a file is only
+rewritten when its hash changed, and the manifest records which files the
+latest cycle changed so reviewers can fetch just those
+(src.tools.artifact_tools.changed_files_tool).
+"""
+import hashlib
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from pathlib import Path, PurePosixPath
+from typing import Any, Callable, Optional
+
+from src.patching import parse_blocks
+
+FILES_DIR = "files"
+MANIFEST = "manifest.json"
+
+
+@dataclass
+class Materialized:
+    written: list[str] = field(default_factory=list)
+    unchanged: list[str] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _safe_path(path: str) -> Optional[str]:
+    """Relative POSIX path inside the tree, or None for absolute/escaping paths."""
+    parts = [p for p in PurePosixPath(path.strip()).parts if p not in ("", ".")]
+    if not parts or ".." in parts or PurePosixPath(path).is_absolute():
+        return None
+    return "/".join(parts)
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+def load_manifest(output_dir: str) -> dict:
+    path = Path(output_dir) / MANIFEST
+    if not path.exists():
+        return {"generation": 0, "files": {}, "changed": [], "removed": []}
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def materialize(markdown: str, output_dir: str, source: Optional[str] = None) -> Materialized:
+    """Write the labelled file blocks of `markdown` under <output_dir>/files/."""
+    root = Path(output_dir) / FILES_DIR
+    manifest = load_manifest(output_dir)
+    previous: dict[str, dict] = manifest["files"]
+    current: dict[str, bytes] = {}
+    for block in parse_blocks(markdown):
+        path = _safe_path(block.path) if block.path else None
+        if path is not None:
+            current[path] = ("\n".join(block.lines) + "\n").encode("utf-8")  # last block wins
+
+    result = Materialized()
+    generation = manifest["generation"] + 1
+    files: dict[str, dict] = {}
+    for path, data in current.items():
+        digest = _sha256(data)
+        target = root / path
+        entry = previous.get(path)
+        if entry and entry["sha256"] == digest and target.exists():
+            result.unchanged.append(path)
+            files[path] = entry
+            continue
+        _write_atomic(target, data)
+        result.written.append(path)
+        files[path] = {"sha256": digest, "size": len(data), "generation": generation, "source": source}
+    for path in previous:
+        if path not in current:
+            (root / path).unlink(missing_ok=True)
+            result.removed.append(path)
+
+    manifest = {
+        "generation": generation,
+        "source": source,
+        "updated": time.time(),
+        "files": files,
+        "changed": result.written,
+        "removed": result.removed,
+    }
+    _write_atomic(Path(output_dir) / MANIFEST, json.dumps(manifest, indent=2).encode("utf-8"))
+    return result
+
+
+def materialize_callback(output_dir: str) -> Callable[[Any], None]:
+    """Task callback that materializes the task's implementation output."""
+
+    def materialize_output(output: Any) -> None:
+        if output.raw:
+            materialize(output.raw, output_dir, source=output.name)
+
+    return materialize_output
@@ -0,0 +1,163 @@
+"""
+Elite AI Software Development Team - Batch Entry Point.
+Runs many development requests through the crew concurrently.
+
+Input is a file (or '-' for stdin) with one request per line, either JSONL
+({"topic": "...", "id": "optional-run-id"}) or plain text. Each run gets its
+own output directory under output/runs/<run_id>/ and a status.json there;
+status changes are streamed to stdout as JSON lines.
+
+    python -m src.batch topics.jsonl --workers 4 --llm-concurrency 8 --rpm 120
+"""
+import argparse
+import json
+import re
+import sys
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Iterable, Optional, TextIO
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+from dotenv import load_dotenv
+
+from src.checkpoint import RUNS_DIR
+from src.crew import create_elite_dev_crew
+from src.rate_limit import configure as configure_llm_limits
+from src.review_loop import ReviewLoop, max_fix_cycles_from_env
+
+load_dotenv(ROOT / ".env")
+
+
+@dataclass
+class RunStatus:
+    run_id: str
+    topic: str
+    output_dir: str
+    status: str = "queued"  # queued | running | done | failed
+    started: Optional[float] = None
+    finished: Optional[float] = None
+    elapsed: Optional[float] = None
+    fix_cycles: Optional[int] = None
+    error: Optional[str] = None
+
+
+def _slug(text: str, limit: int = 40) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", text.lower()).strip("-")[:limit] or "run"
+
+
+def read_topics(lines: Iterable[str]) -> list[tuple[str, str]]:
+    """Parse (run_id, topic) pairs from JSONL or plain-text lines."""
+    topics, seen = [], set()
+    for n, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        run_id = None
+        try:
+            item = json.loads(line)
+        except ValueError:
+            item = line
+        if isinstance(item, dict):
+            topic = str(item.get("topic") or item.get("prompt") or "").strip()
+            run_id = item.get("id")
+        else:
+            topic = str(item).strip()
+        if not topic:
+            continue
+        run_id = _slug(str(run_id)) if run_id else f"{n:04d}-{_slug(topic)}"
+        while run_id in seen:
+            run_id += "-x"
+        seen.add(run_id)
+        topics.append((run_id, topic))
+    return topics
+
+
+class BatchRunner:
+    """Runs topics on a bounded worker pool and streams status events."""
+
+    def __init__(self, workers: int = 2, max_fix_cycles: Optional[int] = None, stream: TextIO = sys.stdout):
+        self.workers = workers
+        self.max_fix_cycles = max_fix_cycles if max_fix_cycles is not None else max_fix_cycles_from_env()
+        self.stream = stream
+        self._lock = threading.Lock()
+        self.runs: dict[str, RunStatus] = {}
+
+    def _emit(self, run: RunStatus, **changes) -> None:
+        with self._lock:
+            for key, value in changes.items():
+                setattr(run, key, value)
+            event = {k: v for k, v in asdict(run).items() if v is not None}
+            event["ts"] = round(time.time(), 3)
+            self.stream.write(json.dumps(event) + "\n")
+            self.stream.flush()
+        out = Path(run.output_dir)
+        out.mkdir(parents=True, exist_ok=True)
+        (out / "status.json").write_text(json.dumps(asdict(run), indent=2), encoding="utf-8")
+
+    def _run_one(self, run: RunStatus) -> RunStatus:
+        started = time.time()
+        self._emit(run, status="running", started=started)
+        try:
+            loop = ReviewLoop(max_cycles=self.max_fix_cycles)
+            crew = create_elite_dev_crew(loop=loop, output_dir=run.output_dir, verbose=False)
+            result = crew.kickoff(inputs={"topic": run.topic})
+            (Path(run.output_dir) / "result.md").write_text(str(result), encoding="utf-8")
+            finished = time.time()
+            self._emit(
+                run, status="done", finished=finished, elapsed=round(finished - started, 2),
+                fix_cycles=loop.cycles_run,
+            )
+        except Exception as e:
+            finished = time.time()
+            (Path(run.output_dir) / "error.txt").write_text(traceback.format_exc(), encoding="utf-8")
+            self._emit(
+                run, status="failed", finished=finished, elapsed=round(finished - started, 2),
+                error=f"{type(e).__name__}: {e}",
+            )
+        return run
+
+    def run(self, topics: list[tuple[str, str]]) -> list[RunStatus]:
+        runs = [RunStatus(run_id, topic, f"{RUNS_DIR}/{run_id}") for run_id, topic in topics]
+        for run in runs:
+            self.runs[run.run_id] = run
+            self._emit(run)
+        with ThreadPoolExecutor(max_workers=max(1, self.workers), thread_name_prefix="crew") as pool:
+            return list(pool.map(self._run_one, runs))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run many requests through the Elite Dev Crew.")
+    parser.add_argument("input", help="JSONL/plain-text file of topics, or '-' for stdin")
+    parser.add_argument("--workers", type=int, default=2, help="Crews running at once")
+    parser.add_argument("--llm-concurrency", type=int, default=None, help="Max in-flight LLM requests (all runs)")
+    parser.add_argument("--rpm", type=float, default=None, help="Max LLM requests per minute (all runs)")
+    parser.add_argument("--max-fix-cycles", type=int, default=None)
+    args = parser.parse_args()
+
+    if args.input == "-":
+        topics = read_topics(sys.stdin)
+    else:
+        topics = read_topics(Path(args.input).read_text(encoding="utf-8").splitlines())
+    if not topics:
+        print("No topics provided.", file=sys.stderr)
+        sys.exit(1)
+
+    configure_llm_limits(args.llm_concurrency, args.rpm)
+    (ROOT / "memory").mkdir(exist_ok=True)
+    runs = BatchRunner(args.workers, args.max_fix_cycles).run(topics)
+    failed = [r for r in runs if r.status != "done"]
+    print(
+        f"Batch finished: {len(runs) - len(failed)} done, {len(failed)} failed.",
+        file=sys.stderr,
+    )
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""
+Checkpoints for crew runs.
+Every completed task's output is saved to output/runs/<run_id>/tasks/<name>.json
+as soon as the task finishes. A failed run (timeout, rate limit, crash) can be
+resumed with `python -m src.main --resume <run_id>`: completed tasks are not run
+again, their stored outputs are fed to the remaining tasks as context, and
+their callbacks and fix-cycle conditions are replayed so the review loop picks
+up where it stopped.
+"""
+import json
+import os
+import re
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+from crewai import Task
+from crewai.tasks.conditional_task import ConditionalTask
+from crewai.tasks.output_format import OutputFormat
+from crewai.tasks.task_output import TaskOutput
+
+from src.context_budget import BudgetedTask
+
+RUNS_DIR = "output/runs"
+
+
+def new_run_id(topic: str) -> str:
+    slug = re.sub(r"[^a-z0-9]+", "-", topic.lower()).strip("-")[:40] or "run"
+    return f"{time.strftime('%Y%m%d-%H%M%S')}-{slug}"
+
+
+def _write_json(path: Path, data: dict) -> None:
+    """Write via a temp file and rename, so a crash never leaves half a checkpoint."""
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(data, indent=2), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def _unconditional(task: ConditionalTask) -> Task:
+    """Plain copy of a conditional task whose condition was already evaluated (crewai
+    does not allow a crew to start with a ConditionalTask)."""
+    return BudgetedTask(
+        budget=getattr(task, "budget", None),
+        agent_key=getattr(task, "agent_key", None),
+        description=task.description,
+        expected_output=task.expected_output,
+        agent=task.agent,
+        context=task.context,
+        output_file=task.output_file,
+        callback=task.callback,
+        guardrail=task.guardrail,
+        guardrail_max_retries=task.guardrail_max_retries,
+        name=task.name,
+    )
+
+
+class RunCheckpoint:
+    """The run directory of one crew run: run.json plus one file per completed task."""
+
+    def __init__(self, run_id: str, runs_dir: str = RUNS_DIR):
+        self.run_id = run_id
+        self.dir = Path(runs_dir) / run_id
+        self.tasks_dir = self.dir / "tasks"
+        self.restored: list[str] = []
+
+    @classmethod
+    def create(
+        cls, topic: str, runs_dir: str = RUNS_DIR, run_id: Optional[str] = None, **meta: Any
+    ) -> "RunCheckpoint":
+        checkpoint = cls(run_id or new_run_id(topic), runs_dir)
+        checkpoint.tasks_dir.mkdir(parents=True, exist_ok=True)
+        checkpoint.update(topic=topic, status="running", created=time.time(), **meta)
+        return checkpoint
+
+    @classmethod
+    def load(cls, run_id: str, runs_dir: str = RUNS_DIR) -> "RunCheckpoint":
+        checkpoint = cls(run_id, runs_dir)
+        if not (checkpoint.dir / "run.json").exists():
+            raise FileNotFoundError(f"No run '{run_id}' under {runs_dir}/")
+        return checkpoint
+
+    @property
+    def meta(self) -> dict:
+        path = self.dir / "run.json"
+        return json.loads(path.read_text(encoding="utf-8")) if path.exists() else {}
+
+    def update(self, **changes: Any) -> None:
+        _write_json(self.dir / "run.json", {**self.meta, **changes, "updated": time.time()})
+
+    def save(self, output: TaskOutput) -> None:
+        """Crew task_callback: persist one finished task."""
+        if not output.name:
+            return  # only named tasks can be matched up again on resume
+        _write_json(self.tasks_dir / f"{output.name}.json", {
+            "name": output.name,
+            "agent": output.agent,
+            "description": output.description,
+            "raw": output.raw,
+            "json_dict": output.json_dict,
+            "saved": time.time(),
+        })
+
+    def completed(self) -> dict[str, dict]:
+        if not self.tasks_dir.exists():
+            return {}
+        return {
+            p.stem: json.loads(p.read_text(encoding="utf-8"))
+            for p in self.tasks_dir.glob("*.json")
+        }
+
+    def restore(self, tasks: list[Task]) -> list[Task]:
+        """Give completed tasks their stored output and return the tasks still to run."""
+        saved = self.completed()
+        previous: Optional[TaskOutput] = None
+        pending: list[Task] = []
+        for task in tasks:
+            record = saved.get(task.name or "")
+            if record is None:
+                pending.append(task)
+                previous = None
+                continue
+            output = TaskOutput(
+                name=task.name,
+                description=record["description"],
+                agent=record["agent"],
+                raw=record["raw"],
+                json_dict=record.get("json_dict"),
+                output_format=OutputFormat.JSON if record.get("json_dict") else OutputFormat.RAW,
+            )
+            # Replay what the run did when this task finished (e.g. ReviewLoop bookkeeping).
+            if isinstance(task, ConditionalTask) and previous is not None:
+                task.should_execute(previous)
+            task.output = output
+            if task.callback:
+                task.callback(output)
+            if task.output_file:
+                path = Path(task.output_file.lstrip("/"))
+                path.parent.mkdir(parents=True, exist_ok=True)
+                path.write_text(output.raw, encoding="utf-8")
+            self.restored.append(task.name)
+            previous = output
+        return self._resolve_leading_conditions(tasks, pending)
+
+    @staticmethod
+    def _resolve_leading_conditions(tasks: list[Task], pending: list[Task]) -> list[Task]:
+        """Evaluate conditional tasks whose input comes from the restored part of the run."""
+        while pending and isinstance(pending[0], ConditionalTask):
+            task = pending[0]
+            before = tasks[next(i for i, t in enumerate(tasks) if t is task) - 1]
+            previous = before.output or (
+                before.get_skipped_task_output() if isinstance(before, ConditionalTask) else None
+            )
+            if previous is None or task.should_execute(previous):
+                plain = _unconditional(task)
+                for other in tasks:
+                    if isinstance(other.context, list) and any(c is task for c in other.context):
+                        other.context = [plain if c is task else c for c in other.context]
+                pending[0] = plain
+                break
+            pending.pop(0)  # skipped, exactly as crewai would have skipped it
+        return pending
@@ -0,0 +1,201 @@
+"""
+Context budgeting for task context chaining.
+Each task receives the outputs of its `context` tasks inline. ContextBudget
+assembles that text per task: identical outputs are sent once, and when the
+total exceeds CONTEXT_TOKEN_BUDGET (tokens, 0 = unlimited) older outputs are
+replaced by a diff against a newer output of the same agent, or by an
+extractive summary. The newest output is always kept whole.
+
+It also counts the prompt tokens of every LLM call per task (CrewLLM reports
+them), so the savings are visible in the run summary.
+"""
+import difflib
+import hashlib
+import os
+import re
+import threading
+from functools import lru_cache
+from typing import Any, Optional
+
+from crewai import Task
+from crewai.tasks.conditional_task import ConditionalTask
+from pydantic import Field
+
+DEFAULT_BUDGET = 12000
+# crewai joins context outputs with this divider.
+DIVIDER = "\n\n----------\n\n"
+SUMMARY_LINES = 40
+
+_KEEP_LINE_RE = re.compile(r"^\s*(#|VERDICT:|[-*]\s|\d+\.\s)|\b(critical|high)\b", re.IGNORECASE)
+
+
+def budget_from_env() -> int:
+    return int(os.getenv("CONTEXT_TOKEN_BUDGET", DEFAULT_BUDGET))
+
+
+@lru_cache(maxsize=1)
+def _encoder() -> Any:
+    try:
+        import tiktoken
+
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception:  # not installed, or the encoding cannot be downloaded
+        return None
+
+
+def count_tokens(text: str) -> int:
+    """Token count with tiktoken when available, else the ~4 characters per token rule."""
+    if not text:
+        return 0
+    encoder = _encoder()
+    if encoder is not None:
+        return len(encoder.encode(text, disallowed_special=()))
+    return (len(text) + 3) // 4
+
+
+def count_message_tokens(messages: Any) -> int:
+    if isinstance(messages, str):
+        return count_tokens(messages)
+    total = 0
+    for message in messages or []:
+        content = message.get("content") if isinstance(message, dict) else message
+        if isinstance(content, list):  # multimodal parts
+            content = " ".join(str(p.get("text", "")) for p in content if isinstance(p, dict))
+        total += count_tokens(str(content or "")) + 4  # role/formatting overhead
+    return total
+
+
+def summarize(text: str, max_tokens: int) -> str:
+    """Extractive summary: headings, list items and severity lines; code blocks collapsed."""
+    kept, in_code, code_lines = [], False, 0
+    for line in text.splitlines():
+        if line.strip().startswith("```"):
+            if in_code:
+                kept.append(f"[code block: {code_lines} lines omitted]")
+            in_code, code_lines = not in_code, 0
+            continue
+        if in_code:
+            code_lines += 1
+        elif _KEEP_LINE_RE.search(line):
+            kept.append(line.rstrip())
+    summary = "\n".join(kept[:SUMMARY_LINES])
+    while kept and count_tokens(summary) > max_tokens:
+        kept = kept[: len(kept) // 2]
+        summary = "\n".join(kept)
+    return summary
+
+
+def diff(older: str, newer: str) -> str:
+    return "\n".join(
+        difflib.unified_diff(older.splitlines(), newer.splitlines(), "older", "newer", n=1, lineterm="")
+    )
+
+
+class ContextBudget:
+    """Assembles per-task context under a token budget and records token counts per task."""
+
+    def __init__(self, budget: Optional[int] = None):
+        self.budget = budget_from_env() if budget is None else budget
+        self.stats: dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def _entry(self, name: str) -> dict:
+        return self.stats.setdefault(
+            name, {"context_in": 0, "context_out": 0, "prompt_tokens": 0, "llm_calls": 0, "compressed": []}
+        )
+
+    def assemble(self, task: Task, context: Optional[str]) -> Optional[str]:
+        """Context text for `task`, built from its context tasks' outputs."""
+        sources = task.context if isinstance(task.context, list) else []
+        sections = [
+            [t.name or f"context {i + 1}", t.output.agent or getattr(t.agent, "role", ""), t.output.raw]
+            for i, t in enumerate(sources)
+            if t.output is not None and t.output.raw.strip()
+        ]
+        if not sections:
+            return context
+        name = task.name or "task"
+        # Identical outputs (e.g. a fix that changed nothing) are sent once, newest copy kept.
+        seen: set[str] = set()
+        for section in reversed(sections):
+            digest = hashlib.sha256(section[2].encode("utf-8")).hexdigest()
+            if digest in seen:
+                section[2] = ""
+            seen.add(digest)
+        sections = [s for s in sections if s[2]]
+        before = count_tokens(context or "")
+        compressed = []
+        total = sum(count_tokens(s[2]) for s in sections)
+        if self.budget > 0 and total > self.budget:
+            share = max(self.budget // max(len(sections), 1), 200)
+            for i, (label, role, raw) in enumerate(sections[:-1]):
+                if total <= self.budget:
+                    break
+                newer = next((s for s in sections[i + 1:] if s[1] == role), None)
+                replacement = None
+                if newer is not None:
+                    changes = diff(raw, newer[2])
+                    if count_tokens(changes) < count_tokens(raw) // 2:
+                        replacement = f"[{label}: diff against {newer[0]}]\n{changes}"
+                if replacement is None:
+                    replacement = f"[{label}: summary]\n{summarize(raw, share)}"
+                total += count_tokens(replacement) - count_tokens(raw)
+                sections[i][2] = replacement
+                compressed.append(label)
+        assembled = DIVIDER.join(s[2] for s in sections)
+        with self._lock:
+            entry = self._entry(name)
+            entry["context_in"] += before
+            entry["context_out"] += count_tokens(assembled)
+            entry["compressed"] += compressed
+        return assembled
+
+    def record_prompt(self, task_name: Optional[str], messages: Any) -> None:
+        """Called by CrewLLM for every LLM call made on behalf of a task."""
+        tokens = count_message_tokens(messages)
+        with self._lock:
+            entry = self._entry(task_name or "task")
+            entry["prompt_tokens"] += tokens
+            entry["llm_calls"] += 1
+
+    def note(self, task_name: str, **details: Any) -> None:
+        """Attach extra per-task details to the report (e.g. how a fix was applied)."""
+        with self._lock:
+            self._entry(task_name).update(details)
+
+    def report(self) -> list[dict]:
+        with self._lock:
+            return [{"task": name, **entry} for name, entry in self.stats.items()]
+
+
+class BudgetedTask(Task):
+    """Task whose inline context is assembled by a ContextBudget.
+
+    `agent_key` names the AgentRegistry role that runs it; the agent itself is
+    only built and assigned once the task is known to run (see src.crew).
+    """
+
+    budget: Optional[Any] = Field(default=None, exclude=True)
+    agent_key: Optional[str] = Field(default=None, exclude=True)
+
+    def execute_sync(self, agent=None, context=None, tools=None):
+        if self.budget is not None:
+            context = self.budget.assemble(self, context)
+        return super().execute_sync(agent=agent, context=context, tools=tools)
+
+    def execute_async(self, agent=None, context=None, tools=None):
+        if self.budget is not None:
+            context = self.budget.assemble(self, context)
+        return super().execute_async(agent=agent, context=context, tools=tools)
+
+
+class BudgetedConditionalTask(ConditionalTask):
+    """ConditionalTask counterpart of BudgetedTask."""
+
+    budget: Optional[Any] = Field(default=None, exclude=True)
+    agent_key: Optional[str] = Field(default=None, exclude=True)
+
+    def execute_sync(self, agent=None, context=None, tools=None):
+        if self.budget is not None:
+            context = self.budget.assemble(self, context)
+        return super().execute_sync(agent=agent, context=context, tools=tools)
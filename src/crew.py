@@ -1,22 +1,70 @@
 """
 Elite AI Software Development Team - CrewAI Crew.
-Sequential workflow: Research → Architect → Code Generator → Reviewer → [Fixer → Reviewer]×2 → Memory.
+Workflow: (Memory preload ∥ Research) → Architect → Code Generator → Reviewer → [Fixer → Reviewer]×≤N → Memory.
+Fix cycles stop early once a review reports no critical or high issues (see src.review_loop).
+With REVIEW_MODE=parallel each review runs as concurrent specialist passes (see src.review_panel).
+Independent tasks run concurrently; the order is derived from task context (see src.scheduler).
 """
 
-from crewai import Crew, Process, Task
+from typing import Callable, Optional
 
-from src.agents import (
-    research_agent,
-    architect_agent,
-    code_generator_agent,
-    reviewer_agent,
-    fixer_agent,
-    memory_agent,
-)
+from crewai import Agent, Crew, Process, Task
+from crewai.tasks.task_output import TaskOutput
+
+from src import agents as agent_factories
+from src.artifacts import materialize_callback
+from src.checkpoint import RunCheckpoint
+from src.context_budget import BudgetedConditionalTask, BudgetedTask, ContextBudget
+from src.patching import PATCH_INSTRUCTIONS, fix_mode_from_env, patch_guardrail
+from src.review_loop import VERDICT_INSTRUCTIONS, ReviewLoop
+from src.review_panel import review_mode_from_env
+from src.scheduler import schedule
+
+
+class AgentRegistry:
+    """Builds each agent role at most once per crew; tasks share the instances.
+
+    A long-lived registry (src.server keeps one per worker) should not be handed to
+    crews directly: kickoff stores per-run state on its agents (crew, verbose,
+    executor, callbacks). fork() gives each run its own copies of the warm agents;
+    the copies share the LLM clients and tools.
+    """
+
+    # Role -> factory name in src.agents, imported on first use.
+    FACTORIES: dict[str, str] = {
+        "research": "research_agent",
+        "architect": "architect_agent",
+        "code_generator": "code_generator_agent",
+        "reviewer": "reviewer_agent",
+        "review_panel": "review_panel_agent",
+        "fixer": "fixer_agent",
+        "memory": "memory_agent",
+    }
+
+    def __init__(self, warm: Optional["AgentRegistry"] = None) -> None:
+        self._agents: dict[str, Agent] = {}
+        self._warm = warm
+
+    @classmethod
+    def factory(cls, role: str) -> Callable[[], Agent]:
+        return getattr(agent_factories, cls.FACTORIES[role])
+
+    def get(self, role: str) -> Agent:
+        if role not in self._agents:
+            self._agents[role] = self._warm.get(role).copy() if self._warm else self.factory(role)()
+        return self._agents[role]
+
+    def fork(self) -> "AgentRegistry":
+        """A registry for one run whose agents are copies of this registry's agents."""
+        return AgentRegistry(warm=self)
+
+    def all(self) -> list[Agent]:
+        """Agents built so far, in the order they were first requested."""
+        return list(self._agents.values())
 
 
 def create_research_task() -> Task:
-    return Task(
+    return BudgetedTask(
         description=(
             "Research the user's request: {topic}. Fetch latest documentation if relevant. "
             "Identify version changes, breaking updates. Produce a structured technical summary. "
@@ -24,106 +72,226 @@ def create_research_task() -> Task:
             "Output: Markdown document with findings, sources, and recommendations."
         ),
         expected_output="Structured technical summary in Markdown with findings, version info, and documentation links.",
-        agent=research_agent(),
+        agent_key="research",
+        name="research",
+    )
+
+
+def create_preload_task() -> Task:
+    """Fetch past decisions relevant to the request; needs nothing else, so it runs beside Research."""
+    return BudgetedTask(
+        description=(
+            "Retrieve past project decisions relevant to: {topic}. Call retrieve_decisions_bulk_tool once "
+            "with a JSON list of the key technologies and concerns of the request. Do not store anything."
+        ),
+        expected_output="Relevant past decisions grouped by category, or a note that none were found.",
+        agent_key="memory",
+        name="memory_preload",
     )
 
 
-def create_architect_task(research_task: Task) -> Task:
-    return Task(
+def create_architect_task(research_task: Task, preload_task: Optional[Task] = None) -> Task:
+    return BudgetedTask(
         description=(
             "Design the architecture for: {topic}. Base it on the research output. Define folder structure, "
-            "APIs, interfaces. Select libraries and versions. Check past decisions with "
-            "retrieve_decisions_tool before proposing. Output a clear architecture document."
+            "APIs, interfaces. Select libraries and versions. Respect the past decisions provided in the "
+            "context; use retrieve_decisions_tool only for anything missing. Output a clear architecture document."
         ),
         expected_output="Architecture document: folder structure, API definitions, library choices, interface contracts.",
-        agent=architect_agent(),
-        context=[research_task],
+        agent_key="architect",
+        context=[research_task, preload_task] if preload_task else [research_task],
+        name="architect",
     )
 
 
-def create_code_task(architect_task: Task) -> Task:
-    return Task(
+def create_code_task(architect_task: Task, output_dir: str = "output") -> Task:
+    return BudgetedTask(
         description=(
             "Implement the software for: {topic}. Follow the architecture exactly. Write production-ready "
             "code with typing, comments, validation. Use read_file_tool to reference specs. "
-            "Create all necessary files. Follow best practices."
+            "Create all necessary files. Follow best practices. Put each file in its own fenced code "
+            "block, directly preceded by a heading with its path, e.g. ### `src/app.py`."
         ),
         expected_output="Complete, working code files. Well-typed, documented, production-grade implementation.",
-        agent=code_generator_agent(),
+        agent_key="code_generator",
         context=[architect_task],
-        output_file="output/implementation.md",
+        output_file=f"{output_dir}/implementation.md",
+        callback=materialize_callback(output_dir),
+        name="code",
     )
 
 
-def create_review_task(code_task: Task) -> Task:
-    return Task(
+def create_review_task(
+    code_task: Task,
+    loop: Optional[ReviewLoop] = None,
+    conditional: bool = False,
+    output_dir: str = "output",
+    mode: Optional[str] = None,
+) -> Task:
+    """Review `code_task`. A conditional review only runs if the preceding fix ran.
+    In "parallel" mode (REVIEW_MODE) the review panel runs correctness, performance and
+    security passes concurrently and merges them into one report; "single" is one reviewer."""
+    parallel = (mode or review_mode_from_env()) == "parallel"
+    focus = (
+        f"Start from the files the fix changed: fetch them with changed_files_tool "
+        f"(output_dir '{output_dir}') and check the fixes, then any remaining issues. "
+        if conditional
+        else ""
+    )
+    kwargs = dict(
         description=(
-            "Review the generated code. Check for bugs, performance issues, security gaps. "
-            "Provide actionable feedback and suggest refinements. Prioritize critical issues."
+            "Review the generated code. "
+            + ("" if parallel else "Check for bugs, performance issues, security gaps. ")
+            + focus +
+            "Provide actionable feedback and suggest refinements. Prioritize critical issues. "
+            "Label every issue with a severity: critical, high, medium or low. " + VERDICT_INSTRUCTIONS
+        ),
+        expected_output=(
+            "Code review report: bugs found, performance suggestions, security notes, refinement "
+            "recommendations, ending with the VERDICT severity line."
         ),
-        expected_output="Code review report: bugs found, performance suggestions, security notes, refinement recommendations.",
-        agent=reviewer_agent(),
+        agent_key="review_panel" if parallel else "reviewer",
         context=[code_task],
-        output_file="output/review_report.md",
+        output_file=f"{output_dir}/review_report.md",
+        callback=loop.record_review if loop else None,
     )
+    if conditional:
+        return BudgetedConditionalTask(condition=ReviewLoop.should_review, **kwargs)
+    return BudgetedTask(**kwargs)
 
 
-def create_fix_task(code_task: Task, review_task: Task) -> Task:
-    return Task(
+def create_fix_task(
+    code_task: Task,
+    review_task: Task,
+    loop: Optional[ReviewLoop] = None,
+    output_dir: str = "output",
+    mode: Optional[str] = None,
+) -> Task:
+    """Fix `code_task` from `review_task`; with a loop, runs only while blocking issues remain.
+    In "patch" mode (FIX_MODE, the default) the Fixer outputs only changes, which are applied
+    to `code_task`'s implementation; "rewrite" asks for the complete implementation."""
+    mode = mode or fix_mode_from_env()
+    if mode == "patch":
+        output_instructions = PATCH_INSTRUCTIONS
+        expected_output = "Only the changed files, as unified diffs or complete per-file replacements, fixing every issue."
+    else:
+        output_instructions = "Output the complete corrected implementation."
+        expected_output = "Optimal, complete implementation with all issues properly fixed. Production-ready, no placeholders."
+    return BudgetedConditionalTask(
+        condition=loop.should_fix if loop else (lambda _: True),
         description=(
             "Apply OPTIMAL fixes based on the code review. For each issue, provide the best "
             "solution—fix root causes, not symptoms. For security: proper env-based config, "
             "input validation, SQL injection protection. For missing modules: full, correct "
             "implementations. For performance: indexes, connection pooling, proper queries. "
             "Never use placeholders or TODO comments—deliver complete, production-ready code. "
-            "Use read_file_tool to read output/implementation.md and output/review_report.md. "
-            "Preserve the architecture. Output the complete corrected implementation."
+            f"The current implementation ({output_dir}/implementation.md) and the review "
+            f"({output_dir}/review_report.md) are already in your context; do not read them again. "
+            "Preserve the architecture. " + output_instructions
         ),
-        expected_output="Optimal, complete implementation with all issues properly fixed. Production-ready, no placeholders.",
-        agent=fixer_agent(),
+        expected_output=expected_output,
+        agent_key="fixer",
         context=[code_task, review_task],
-        output_file="output/implementation.md",
+        output_file=f"{output_dir}/implementation.md",
+        callback=materialize_callback(output_dir),
+        # Turns the patch into the full implementation; a patch that fails is redone as a rewrite.
+        guardrail=patch_guardrail(code_task) if mode == "patch" else None,
+        guardrail_max_retries=2,
     )
 
 
-def create_memory_task(research_task: Task, architect_task: Task, review_task: Task) -> Task:
-    return Task(
+def create_memory_task(research_task: Task, architect_task: Task, *review_tasks: Task) -> Task:
+    return BudgetedTask(
         description=(
-            "Store key decisions from this session. Use store_decision_tool to save: "
-            "1) Architecture choices, 2) Library selections, 3) User preferences from the request. "
-            "Use retrieve_decisions_tool to avoid duplicates. Summarize what was stored."
+            "Store key decisions from this session: 1) Architecture choices, 2) Library selections, "
+            "3) User preferences from the request. Save them all with a single store_decisions_bulk_tool "
+            "call (a JSON list of {category, content, tags}); it merges decisions already in memory, so "
+            "no retrieval is needed first. Summarize what was stored."
         ),
         expected_output="Summary of stored decisions. Confirmation that memory was updated.",
-        agent=memory_agent(),
-        context=[research_task, architect_task, review_task],
+        agent_key="memory",
+        # Skipped reviews have no output and drop out of the context.
+        context=[research_task, architect_task, *review_tasks],
+        name="memory",
     )
 
 
-def create_elite_dev_crew() -> Crew:
-    """Create the Elite AI Software Development Team crew with review-fix loop (2 cycles)."""
+def create_elite_dev_crew(
+    loop: Optional[ReviewLoop] = None,
+    output_dir: str = "output",
+    verbose: bool = True,
+    parallel: bool = True,
+    checkpoint: Optional[RunCheckpoint] = None,
+    budget: Optional[ContextBudget] = None,
+    agents: Optional[AgentRegistry] = None,
+    on_task: Optional[Callable[[TaskOutput], None]] = None,
+    review_mode: Optional[str] = None,
+) -> Crew:
+    """
+    Create the Elite AI Software Development Team crew with an adaptive review-fix loop.
+    Up to `loop.max_cycles` (MAX_FIX_CYCLES, default 2) Fixer → Reviewer cycles are
+    scheduled; each runs only while the latest review reports critical/high issues.
+    Artifacts go to `output_dir` (relative to the working directory), so concurrent
+    runs can each use their own. With `parallel`, tasks whose context is ready run
+    concurrently (the memory preload beside Research); otherwise strictly in order.
+    With a `checkpoint`, finished tasks are saved as they complete and tasks already
+    completed in that run are restored instead of scheduled. Inline context is
+    assembled by `budget` (CONTEXT_TOKEN_BUDGET), which also counts prompt tokens per task.
+    Pass `agents` to reuse agents built for an earlier crew (src.server passes a
+    fork() of its worker's registry); `on_task` is called with each finished task's output.
+    `review_mode` ("single" or "parallel") defaults to REVIEW_MODE.
+    """
+    loop = loop or ReviewLoop()
     t1 = create_research_task()
-    t2 = create_architect_task(t1)
-    t3 = create_code_task(t2)
-    t4 = create_review_task(t3)
-    # Fix cycle 1
-    t5 = create_fix_task(t3, t4)
-    t6 = create_review_task(t5)
-    # Fix cycle 2
-    t7 = create_fix_task(t5, t6)
-    t8 = create_review_task(t7)
-    # Memory uses final review
-    t9 = create_memory_task(t1, t2, t8)
+    preload = create_preload_task()
+    t2 = create_architect_task(t1, preload)
+    t3 = create_code_task(t2, output_dir)
+    review = create_review_task(t3, loop, output_dir=output_dir, mode=review_mode)
+    review.name = "review_1"
+    tasks = [t1, preload, t2, t3, review]
+    reviews = [review]
+    implementation = t3
+    for cycle in range(1, loop.max_cycles + 1):
+        fix = create_fix_task(implementation, review, loop, output_dir)
+        review = create_review_task(fix, loop, conditional=True, output_dir=output_dir, mode=review_mode)
+        fix.name, review.name = f"fix_{cycle}", f"review_{cycle + 1}"
+        tasks += [fix, review]
+        reviews.append(review)
+        implementation = fix
+    # Memory sees every review that ran; the last one is the final verdict.
+    tasks.append(create_memory_task(t1, t2, *reviews))
 
+    budget = budget or ContextBudget()
+    for task in tasks:
+        task.budget = budget
+    tasks = schedule(tasks) if parallel else tasks
+    if checkpoint:
+        tasks = checkpoint.restore(tasks)
+        if not tasks:
+            raise ValueError(f"Run '{checkpoint.run_id}' has no tasks left to run.")
+
+    # Agents are built only for the roles that still have tasks to run.
+    agents = agents if agents is not None else AgentRegistry()
+    for task in tasks:
+        task.agent = agents.get(task.agent_key)
+    for agent in agents.all():
+        agent.verbose = verbose
     return Crew(
-        agents=[
-            research_agent(),
-            architect_agent(),
-            code_generator_agent(),
-            reviewer_agent(),
-            fixer_agent(),
-            memory_agent(),
-        ],
-        tasks=[t1, t2, t3, t4, t5, t6, t7, t8, t9],
+        agents=agents.all(),
+        tasks=tasks,
         process=Process.sequential,
-        verbose=True,
+        verbose=verbose,
+        task_callback=_chain(checkpoint.save if checkpoint else None, on_task),
     )
+
+
+def _chain(*callbacks: Optional[Callable[[TaskOutput], None]]) -> Optional[Callable[[TaskOutput], None]]:
+    active = [c for c in callbacks if c is not None]
+    if len(active) <= 1:
+        return active[0] if active else None
+
+    def call_all(output: TaskOutput) -> None:
+        for callback in active:
+            callback(output)
+
+    return call_all
@@ -0,0 +1,231 @@
+"""
+Project file index for the directory tools.
+walk() is a lazy depth-first walker that skips DEFAULT_EXCLUDES and anything
+matched by .gitignore files (root and nested), and stops as soon as the caller
+stops consuming it. Directory listings are cached per directory together with
+each entry's size and mtime; a listing is re-read only when the directory's
+own mtime changes (an entry was added, removed or renamed), so repeated
+listings within a run cost one stat per visited directory.
+"""
+import fnmatch
+import os
+import re
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, Optional
+
+DEFAULT_EXCLUDES = frozenset({
+    ".git", ".hg", ".svn", ".venv", "venv", "node_modules", "__pycache__",
+    ".mypy_cache", ".pytest_cache", ".ruff_cache", ".tox", ".nox", ".idea", ".cache",
+})
+
+
+@dataclass(frozen=True)
+class Entry:
+    path: str  # relative to the index root, POSIX separators
+    is_dir: bool
+    size: int
+    mtime: float
+
+    @property
+    def name(self) -> str:
+        return self.path.rsplit("/", 1)[-1]
+
+
+@dataclass(frozen=True)
+class _Rule:
+    regex: re.Pattern
+    negate: bool
+    dir_only: bool
+
+
+def _translate(pattern: str) -> str:
+    """gitignore glob -> regex over a path relative to the .gitignore's directory."""
+    out, i = [], 0
+    while i < len(pattern):
+        if pattern.startswith("**/", i):
+            out.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("/**", i) and i + 3 == len(pattern):
+            out.append("/.*")
+            i += 3
+        elif pattern.startswith("**", i):
+            out.append(".*")
+            i += 2
+        elif pattern[i] == "*":
+            out.append("[^/]*")
+            i += 1
+        elif pattern[i] == "?":
+            out.append("[^/]")
+            i += 1
+        elif pattern[i] == "[":
+            end = pattern.find("]", i + 1)
+            if end == -1:
+                out.append(re.escape(pattern[i]))
+                i += 1
+            else:
+                out.append(fnmatch.translate(pattern[i:end + 1])[4:-3])  # strip (?s:...)\Z
+                i = end + 1
+        else:
+            out.append(re.escape(pattern[i]))
+            i += 1
+    return "".join(out)
+
+
+def parse_gitignore(text: str) -> list[_Rule]:
+    rules = []
+    for line in text.splitlines():
+        line = line.rstrip()
+        if not line or line.startswith("#"):
+            continue
+        negate = line.startswith("!")
+        if negate:
+            line = line[1:]
+        dir_only = line.endswith("/")
+        line = line.rstrip("/")
+        anchored = "/" in line  # a leading or middle slash; a trailing one only sets dir_only
+        body = _translate(line.lstrip("/"))
+        prefix = "" if anchored else "(?:.*/)?"
+        rules.append(_Rule(re.compile(f"^{prefix}{body}$"), negate, dir_only))
+    return rules
+
+
+class FileIndex:
+    """Cached, ignore-aware view of the files under `root`."""
+
+    def __init__(self, root: Path, excludes: frozenset = DEFAULT_EXCLUDES):
+        self.root = Path(root).resolve()
+        self.excludes = excludes
+        self.hits = 0
+        self.misses = 0
+        self._dirs: dict[str, tuple[int, list[Entry]]] = {}
+        self._ignores: dict[str, tuple[int, list[_Rule]]] = {}
+        self._lock = threading.Lock()
+
+    def _abs(self, rel: str) -> Path:
+        return self.root / rel if rel else self.root
+
+    def _rules(self, rel: str, names: set[str], visited: Optional[list] = None) -> list[_Rule]:
+        if ".gitignore" not in names:
+            return []
+        path = self._abs(rel) / ".gitignore"
+        try:
+            st = path.stat()
+        except OSError:
+            return []
+        mtime = st.st_mtime_ns
+        if visited is not None:
+            visited.append(("path", str(path), (mtime, st.st_size)))
+        cached = self._ignores.get(rel)
+        if cached and cached[0] == mtime:
+            return cached[1]
+        rules = parse_gitignore(path.read_text(encoding="utf-8", errors="replace"))
+        self._ignores[rel] = (mtime, rules)
+        return rules
+
+    def _scan(self, rel: str) -> list[Entry]:
+        entries = []
+        with os.scandir(self._abs(rel)) as it:
+            for de in it:
+                try:
+                    st = de.stat(follow_symlinks=False)
+                    is_dir = de.is_dir(follow_symlinks=False)
+                except OSError:
+                    continue
+                path = f"{rel}/{de.name}" if rel else de.name
+                entries.append(Entry(path, is_dir, 0 if is_dir else st.st_size, st.st_mtime))
+        entries.sort(key=lambda e: (not e.is_dir, e.name))
+        return entries
+
+    def listdir(self, rel: str = "", visited: Optional[list] = None) -> list[Entry]:
+        """Entries of one directory (unfiltered), re-scanned only when its mtime changed."""
+        mtime = self._abs(rel).stat().st_mtime_ns
+        if visited is not None:
+            visited.append(("dir", str(self._abs(rel)), mtime))
+        with self._lock:
+            cached = self._dirs.get(rel)
+            if cached and cached[0] == mtime:
+                self.hits += 1
+                return cached[1]
+        entries = self._scan(rel)
+        with self._lock:
+            self.misses += 1
+            self._dirs[rel] = (mtime, entries)
+        return entries
+
+    def _ignored(self, entry: Entry, stack: list[tuple[str, list[_Rule]]]) -> bool:
+        if entry.name in self.excludes:
+            return True
+        ignored = False
+        for base, rules in stack:  # deeper .gitignore files override shallower ones
+            sub = entry.path[len(base) + 1:] if base else entry.path
+            for rule in rules:
+                if rule.dir_only and not entry.is_dir:
+                    continue
+                if rule.regex.match(sub):
+                    ignored = not rule.negate
+        return ignored
+
+    def _stack_for(self, rel: str, visited: Optional[list]) -> list[tuple[str, list[_Rule]]]:
+        """.gitignore rules that apply inside `rel`, from the root down."""
+        stack, parts = [], rel.split("/") if rel else []
+        for depth in range(len(parts) + 1):
+            base = "/".join(parts[:depth])
+            parent = self.listdir(base, visited)
+            rules = self._rules(base, {e.name for e in parent}, visited)
+            if rules:
+                stack.append((base, rules))
+        return stack
+
+    def walk(self, rel: str = "", recursive: bool = True, visited: Optional[list] = None) -> Iterator[Entry]:
+        """Non-ignored entries under `rel`, depth-first, directories first in each level.
+
+        `visited` collects ("dir"/"path", path, state) for every directory listed and
+        .gitignore read, i.e. everything the result depends on (see src.tool_cache).
+        """
+        rel = rel.strip("/")
+        stack = self._stack_for(rel, visited)
+        yield from self._walk(self.listdir(rel, visited), stack, recursive, visited)
+
+    def _walk(self, entries: list[Entry], stack: list, recursive: bool, visited: Optional[list]) -> Iterator[Entry]:
+        for entry in entries:
+            if self._ignored(entry, stack):
+                continue
+            yield entry
+            if recursive and entry.is_dir:
+                try:
+                    child = self.listdir(entry.path, visited)
+                except OSError:
+                    continue
+                rules = self._rules(entry.path, {e.name for e in child}, visited)
+                yield from self._walk(child, stack + [(entry.path, rules)] if rules else stack, recursive, visited)
+
+    def find(
+        self, pattern: str, rel: str = "", limit: Optional[int] = None, visited: Optional[list] = None
+    ) -> Iterator[Entry]:
+        """Entries matching a glob like Path.rglob: on the name, or on the path if it has a '/'."""
+        rel = rel.strip("/")
+        count = 0
+        for entry in self.walk(rel, visited=visited):
+            sub = entry.path[len(rel) + 1:] if rel else entry.path
+            target = sub if "/" in pattern else entry.name
+            if fnmatch.fnmatchcase(target, pattern):
+                yield entry
+                count += 1
+                if limit is not None and count >= limit:
+                    return
+
+
+_indexes: dict[Path, FileIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def file_index(root: Path) -> FileIndex:
+    """Shared FileIndex for `root`, so tool calls in one process reuse the cache."""
+    root = Path(root).resolve()
+    with _indexes_lock:
+        index = _indexes.get(root)
+        if index is None:
+            index = _indexes[root] = FileIndex(root)
+        return index
@@ -0,0 +1,116 @@
+"""
+Bounded file reads for agent tools.
+read_range() returns a byte range or a line range of a file, never more than
+READ_FILE_MAX_BYTES, with a marker telling the agent how to fetch the next
+part. Files above MMAP_THRESHOLD are memory-mapped, so a range near the end
+of a multi-GB log costs a few page faults instead of a full load. Binary
+files are refused after looking at their first block.
+"""
+import mmap
+import os
+from pathlib import Path
+from typing import Optional
+
+DEFAULT_MAX_BYTES = 64_000
+MMAP_THRESHOLD = 1 << 20
+SNIFF_BYTES = 8192
+_SCAN_CHUNK = 1 << 20  # newline counting for line ranges
+
+
+class BinaryFileError(ValueError):
+    """The file looks binary (NUL bytes or mostly non-text in its first block)."""
+
+
+def max_bytes_from_env() -> int:
+    return int(os.getenv("READ_FILE_MAX_BYTES", DEFAULT_MAX_BYTES))
+
+
+def is_binary(sample: bytes) -> bool:
+    """Same heuristic as git: a NUL byte, or too many control bytes, in the first block."""
+    if not sample:
+        return False
+    if b"\0" in sample:
+        return True
+    control = sum(1 for b in sample if b < 32 and b not in (9, 10, 12, 13, 27))
+    return control / len(sample) > 0.3
+
+
+def _line_start(data, line: int, size: int) -> int:
+    """Byte offset where 1-based `line` starts (size if the file has fewer lines)."""
+    pos, seen = 0, 1
+    while seen < line and pos < size:
+        chunk = data[pos:pos + _SCAN_CHUNK]
+        count = chunk.count(b"\n")
+        if seen + count < line:
+            seen += count
+            pos += len(chunk)
+            continue
+        for _ in range(line - seen):
+            pos = data.find(b"\n", pos, size) + 1
+        return pos
+    return min(pos, size)
+
+
+def _slice(data, size: int, offset: int, length: Optional[int],
+           start_line: Optional[int], end_line: Optional[int], max_bytes: int) -> tuple[int, int]:
+    if start_line is not None or end_line is not None:
+        first = max(start_line or 1, 1)
+        begin = _line_start(data, first, size)
+        if end_line is None:
+            return begin, size
+        # end_line is inclusive: stop where the next line starts.
+        end = begin
+        for _ in range(max(end_line - first + 1, 0)):
+            nl = data.find(b"\n", end, size)
+            if nl == -1:
+                return begin, size
+            end = nl + 1
+            if 0 < max_bytes < end - begin:
+                break  # past the cap; the rest would be truncated anyway
+        return begin, end
+    begin = min(max(offset, 0), size)
+    end = size if length is None else min(begin + max(length, 0), size)
+    return begin, end
+
+
+def read_range(
+    path: Path,
+    offset: int = 0,
+    length: Optional[int] = None,
+    start_line: Optional[int] = None,
+    end_line: Optional[int] = None,
+    max_bytes: Optional[int] = None,
+) -> str:
+    """Text of a byte range (offset/length) or 1-based inclusive line range of `path`."""
+    max_bytes = max_bytes_from_env() if max_bytes is None else max_bytes
+    size = path.stat().st_size
+    with path.open("rb") as f:
+        if is_binary(f.read(SNIFF_BYTES)):
+            raise BinaryFileError(f"{path.name} is a binary file ({size} bytes)")
+        if size == 0:
+            return ""
+        if size >= MMAP_THRESHOLD:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                begin, end = _slice(data, size, offset, length, start_line, end_line, max_bytes)
+                stop = min(end, begin + max_bytes) if max_bytes > 0 else end
+                chunk = data[begin:stop]
+        else:
+            f.seek(0)
+            data = f.read()
+            begin, end = _slice(data, size, offset, length, start_line, end_line, max_bytes)
+            stop = min(end, begin + max_bytes) if max_bytes > 0 else end
+            chunk = data[begin:stop]
+    if stop < end:
+        cut = chunk.rfind(b"\n") + 1  # end on a full line when there is one
+        if cut:
+            chunk = chunk[:cut]
+            stop = begin + cut
+    text = chunk.decode("utf-8", errors="replace")
+    if stop < end:
+        text += (
+            f"\n[... truncated: bytes {begin}-{stop} of {size} shown (limit {max_bytes}). "
+            f"Read on with offset={stop}, or request a line range.]"
+        )
+    elif begin > 0 or end < size:
+        text = f"[bytes {begin}-{end} of {size}]\n" + text
+    return text
@@ -1,20 +1,79 @@
 """LLM configuration - DeepSeek (OpenAI-compatible API)."""
 
 import os
+from functools import lru_cache
+from typing import TYPE_CHECKING, Optional
 
-from crewai import LLM
+from src.llm_routing import tier_for, tier_settings
 
+if TYPE_CHECKING:  # crewai is imported when the first client is built
+    from crewai import LLM
 
-def get_llm() -> LLM:
-    """Return DeepSeek LLM. Set DEEPSEEK_API_KEY in .env."""
+    from src.llm_client import CrewLLM
+
+DEFAULT_BASE_URL = "https://api.deepseek.com/v1"
+# Agents whose responses are cached unless LLM_CACHE_AGENTS says otherwise.
+# Research/Architect are deterministic enough to replay; Fixer should retry fresh.
+DEFAULT_CACHE_AGENTS = "research,architect"
+
+
+def cache_enabled_for(agent: Optional[str]) -> bool:
+    """Whether `agent` (e.g. "research", "fixer") uses the response cache.
+    LLM_CACHE_AGENTS is a comma-separated list, "all" or "none"."""
+    setting = os.getenv("LLM_CACHE_AGENTS", DEFAULT_CACHE_AGENTS).strip().lower()
+    if setting in ("", "none", "off", "0"):
+        return False
+    if setting in ("all", "on", "1"):
+        return True
+    return agent is not None and agent in {a.strip() for a in setting.split(",")}
+
+
+@lru_cache(maxsize=None)
+def _provider_llm(
+    model: str,
+    base_url: str,
+    api_key: str,
+    max_tokens: Optional[int] = None,
+    temperature: Optional[float] = None,
+    timeout: Optional[float] = None,
+) -> "LLM":
+    """One provider client (and so one keep-alive HTTP pool) per endpoint config,
+    shared by every agent of the same tier."""
+    from crewai import LLM
+
+    return LLM(
+        model=model, base_url=base_url, api_key=api_key,
+        max_tokens=max_tokens, temperature=temperature, timeout=timeout,
+    )
+
+
+def get_llm(agent: Optional[str] = None, cache: Optional[bool] = None) -> "CrewLLM":
+    """Return DeepSeek LLM. Set DEEPSEEK_API_KEY in .env.
+
+    `agent` names the calling agent: it picks the model tier (LLM_ROUTES, see
+    src.llm_routing) and whether caching is on; `cache` forces it on or off.
+    DEEPSEEK_BASE_URL / DEEPSEEK_MODEL point the client elsewhere, e.g. at a
+    local OpenAI-compatible stub. Responses are streamed unless LLM_STREAM=0.
+    """
     api_key = os.getenv("DEEPSEEK_API_KEY")
     if not api_key:
         raise ValueError(
             "DEEPSEEK_API_KEY not set. Add it to your .env file. "
             "Get a key at https://platform.deepseek.com/"
         )
-    return LLM(
-        model="deepseek-chat",
-        base_url="https://api.deepseek.com/v1",
-        api_key=api_key,
+    tier = tier_settings(tier_for(agent))
+    inner = _provider_llm(
+        tier.model,
+        os.getenv("DEEPSEEK_BASE_URL", DEFAULT_BASE_URL),
+        api_key,
+        tier.max_tokens,
+        tier.temperature,
+        tier.timeout,
     )
+    from src.llm_cache import get_cache
+    from src.llm_client import CrewLLM
+    from src.streaming import stream_enabled
+
+    if cache is None:
+        cache = cache_enabled_for(agent)
+    return CrewLLM.wrap(inner, get_cache() if cache else None, stream=stream_enabled(), tier=tier.name)
@@ -0,0 +1,198 @@
+"""
+Content-addressed LLM response cache.
+Responses are keyed by a SHA-256 of everything that determines them (model,
+endpoint, messages, tools, sampling settings, stop words) and kept in a
+SQLite file with a TTL and a size bound enforced by least-recently-used
+eviction. Values are stored as JSON (response text, or plain lists/dicts),
+never pickled, so a writable cache file cannot inject code; anything else
+is not cached, and rows that do not decode count as misses. Hit/miss
+counters are kept per process.
+
+Configuration (env):
+    LLM_CACHE_DIR      cache directory (default: .cache/ in the project root)
+    LLM_CACHE_TTL      seconds an entry stays valid (default: 7 days)
+    LLM_CACHE_MAX_MB   size bound before LRU eviction (default: 256)
+
+    python -m src.llm_cache stats
+    python -m src.llm_cache clear
+"""
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+ROOT = Path(__file__).parent.parent
+DEFAULT_TTL = 7 * 24 * 3600
+DEFAULT_MAX_MB = 256
+
+
+def _tool_fingerprint(tool: Any) -> Any:
+    """A stable, address-free description of a tool for the cache key."""
+    if isinstance(tool, dict):
+        return tool
+    schema = getattr(tool, "args_schema", None)
+    if schema is not None and hasattr(schema, "model_json_schema"):
+        schema = schema.model_json_schema()
+    return {
+        "name": getattr(tool, "name", type(tool).__name__),
+        "description": getattr(tool, "description", ""),
+        "args": schema,
+    }
+
+
+def cache_key(
+    model: str,
+    messages: Any,
+    tools: Optional[list] = None,
+    temperature: Optional[float] = None,
+    **params: Any,
+) -> str:
+    """SHA-256 over the request; `params` carries any other output-affecting settings."""
+    payload = {
+        "model": model,
+        "messages": messages,
+        "tools": [_tool_fingerprint(t) for t in tools or []],
+        "temperature": temperature,
+        "params": params,
+    }
+    blob = json.dumps(payload, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+_UNREADABLE = object()
+
+
+def _decode(blob: Any) -> Any:
+    try:
+        return json.loads(blob)["value"]
+    except (ValueError, TypeError, KeyError, UnicodeDecodeError):
+        return _UNREADABLE
+
+
+class ResponseCache:
+    """SQLite-backed response store with TTL and size-bounded LRU eviction."""
+
+    def __init__(self, path: Path, ttl: float = DEFAULT_TTL, max_bytes: int = DEFAULT_MAX_MB * 1024 * 1024):
+        self.path = Path(path)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY, value BLOB, size INTEGER, created REAL, accessed REAL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)")
+        self._size = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    def get(self, key: str) -> tuple[bool, Any]:
+        """Return (hit, value)."""
+        now = time.time()
+        with self._lock:
+            row = self._db.execute("SELECT value, size, created FROM responses WHERE key = ?", (key,)).fetchone()
+            value = _decode(row[0]) if row else _UNREADABLE
+            if row and (now - row[2] > self.ttl or value is _UNREADABLE):
+                # Expired, or not a JSON entry (e.g. written by an older version).
+                self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._size -= row[1]
+                row = None
+            if row is None:
+                self.misses += 1
+                return False, None
+            self._db.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+            self.hits += 1
+        return True, value
+
+    def put(self, key: str, value: Any) -> None:
+        try:
+            blob = json.dumps({"value": value}, ensure_ascii=False, allow_nan=False).encode("utf-8")
+        except (TypeError, ValueError):
+            return  # provider objects that are not plain text/JSON are simply not cached
+        now = time.time()
+        with self._lock:
+            old = self._db.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses (key, value, size, created, accessed) VALUES (?, ?, ?, ?, ?)",
+                (key, blob, len(blob), now, now),
+            )
+            self._size += len(blob) - (old[0] if old else 0)
+            self._evict()
+
+    def _evict(self) -> None:
+        if self._size <= self.max_bytes:
+            return
+        self._db.execute("DELETE FROM responses WHERE created < ?", (time.time() - self.ttl,))
+        self._size = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        while self._size > self.max_bytes:
+            rows = self._db.execute(
+                "SELECT key, size FROM responses ORDER BY accessed LIMIT 64"
+            ).fetchall()
+            if not rows:
+                break
+            for key, size in rows:
+                if self._size <= self.max_bytes:
+                    break
+                self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._size -= size
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._db.execute("DELETE FROM responses")
+            self._size = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries = self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            "path": str(self.path),
+            "entries": entries,
+            "bytes": self._size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "evictions": self.evictions,
+        }
+
+
+_cache: Optional[ResponseCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_cache() -> ResponseCache:
+    """The process-wide response cache, configured from the environment."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            cache_dir = Path(os.getenv("LLM_CACHE_DIR") or ROOT / ".cache")
+            _cache = ResponseCache(
+                cache_dir / "llm_responses.sqlite",
+                ttl=float(os.getenv("LLM_CACHE_TTL", DEFAULT_TTL)),
+                max_bytes=int(float(os.getenv("LLM_CACHE_MAX_MB", DEFAULT_MAX_MB)) * 1024 * 1024),
+            )
+        return _cache
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="LLM response cache maintenance.")
+    parser.add_argument("command", choices=["stats", "clear"])
+    args = parser.parse_args()
+    cache = get_cache()
+    if args.command == "clear":
+        cache.clear()
+    print(json.dumps(cache.stats(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+CrewLLM - the LLM object handed to agents.
+Wraps the provider LLM built by src.llm.get_llm() and adds an optional
+content-addressed response cache (src.llm_cache) and the process-wide
+endpoint limits (src.rate_limit), and reports prompt sizes to the calling
+task's context budget (src.context_budget) and each call's latency and
+tokens, tagged with the model tier (src.llm_routing), to the run's
+telemetry (src.telemetry). Streaming is decided per wrapper and
+forwarded to the shared provider client call by call. Everything else is
+delegated to the wrapped provider client.
+"""
+import time
+from typing import Any, Optional
+
+from crewai.llms.base_llm import BaseLLM, call_stop_override, call_stream_override
+from pydantic import Field
+
+from src import telemetry
+from src.context_budget import count_message_tokens, count_tokens
+from src.llm_cache import ResponseCache, cache_key
+from src.rate_limit import get_limiter
+
+
+class CrewLLM(BaseLLM):
+    """Provider LLM wrapper; `cache` is None when caching is off for this agent."""
+
+    inner: Any = Field(exclude=True)
+    cache: Optional[Any] = Field(default=None, exclude=True)
+    tier: Optional[str] = Field(default=None, exclude=True)
+
+    @classmethod
+    def wrap(
+        cls,
+        inner: BaseLLM,
+        cache: Optional[ResponseCache] = None,
+        stream: Optional[bool] = None,
+        tier: Optional[str] = None,
+    ) -> "CrewLLM":
+        return cls(
+            model=inner.model,
+            provider=inner.provider,
+            base_url=inner.base_url,
+            temperature=inner.temperature,
+            max_tokens=inner.max_tokens,
+            stop=list(inner.stop),
+            stream=inner.stream if stream is None else stream,
+            inner=inner,
+            cache=cache,
+            tier=tier,
+        )
+
+    def _key(self, messages: Any, tools: Optional[list], response_model: Any) -> str:
+        return cache_key(
+            self.inner.model,
+            messages,
+            tools,
+            self.inner.temperature,
+            base_url=self.inner.base_url,
+            max_tokens=self.inner.max_tokens,
+            stop=self.stop_sequences,
+            response_model=response_model.model_json_schema() if response_model else None,
+        )
+
+    def call(
+        self,
+        messages: Any,
+        tools: Optional[list] = None,
+        callbacks: Optional[list] = None,
+        available_functions: Optional[dict] = None,
+        from_task: Any = None,
+        from_agent: Any = None,
+        response_model: Any = None,
+    ) -> Any:
+        started = time.perf_counter()
+        # Functions executed inside the call have side effects; never replay them.
+        cacheable = self.cache is not None and not available_functions
+        if cacheable:
+            key = self._key(messages, tools, response_model)
+            hit, value = self.cache.get(key)
+            if hit:
+                self._report(from_task, from_agent, messages, value, started, started, cached=True)
+                return value
+        budget = getattr(from_task, "budget", None)
+        if budget is not None:
+            budget.record_prompt(from_task.name, messages)
+        stream = bool(self._effective_stream())
+        with (
+            get_limiter().slot(),
+            call_stop_override(self.inner, self.stop_sequences),
+            call_stream_override(self.inner, stream),
+        ):
+            admitted = time.perf_counter()
+            result = self.inner.call(
+                messages,
+                tools=tools,
+                callbacks=callbacks,
+                available_functions=available_functions,
+                from_task=from_task,
+                from_agent=from_agent,
+                response_model=response_model,
+            )
+        if cacheable and result not in (None, ""):
+            self.cache.put(key, result)
+        self._report(from_task, from_agent, messages, result, started, admitted, cached=False)
+        return result
+
+    def _report(
+        self, from_task: Any, from_agent: Any, messages: Any, result: Any, started: float, admitted: float, cached: bool
+    ) -> None:
+        """Hand the call's measurements to the run's Telemetry, if one is attached."""
+        run = telemetry.active()
+        if run is None:
+            return
+        run.record_llm_call(
+            getattr(from_task, "name", None),
+            getattr(from_agent, "role", None),
+            latency=time.perf_counter() - started,
+            limiter_wait=admitted - started,
+            prompt_tokens=count_message_tokens(messages),
+            completion_tokens=count_tokens(result if isinstance(result, str) else str(result or "")),
+            cached=cached,
+            tier=self.tier,
+        )
+
+    # The wrapped provider client already applies crewai's retry policy.
+    call._crewai_rate_limit_wrapped = True  # type: ignore[attr-defined]
+
+    def supports_function_calling(self) -> bool:
+        return self.inner.supports_function_calling()
+
+    def supports_stop_words(self) -> bool:
+        return self.inner.supports_stop_words()
+
+    def supports_multimodal(self) -> bool:
+        return self.inner.supports_multimodal()
+
+    def get_context_window_size(self) -> int:
+        return self.inner.get_context_window_size()
+
+    def get_token_usage_summary(self) -> Any:
+        return self.inner.get_token_usage_summary()
@@ -0,0 +1,80 @@
+"""
+Model tiers for the crew's agents.
+get_llm() (src.llm) is called with the agent's key ("research", "fixer", ...)
+and routes it to a tier; each tier has its own model, max_tokens,
+temperature and request timeout, so light stages can use a cheap, fast model
+while Code Generator and Fixer keep the strong one.
+
+LLM_ROUTES maps agent keys to tiers, "*" being every other agent:
+
+    memory=light,research=light,code_generator=strong,fixer=strong,*=standard
+
+A tier's settings come from LLM_TIER_<NAME>_MODEL, _MAX_TOKENS, _TEMPERATURE
+and _TIMEOUT (e.g. LLM_TIER_LIGHT_MODEL=deepseek-chat); "none" leaves a
+setting to the provider. The model defaults to DEEPSEEK_MODEL for every tier,
+so out of the box the tiers differ only in their limits. Tier names other
+than the three below are allowed and start from the standard defaults.
+Latency and token usage are recorded per tier by the run's telemetry.
+"""
+import os
+from dataclasses import dataclass
+from typing import Optional
+
+DEFAULT_MODEL = "deepseek-chat"
+DEFAULT_ROUTES = "memory=light,research=light,code_generator=strong,fixer=strong,*=standard"
+DEFAULT_TIER = "standard"
+# name -> (max_tokens, temperature, timeout seconds); None = provider default.
+TIER_DEFAULTS: dict[str, tuple[Optional[int], Optional[float], Optional[float]]] = {
+    "light": (4096, 0.2, 120.0),
+    "standard": (None, None, 300.0),
+    "strong": (8192, 0.0, 600.0),
+}
+
+
+@dataclass(frozen=True)
+class Tier:
+    name: str
+    model: str
+    max_tokens: Optional[int] = None
+    temperature: Optional[float] = None
+    timeout: Optional[float] = None
+
+
+def routes(spec: Optional[str] = None) -> dict[str, str]:
+    """Parse a routing spec into {agent: tier}; "*" is the tier of other agents."""
+    spec = (spec if spec is not None else os.getenv("LLM_ROUTES", DEFAULT_ROUTES)).strip()
+    table: dict[str, str] = {}
+    for part in spec.split(","):
+        agent, _, tier = part.rpartition("=")
+        if tier.strip():
+            table[agent.strip() or "*"] = tier.strip().lower()
+    return table
+
+
+def tier_for(agent: Optional[str]) -> str:
+    table = routes()
+    return table.get(agent or "", table.get("*", DEFAULT_TIER))
+
+
+def _setting(name: str, key: str, cast: type, default):
+    raw = os.getenv(f"LLM_TIER_{name.upper()}_{key}")
+    if raw is None or not raw.strip():
+        return default
+    if raw.strip().lower() == "none":
+        return None
+    try:
+        return cast(raw)
+    except ValueError:
+        return default
+
+
+def tier_settings(name: str) -> Tier:
+    """The tier's defaults with any LLM_TIER_<NAME>_* overrides applied."""
+    max_tokens, temperature, timeout = TIER_DEFAULTS.get(name, TIER_DEFAULTS[DEFAULT_TIER])
+    return Tier(
+        name=name,
+        model=_setting(name, "MODEL", str, None) or os.getenv("DEEPSEEK_MODEL", DEFAULT_MODEL),
+        max_tokens=_setting(name, "MAX_TOKENS", int, max_tokens),
+        temperature=_setting(name, "TEMPERATURE", float, temperature),
+        timeout=_setting(name, "TIMEOUT", float, timeout),
+    )
@@ -1,9 +1,14 @@
 """
 Elite AI Software Development Team - CLI Entry Point.
+crewai and the crew are imported only once there is a request to run, so
+--help and argument errors return immediately (scripts/bench_import.py).
 """
+import argparse
 import os
 import sys
+import time
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 # Ensure project root is on path
 ROOT = Path(__file__).parent.parent
@@ -11,16 +16,77 @@ sys.path.insert(0, str(ROOT))
 
 from dotenv import load_dotenv
 
-from src.crew import create_elite_dev_crew
+from src.review_loop import ReviewLoop, max_fix_cycles_from_env
+from src.review_panel import REVIEW_MODES, review_mode_from_env
+from src.tool_cache import ToolCache
+
+if TYPE_CHECKING:
+    from src.context_budget import ContextBudget
+    from src.telemetry import Telemetry
 
 load_dotenv(ROOT / ".env")
 
 
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run the Elite AI Software Development Team.")
+    parser.add_argument("prompt", nargs="*", help="Software development request (prompted if omitted)")
+    parser.add_argument(
+        "--max-fix-cycles",
+        type=int,
+        default=max_fix_cycles_from_env(),
+        help="Cap on Fixer → Reviewer cycles; cycles stop early once no critical/high issues remain",
+    )
+    parser.add_argument(
+        "--review-mode",
+        choices=REVIEW_MODES,
+        default=review_mode_from_env(),
+        help="'parallel' splits each review into concurrent correctness, performance and security passes",
+    )
+    parser.add_argument(
+        "--sequential",
+        action="store_true",
+        help="Run tasks strictly one after another instead of running independent tasks concurrently",
+    )
+    parser.add_argument(
+        "--quiet",
+        action="store_true",
+        help="Only stream tokens and print the summary; skip agent logs and the final output dump",
+    )
+    parser.add_argument(
+        "--no-stream",
+        action="store_true",
+        help="Wait for complete LLM responses instead of streaming tokens (same as LLM_STREAM=0)",
+    )
+    parser.add_argument(
+        "--resume",
+        metavar="RUN_ID",
+        help="Continue a failed run from output/runs/RUN_ID, skipping tasks that already completed",
+    )
+    return parser.parse_args(argv)
+
+
 def main() -> None:
     """Run the Elite Dev Crew with user input."""
-    prompt = " ".join(sys.argv[1:]) if len(sys.argv) > 1 else None
-    if not prompt:
-        prompt = input("Enter your software development request: ").strip()
+    args = parse_args(sys.argv[1:])
+    checkpoint = None
+    if args.resume:
+        from src.checkpoint import RunCheckpoint
+
+        try:
+            checkpoint = RunCheckpoint.load(args.resume)
+        except FileNotFoundError as e:
+            print(e)
+            sys.exit(1)
+        if checkpoint.meta.get("status") == "done":
+            print(f"Run {args.resume} already completed; nothing to resume.")
+            return
+        prompt = checkpoint.meta["topic"]
+        # The task list must match the original run for outputs to line up.
+        args.max_fix_cycles = checkpoint.meta.get("max_fix_cycles", args.max_fix_cycles)
+    else:
+        prompt = " ".join(args.prompt).strip()
+        if not prompt:
+            prompt = input("Enter your software development request: ").strip()
     if not prompt:
         print("No request provided.")
         sys.exit(1)
@@ -31,23 +97,139 @@ def main() -> None:
             "Get a key at https://platform.deepseek.com/"
         )
 
+    from src.checkpoint import RunCheckpoint
+    from src.context_budget import ContextBudget
+    from src.crew import create_elite_dev_crew
+    from src.scheduler import timing_report
+    from src.streaming import TokenStreamer, stream_enabled
+    from src.telemetry import TELEMETRY_FILE, Telemetry
+
     # Create output directory
     (ROOT / "output").mkdir(exist_ok=True)
     (ROOT / "memory").mkdir(exist_ok=True)
 
-    crew = create_elite_dev_crew()
+    if args.no_stream:
+        os.environ["LLM_STREAM"] = "0"
+    checkpoint = checkpoint or RunCheckpoint.create(prompt, max_fix_cycles=args.max_fix_cycles)
+    loop = ReviewLoop(max_cycles=args.max_fix_cycles)
+    budget = ContextBudget()
+    crew = create_elite_dev_crew(
+        loop=loop,
+        verbose=not args.quiet,
+        parallel=not args.sequential,
+        checkpoint=checkpoint,
+        budget=budget,
+        review_mode=args.review_mode,
+    )
     print("\n--- Elite AI Software Development Team ---")
-    print(f"Request: {prompt}\n")
+    print(f"Request: {prompt}")
+    print(f"Run: {checkpoint.run_id}")
+    if checkpoint.restored:
+        print(f"Resuming; restored from checkpoint: {', '.join(checkpoint.restored)}")
+    print()
+
+    started = time.perf_counter()
+    streamer = TokenStreamer(crew.tasks, echo=stream_enabled())
+    tool_cache = ToolCache()
+    telemetry = Telemetry(crew.tasks, checkpoint.dir / TELEMETRY_FILE, tool_cache)
+    checkpoint.update(status="running")
+    try:
+        with streamer.attached(), tool_cache.activated(), telemetry.attached():
+            result = crew.kickoff(inputs={"topic": prompt})
+    except Exception as e:
+        checkpoint.update(status="failed", error=f"{type(e).__name__}: {e}")
+        print(f"\nRun failed: {type(e).__name__}: {e}")
+        print(f"Completed tasks are saved. Resume with: python -m src.main --resume {checkpoint.run_id}")
+        sys.exit(1)
+    checkpoint.update(status="done")
+    timing = timing_report(crew.tasks, time.perf_counter() - started)
+
+    if not args.quiet:
+        print("\n--- Result ---")
+        print(result)
+
+        if hasattr(result, "tasks_output"):
+            for i, out in enumerate(result.tasks_output, 1):
+                print(f"\n--- Task {i} Output ---")
+                print(out)
+
+    summary = loop.summary()
+    print(
+        f"\nReview/fix cycles run: {summary['cycles_run']} of max {summary['max_cycles']}"
+        + (" (stopped early: no critical/high issues)" if summary["stopped_early"] else "")
+    )
+    print(
+        f"Wall time: {timing['wall']}s | sequential: {timing['sequential']}s | "
+        f"critical path: {timing['critical_path']}s ({' → '.join(timing['critical_tasks'])})"
+    )
+    print_token_report(budget)
+    print_tool_cache_report(tool_cache)
+    print_telemetry_report(telemetry)
+    print(f"Telemetry: {checkpoint.dir / TELEMETRY_FILE}")
 
-    result = crew.kickoff(inputs={"topic": prompt})
 
-    print("\n--- Result ---")
-    print(result)
+def _describe_fix(fix: dict) -> str:
+    if fix["mode"] == "patch":
+        return f"patched {len(fix['files'])} file(s): {fix['output_chars']} chars out → {fix['result_chars']} chars"
+    if fix["mode"] == "rejected":
+        return f"patch rejected: {fix['error']}"
+    return f"full rewrite: {fix['output_chars']} chars out"
+
+
+def print_token_report(budget: "ContextBudget") -> None:
+    rows = budget.report()
+    if not rows:
+        return
+    print(f"\n{'task':<16} {'calls':>5} {'prompt tok':>10} {'context in':>10} {'context out':>11}")
+    for row in rows:
+        print(
+            f"{row['task']:<16} {row['llm_calls']:>5} {row['prompt_tokens']:>10} "
+            f"{row['context_in']:>10} {row['context_out']:>11}"
+            + (f"  (compressed: {', '.join(row['compressed'])})" if row["compressed"] else "")
+            + (f"  [{_describe_fix(row['fix'])}]" if row.get("fix") else "")
+        )
+    print(f"{'total':<16} {sum(r['llm_calls'] for r in rows):>5} {sum(r['prompt_tokens'] for r in rows):>10}")
+
+
+def print_tool_cache_report(cache: ToolCache) -> None:
+    rows = cache.report()
+    if not rows:
+        return
+    print(f"\n{'tool':<24} {'calls':>5} {'hits':>5} {'stale':>5} {'hit rate':>8}")
+    for row in rows:
+        print(f"{row['tool']:<24} {row['calls']:>5} {row['hits']:>5} {row['stale']:>5} {row['hit_rate']:>8.0%}")
+
+
+def print_telemetry_report(telemetry: "Telemetry") -> None:
+    report = telemetry.report()
+    header = (
+        f"{'wall s':>7} {'queue s':>7} {'llm':>4} {'llm s':>6} {'wait s':>6} {'out tok':>7} "
+        f"{'cached':>6} {'tools':>5} {'tool s':>6} {'retries':>7}"
+    )
+
+    def cells(row: dict) -> str:
+        return (
+            f"{row['wall']:>7.2f} {row['queue_wait']:>7.2f} {row['llm_calls']:>4} {row['llm_seconds']:>6.2f} "
+            f"{row['limiter_wait']:>6.2f} {row['completion_tokens']:>7} {row['cache_hits']:>6} "
+            f"{row['tool_calls']:>5} {row['tool_seconds']:>6.2f} {row['retries'] + row['llm_errors']:>7}"
+        )
 
-    if hasattr(result, "tasks_output"):
-        for i, out in enumerate(result.tasks_output, 1):
-            print(f"\n--- Task {i} Output ---")
-            print(out)
+    if report["tasks"]:
+        print(f"\n{'task':<16} {header}")
+        for row in report["tasks"]:
+            print(f"{row['task']:<16} {cells(row)}")
+    if report["agents"]:
+        print(f"\n{'agent':<24} {'tasks':>5} {header}")
+        for row in report["agents"]:
+            print(f"{row['agent'][:24]:<24} {row['tasks']:>5} {cells(row)}")
+    if report["tiers"]:
+        print(f"\n{'tier':<10} {'llm':>4} {'llm s':>6} {'avg s':>6} {'prompt tok':>10} {'out tok':>7} {'cached':>6}")
+        for row in report["tiers"]:
+            print(
+                f"{row['tier']:<10} {row['llm_calls']:>4} {row['llm_seconds']:>6.2f} "
+                f"{row['llm_seconds'] / max(row['llm_calls'], 1):>6.2f} {row['prompt_tokens']:>10} "
+                f"{row['completion_tokens']:>7} {row['cache_hits']:>6}"
+            )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,163 @@
+"""
+Near-duplicate detection for project memory.
+Each decision is reduced to a set of shingles (its word tokens and adjacent
+word pairs, via src.memory_index.tokenize) and a MinHash signature of that
+set. Signatures are split into LSH bands, bucketed per category, so a new
+decision is compared only with records that share at least one band; the
+candidates are then checked with the exact Jaccard similarity of their
+shingle sets.
+
+The index lives in memory. Like the BM25 and vector indexes it remembers how
+far into the log it has read and applies only newly appended lines; after a
+compaction it replays the log but keeps the entries whose content did not
+change. MEMORY_DEDUP_THRESHOLD (default 0.65) is the Jaccard similarity from
+which a new decision counts as a near-duplicate; 0 or "off" disables
+near-duplicate merging (exact duplicates are still recognised).
+"""
+import hashlib
+import os
+import struct
+import threading
+from functools import lru_cache
+from typing import Iterable, Optional
+
+from src.memory_index import tokenize
+
+NUM_PERM = 64
+# 32 bands of 2 rows: pairs at Jaccard >= 0.5 share a band with probability ~0.9999.
+BANDS = 32
+ROWS = NUM_PERM // BANDS
+# Each keyed 64-byte BLAKE2b digest yields 16 independent 32-bit hash values.
+_KEYS = [f"minhash-{i}".encode() for i in range(NUM_PERM // 16)]
+_UNPACK = struct.Struct(f"<{NUM_PERM}I").unpack
+
+
+# "Use FastAPI for the HTTP API" vs "... HTTP API layer" is 0.71; different decisions
+# worded alike ("Do not store secrets ..." vs "Store secrets ...") stay below 0.6.
+DEFAULT_THRESHOLD = 0.65
+
+
+def threshold_from_env() -> Optional[float]:
+    """Near-duplicate threshold in (0, 1], or None when near-duplicate merging is off."""
+    raw = os.getenv("MEMORY_DEDUP_THRESHOLD", "").strip().lower()
+    if not raw:
+        return DEFAULT_THRESHOLD
+    if raw in ("off", "none"):
+        return None
+    try:
+        value = float(raw)
+    except ValueError:
+        return DEFAULT_THRESHOLD
+    return None if value <= 0 else min(value, 1.0)
+
+
+def shingles(text: str) -> frozenset[str]:
+    tokens = tokenize(text)
+    return frozenset(tokens) | frozenset(f"{a} {b}" for a, b in zip(tokens, tokens[1:]))
+
+
+@lru_cache(maxsize=1 << 16)
+def _hashes(shingle: str) -> tuple[int, ...]:
+    """NUM_PERM hash values of one shingle, stable across processes."""
+    data = shingle.encode()
+    return _UNPACK(b"".join(hashlib.blake2b(data, digest_size=64, key=key).digest() for key in _KEYS))
+
+
+def signature(items: frozenset[str]) -> tuple[int, ...]:
+    """MinHash signature: per hash function, the minimum over the set's shingles."""
+    if not items:
+        return ()
+    return tuple(map(min, zip(*map(_hashes, items))))
+
+
+def jaccard(a: frozenset[str], b: frozenset[str]) -> float:
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+class NearDupIndex:
+    """MinHash/LSH buckets over the live records of a memory log, per category."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # id -> (category, content, shingles, signature)
+        self._records: dict[int, tuple[str, str, frozenset[str], tuple[int, ...]]] = {}
+        self._buckets: dict[tuple[str, int, tuple[int, ...]], set[int]] = {}
+        self._inode: Optional[int] = None
+        self._offset = 0
+
+    def _bands(self, category: str, sig: tuple[int, ...]) -> Iterable[tuple[str, int, tuple[int, ...]]]:
+        for band in range(BANDS if sig else 0):
+            yield category, band, sig[band * ROWS:(band + 1) * ROWS]
+
+    def _remove(self, rid: int) -> None:
+        entry = self._records.pop(rid, None)
+        if entry is None:
+            return
+        for key in self._bands(entry[0], entry[3]):
+            bucket = self._buckets.get(key)
+            if bucket is not None:
+                bucket.discard(rid)
+                if not bucket:
+                    del self._buckets[key]
+
+    def apply(self, records: Iterable[dict], stale: Optional[set] = None) -> None:
+        """Index upserted records and drop deleted ones. Ids seen are removed from `stale`."""
+        for record in records:
+            rid = int(record["id"])
+            if stale is not None:
+                stale.discard(rid)
+            if record.get("deleted"):
+                self._remove(rid)
+                continue
+            category = record.get("category", "")
+            content = record.get("content", "") or ""
+            entry = self._records.get(rid)
+            if entry is not None and entry[0] == category and entry[1] == content:
+                continue
+            self._remove(rid)
+            items = shingles(content)
+            sig = signature(items)
+            self._records[rid] = (category, content, items, sig)
+            for key in self._bands(category, sig):
+                self._buckets.setdefault(key, set()).add(rid)
+
+    def sync(self, inode: int, size: int, read_from) -> None:
+        """Apply everything appended to the log at (inode, size) since the last sync."""
+        with self._lock:
+            if self._inode == inode and self._offset == size:
+                return
+            if self._inode != inode or self._offset > size:
+                # A compacted log holds the same records; replay it and keep unchanged entries.
+                stale = set(self._records)
+                self.apply(read_from(0), stale)
+                for rid in stale:
+                    self._remove(rid)
+            else:
+                self.apply(read_from(self._offset))
+            self._inode, self._offset = inode, size
+
+    def rebase(self, inode: int, size: int) -> None:
+        """Point the index at a compacted log holding the same live records."""
+        with self._lock:
+            self._inode, self._offset = inode, size
+
+    def find(self, category: str, content: str, threshold: float) -> Optional[tuple[int, float]]:
+        """(id, similarity) of the most similar live record in `category` at or above `threshold`."""
+        items = shingles(content)
+        sig = signature(items)
+        with self._lock:
+            candidates = set()
+            for key in self._bands(category, sig):
+                candidates |= self._buckets.get(key, set())
+            best = None
+            for rid in candidates:
+                score = jaccard(items, self._records[rid][2])
+                if score >= threshold and (best is None or (score, rid) > (best[1], best[0])):
+                    best = (rid, score)
+            return best
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._records)
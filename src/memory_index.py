@@ -0,0 +1,217 @@
+"""
+Full-text inverted index over the project memory log.
+Tokenized content and tags are kept in a SQLite postings table next to the
+log and ranked with BM25, so a query only touches the postings of its own
+terms instead of scanning every record.
+
+The index is persistent and incremental: it remembers how far into the log
+it has read (byte offset + inode) and on each sync only applies lines
+appended since then. A compacted or replaced log triggers a rebuild.
+"""
+import heapq
+import json
+import math
+import re
+import sqlite3
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9_+#]*")
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in into is it its of on or "
+    "that the this to use used using was we were will with".split()
+)
+# BM25 parameters and tag weighting (a tag hit counts as this many term hits).
+K1 = 1.2
+B = 0.75
+TAG_WEIGHT = 2
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercase word tokens with stopwords removed and plural 's' folded."""
+    out = []
+    for tok in _TOKEN_RE.findall(text.lower()):
+        if tok in _STOPWORDS:
+            continue
+        if len(tok) > 3 and tok.endswith("s") and not tok.endswith("ss"):
+            tok = tok[:-1]
+        out.append(tok)
+    return out
+
+
+def _doc_terms(record: dict) -> Counter:
+    terms = Counter(tokenize(" ".join([record.get("content", "") or "", *(record.get("variants") or [])])))
+    for tok in tokenize(" ".join(record.get("tags", []) or [])):
+        terms[tok] += TAG_WEIGHT
+    return terms
+
+
+class InvertedIndex:
+    """BM25 index persisted in SQLite, synced from a MemoryStore log."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER);
+            CREATE TABLE IF NOT EXISTS docs (id INTEGER PRIMARY KEY, category TEXT, length INTEGER);
+            CREATE TABLE IF NOT EXISTS terms (term TEXT PRIMARY KEY, df INTEGER) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS postings (
+                term TEXT, id INTEGER, tf INTEGER, PRIMARY KEY (term, id)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS postings_id ON postings (id);
+            CREATE INDEX IF NOT EXISTS docs_category ON docs (category);
+            """
+        )
+
+    # -- maintenance -------------------------------------------------------
+
+    def _meta(self, key: str, default: int = 0) -> int:
+        row = self._db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    def _set_meta(self, **values: int) -> None:
+        self._db.executemany(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", values.items()
+        )
+
+    def apply(self, records: Iterable[dict]) -> None:
+        """Apply log records (upserts and tombstones) to the index."""
+        total_length = self._meta("total_length")
+        n_docs = self._meta("doc_count")
+        for record in records:
+            rid = int(record["id"])
+            row = self._db.execute("SELECT length FROM docs WHERE id = ?", (rid,)).fetchone()
+            if row:
+                self._db.executemany(
+                    "UPDATE terms SET df = df - 1 WHERE term = ?",
+                    self._db.execute("SELECT term FROM postings WHERE id = ?", (rid,)).fetchall(),
+                )
+                self._db.execute("DELETE FROM postings WHERE id = ?", (rid,))
+                self._db.execute("DELETE FROM docs WHERE id = ?", (rid,))
+                total_length -= row[0]
+                n_docs -= 1
+            if record.get("deleted"):
+                continue
+            terms = _doc_terms(record)
+            length = sum(terms.values())
+            self._db.execute(
+                "INSERT INTO docs (id, category, length) VALUES (?, ?, ?)",
+                (rid, record.get("category", ""), length),
+            )
+            self._db.executemany(
+                "INSERT INTO postings (term, id, tf) VALUES (?, ?, ?)",
+                ((t, rid, tf) for t, tf in terms.items()),
+            )
+            self._db.executemany(
+                "INSERT INTO terms (term, df) VALUES (?, 1) "
+                "ON CONFLICT(term) DO UPDATE SET df = df + 1",
+                ((t,) for t in terms),
+            )
+            total_length += length
+            n_docs += 1
+        self._set_meta(total_length=total_length, doc_count=n_docs)
+
+    def sync(self, inode: int, size: int, read_from) -> None:
+        """
+        Bring the index up to date with the log at (inode, size).
+        `read_from(offset)` yields the log's records from that byte offset.
+        """
+        with self._lock:
+            if self._meta("log_inode", -1) == inode and self._meta("log_offset") == size:
+                return
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                offset = self._meta("log_offset")
+                if self._meta("log_inode", -1) != inode or offset > size:
+                    self._clear()
+                    offset = 0
+                self.apply(read_from(offset))
+                self._set_meta(log_inode=inode, log_offset=size)
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+
+    def rebase(self, inode: int, size: int) -> None:
+        """Point the index at a compacted log holding the same live records."""
+        with self._lock:
+            self._set_meta(log_inode=inode, log_offset=size)
+
+    def _clear(self) -> None:
+        self._db.execute("DELETE FROM postings")
+        self._db.execute("DELETE FROM terms")
+        self._db.execute("DELETE FROM docs")
+        self._db.execute("DELETE FROM meta")
+
+    # -- queries -----------------------------------------------------------
+
+    def search(self, query: str, category: Optional[str] = None, limit: int = 10) -> list[tuple[int, float]]:
+        """Return up to `limit` (id, score) pairs, best first."""
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            return []
+        with self._lock:
+            n_docs = self._meta("doc_count")
+            if not n_docs:
+                return []
+            avgdl = max(self._meta("total_length") / n_docs, 1.0)
+            dfs = {
+                t: df for t, df in self._db.execute(
+                    f"SELECT term, df FROM terms WHERE term IN ({','.join('?' * len(terms))})", terms
+                ) if df > 0
+            }
+            # Terms present in most documents carry ~zero IDF; skip them when
+            # rarer terms exist so common words don't force a full postings scan.
+            rare = [t for t in dfs if dfs[t] <= n_docs // 2]
+            scores: dict[int, float] = {}
+            for term in rare or list(dfs):
+                df = dfs[term]
+                idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+                sql = (
+                    "SELECT p.id, p.tf, d.length FROM postings p JOIN docs d ON d.id = p.id "
+                    "WHERE p.term = ?"
+                )
+                params: tuple = (term,)
+                if category:
+                    sql += " AND d.category = ?"
+                    params = (term, category)
+                for rid, tf, length in self._db.execute(sql, params):
+                    norm = tf + K1 * (1 - B + B * length / avgdl)
+                    scores[rid] = scores.get(rid, 0.0) + idf * tf * (K1 + 1) / norm
+        # Ties go to the most recent decision.
+        return heapq.nlargest(limit, scores.items(), key=lambda kv: (kv[1], kv[0]))
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._meta("doc_count")
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+def iter_log(path: Path, offset: int, end: int) -> Iterator[dict]:
+    """Yield JSON records from a JSONL log between two byte offsets."""
+    if end <= offset:  # nothing new, or no log written yet
+        return
+    with Path(path).open("rb") as f:
+        f.seek(offset)
+        remaining = end - offset
+        for line in f:
+            remaining -= len(line)
+            if remaining < 0:
+                break
+            try:
+                record = json.loads(line)
+                int(record["id"])
+            except Exception:
+                continue
+            yield record
@@ -0,0 +1,100 @@
+"""
+Retention policy for project memory.
+MEMORY_RETENTION caps how many live decisions each category keeps, e.g.
+"500" (every category) or "architecture=200,library=100,*=500"; unset, 0 or
+"none" means unlimited, so nothing is ever evicted unless a limit is set.
+When a store pushes a category over its limit, the least recently used
+records are deleted: "used" means last retrieved, or last
+stored/refreshed if never retrieved since.
+
+Last-use times are kept in a small SQLite table next to the log
+(project_memory.access.sqlite) rather than in the log itself, so a retrieval
+never grows the append-only log. Records from before this table existed
+count as least recently used, oldest id first.
+"""
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Iterable, Optional
+
+DEFAULT_RETENTION = "none"
+
+
+def retention_limits(spec: Optional[str] = None) -> dict[str, int]:
+    """Parse a retention spec into {category: limit}; "*" is the default for other categories."""
+    spec = (spec if spec is not None else os.getenv("MEMORY_RETENTION", DEFAULT_RETENTION)).strip()
+    if not spec or spec.lower() == "none":
+        return {}
+    limits: dict[str, int] = {}
+    for part in spec.split(","):
+        category, _, value = part.rpartition("=")
+        try:
+            limit = int(value.strip())
+        except ValueError:
+            continue
+        if limit > 0:
+            limits[category.strip() or "*"] = limit
+    return limits
+
+
+def limit_for(limits: dict[str, int], category: str) -> Optional[int]:
+    return limits.get(category, limits.get("*"))
+
+
+class AccessLog:
+    """Last-use time per record id, shared by every process using the same log."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None, timeout=30)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute("CREATE TABLE IF NOT EXISTS access (id INTEGER PRIMARY KEY, last_used REAL, uses INTEGER)")
+
+    def touch(self, ids: Iterable[int], when: Optional[float] = None) -> None:
+        when = when if when is not None else time.time()
+        with self._lock:
+            self._db.executemany(
+                "INSERT INTO access (id, last_used, uses) VALUES (?, ?, 1) "
+                "ON CONFLICT(id) DO UPDATE SET last_used = excluded.last_used, uses = uses + 1",
+                ((int(rid), when) for rid in ids),
+            )
+
+    def last_used(self, ids: list[int]) -> dict[int, float]:
+        out: dict[int, float] = {}
+        with self._lock:
+            for start in range(0, len(ids), 500):
+                chunk = ids[start:start + 500]
+                rows = self._db.execute(
+                    f"SELECT id, last_used FROM access WHERE id IN ({','.join('?' * len(chunk))})", chunk
+                )
+                out.update(rows)
+        return out
+
+    def forget(self, ids: Iterable[int]) -> None:
+        with self._lock:
+            self._db.executemany("DELETE FROM access WHERE id = ?", ((int(rid),) for rid in ids))
+
+    def retain(self, ids: Iterable[int]) -> int:
+        """Drop the rows of every id not in `ids` (e.g. after compaction); returns how many."""
+        keep = {int(rid) for rid in ids}
+        with self._lock:
+            stale = [rid for (rid,) in self._db.execute("SELECT id FROM access") if rid not in keep]
+        self.forget(stale)
+        return len(stale)
+
+    def least_recently_used(self, ids: list[int], count: int, keep: Iterable[int] = ()) -> list[int]:
+        """The `count` ids in `ids` used longest ago, never any of `keep`."""
+        if count <= 0:
+            return []
+        keep = set(keep)
+        used = self.last_used(ids)
+        return sorted((rid for rid in ids if rid not in keep), key=lambda rid: (used.get(rid, 0.0), rid))[:count]
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
@@ -1,55 +1,539 @@
 """
 Project memory store for the Elite Dev Team.
 Provides programmatic access to stored decisions.
+
+Decisions live in an append-only JSONL log (memory/project_memory.jsonl).
+Every line is a full record; a later line with the same id supersedes an
+earlier one and {"id": n, "deleted": true} removes it. An in-process
+id/category index maps ids to byte offsets, so a store is a single append
+and reads seek straight to the records they need. `store_many()` writes a
+batch with one fsync'd append. Writes go through a group-commit queue and
+hold an inter-process file lock (src.memory_writer), so concurrent threads and
+processes never lose records or share ids. A decision that is a near-duplicate of one in
+the same category (src.memory_dedup, MinHash/LSH) is folded into that record
+instead of adding another: the record keeps its content and the new wording is
+kept in its "variants". Categories over their MEMORY_RETENTION limit drop the
+least recently retrieved records (src.memory_retention). `compact()` rewrites the
+log with live records only. Keyword retrieval is ranked with BM25 by the
+persistent inverted index in src.memory_index (project_memory.index.sqlite).
+With MEMORY_SEMANTIC=1 (or semantic=True) retrieval also runs offline
+embedding recall (src.memory_vectors) and fuses both rankings.
+
+    python -m src.memory_store compact
+    python -m src.memory_store prune
+    python -m src.memory_store stats
 """
+import argparse
 import json
+import os
+import threading
+from concurrent.futures import Future
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Iterator, Optional
+
+from src import memory_vectors
+from src.memory_dedup import NearDupIndex, jaccard, shingles, threshold_from_env
+from src.memory_index import InvertedIndex, iter_log, tokenize
+from src.memory_retention import AccessLog, limit_for, retention_limits
+from src.memory_writer import FileLock, WriteQueue
 
 MEMORY_DIR = Path(__file__).parent.parent / "memory"
-MEMORY_FILE = MEMORY_DIR / "project_memory.json"
+MEMORY_FILE = MEMORY_DIR / "project_memory.jsonl"
+# Rewordings kept on a record that near-duplicates were folded into (newest last).
+MAX_VARIANTS = 10
+LEGACY_MEMORY_FILE = MEMORY_DIR / "project_memory.json"
+# Reciprocal-rank-fusion constant for merging keyword and semantic rankings.
+RRF_K = 60
 
 
-def store(category: str, content: str, tags: Optional[list[str]] = None) -> int:
-    """Store a decision. Returns record id."""
-    MEMORY_DIR.mkdir(parents=True, exist_ok=True)
-    records = []
-    if MEMORY_FILE.exists():
+def semantic_enabled() -> bool:
+    """Whether semantic recall is on by default (MEMORY_SEMANTIC=1 and numpy installed)."""
+    flag = os.getenv("MEMORY_SEMANTIC", "").strip().lower() in ("1", "true", "yes", "on")
+    return flag and memory_vectors.available()
+
+
+def _fuse(rankings: list[list[int]], limit: int) -> list[int]:
+    scores: dict[int, float] = {}
+    for ranking in rankings:
+        for rank, rid in enumerate(ranking):
+            scores[rid] = scores.get(rid, 0.0) + 1.0 / (RRF_K + rank + 1)
+    return sorted(scores, key=lambda rid: (scores[rid], rid), reverse=True)[:limit]
+
+
+def _fsync_dir(path: Path) -> None:
+    """Make a rename in `path` durable (no-op where directories cannot be opened)."""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _fingerprint(category: str, content: str) -> tuple[str, str]:
+    return category.strip().lower(), " ".join(content.lower().split())
+
+
+def _tags(value) -> list[str]:
+    """Tags given as a list or a comma-separated string."""
+    items = value if isinstance(value, list) else str(value or "").split(",")
+    return [str(t).strip() for t in items if str(t).strip()]
+
+
+class MemoryStore:
+    """Append-only decision log with an in-memory id/category index."""
+
+    def __init__(self, path: Path = MEMORY_FILE, legacy_path: Optional[Path] = None):
+        self.path = Path(path)
+        self.legacy_path = legacy_path
+        self._lock = threading.RLock()
+        self._search_index: Optional[InvertedIndex] = None
+        self._vectors: Optional["memory_vectors.VectorIndex"] = None
+        self._dedup: Optional[NearDupIndex] = None
+        self._access: Optional[AccessLog] = None
+        self._file_lock = FileLock(self.path.with_name(self.path.name + ".lock"))
+        self._writes = WriteQueue(lambda batch: self._store_batch(batch, sync=True))
+        self._reset_index()
+        self._migrate_legacy()
+
+    # -- index maintenance -------------------------------------------------
+
+    def _reset_index(self) -> None:
+        self._offsets: dict[int, tuple[int, int]] = {}
+        self._by_category: dict[str, set[int]] = {}
+        self._size = 0
+        self._inode: Optional[int] = None
+        self._max_id = 0
+        self._dead_lines = 0
+
+    def _index_line(self, offset: int, line: bytes) -> None:
         try:
-            records = json.loads(MEMORY_FILE.read_text(encoding="utf-8"))
+            record = json.loads(line)
+            rid = int(record["id"])
         except Exception:
-            pass
-    if not isinstance(records, list):
-        records = []
-    rid = len(records) + 1
-    records.append({
-        "id": rid,
-        "category": category,
-        "content": content,
-        "tags": tags or [],
-    })
-    MEMORY_FILE.write_text(json.dumps(records, indent=2), encoding="utf-8")
-    return rid
-
-
-def retrieve(query: str, category: Optional[str] = None, limit: int = 10) -> list[dict]:
+            self._dead_lines += 1  # torn or foreign line; dropped on compaction
+            return
+        self._max_id = max(self._max_id, rid)
+        if rid in self._offsets:
+            self._dead_lines += 1
+            self._unindex(rid)
+        if record.get("deleted"):
+            self._dead_lines += 1
+            return
+        self._offsets[rid] = (offset, len(line))
+        self._by_category.setdefault(record.get("category", ""), set()).add(rid)
+
+    def _unindex(self, rid: int) -> None:
+        self._offsets.pop(rid, None)
+        for ids in self._by_category.values():
+            ids.discard(rid)
+
+    def refresh(self) -> None:
+        """Index lines appended since the last call (by this or another process)."""
+        with self._lock:
+            try:
+                st = self.path.stat()
+            except FileNotFoundError:
+                self._reset_index()
+                return
+            if st.st_ino != self._inode or st.st_size < self._size:
+                # First open, or the log was compacted underneath us.
+                self._reset_index()
+                self._inode = st.st_ino
+            if st.st_size == self._size:
+                return
+            with self.path.open("rb") as f:
+                f.seek(self._size)
+                chunk = f.read(st.st_size - self._size)
+            end = chunk.rfind(b"\n") + 1  # leave a half-written tail line for later
+            offset = self._size
+            for line in chunk[:end].splitlines(keepends=True):
+                if line.strip():
+                    self._index_line(offset, line.rstrip(b"\n"))
+                offset += len(line)
+            self._size += end
+
+    def _migrate_legacy(self) -> None:
+        """Import the pre-JSONL project_memory.json once, keeping its ids."""
+        if self.legacy_path is None or self.path.exists() or not self.legacy_path.exists():
+            return
+        with self._locked():
+            if self.path.exists():
+                return  # another process migrated first
+            try:
+                records = json.loads(self.legacy_path.read_text(encoding="utf-8"))
+            except Exception:
+                return
+            if isinstance(records, list) and records:
+                self._append([r for r in records if isinstance(r, dict) and "id" in r], sync=True)
+
+    # -- writes ------------------------------------------------------------
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        """This process's lock plus the inter-process lock on the log; every write holds both."""
+        with self._lock, self._file_lock.held():
+            yield
+
+    def _append(self, records: list[dict], sync: bool = False) -> None:
+        if not records:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        data = b"".join(
+            json.dumps(r, ensure_ascii=False).encode("utf-8") + b"\n" for r in records
+        )
+        with self._locked():
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT | os.O_APPEND, 0o644)
+            try:
+                size = os.fstat(fd).st_size
+                if size and os.pread(fd, 1, size - 1) != b"\n":
+                    data = b"\n" + data  # a writer died mid-line; keep its fragment on a line of its own
+                view = memoryview(data)
+                while view:
+                    view = view[os.write(fd, view):]
+                if sync:
+                    os.fsync(fd)
+            finally:
+                os.close(fd)
+            self.refresh()
+
+    def store(self, category: str, content: str, tags: Optional[list[str]] = None) -> int:
+        """Store a decision (or merge it into a near-duplicate). Returns record id once durable."""
+        result = self.submit([{"category": category, "content": content, "tags": tags}])[0].result()
+        if result["status"] == "invalid":
+            raise ValueError(result["error"])
+        return result["id"]
+
+    def store_many(self, decisions: list[dict]) -> list[dict]:
+        """
+        Store several decisions with one durable append. A decision that is a near-duplicate
+        of an existing record, or of an earlier one in the batch, updates that record instead.
+        Returns one {"status": "stored" | "merged" | "duplicate" | "invalid", ...} per decision.
+        """
+        return [future.result() for future in self.submit(decisions)]
+
+    def submit(self, decisions: list[dict]) -> list[Future]:
+        """
+        Queue decisions for the background writer without waiting; each Future resolves
+        to the store_many() result for its decision. Stores queued by concurrent threads
+        are committed together. `flush()` waits for everything queued so far.
+        """
+        return self._writes.submit(list(decisions))
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        return self._writes.flush(timeout)
+
+    def _store_batch(self, decisions: list[dict], sync: bool) -> list[dict]:
+        threshold = threshold_from_env()  # None: near-duplicate merging off, exact matches only
+        with self._locked():
+            self.refresh()
+            index = self.dedup_index() if self._offsets else None
+            results: list[dict] = []
+            writes: dict[int, dict] = {}  # new and merged records, by id
+            refreshed: list[int] = []
+            for decision in decisions:
+                category = str(decision.get("category") or "").strip()
+                content = str(decision.get("content") or "").strip()
+                if not category or not content:
+                    results.append({"status": "invalid", "error": "category and content are required"})
+                    continue
+                tags = _tags(decision.get("tags"))
+                match = self._near_duplicate(category, content, threshold, index, writes)
+                if match is None:
+                    rid = self._max_id + sum(r not in self._offsets for r in writes) + 1
+                    writes[rid] = {"id": rid, "category": category, "content": content, "tags": tags}
+                    results.append({"status": "stored", "id": rid, "category": category})
+                    continue
+                rid, similarity = match
+                existing = writes.get(rid) or self.get(rid) or {}
+                old_tags = existing.get("tags") or []
+                merged_tags = old_tags + [t for t in tags if t not in old_tags]
+                if (
+                    _fingerprint(existing.get("category", ""), existing.get("content", ""))
+                    == _fingerprint(category, content)
+                    and merged_tags == old_tags
+                ):
+                    refreshed.append(rid)
+                    results.append({"status": "duplicate", "id": rid, "category": category})
+                    continue
+                # Never overwrite what was stored: the new wording is kept beside it.
+                variants = list(existing.get("variants") or [])
+                known = {_fingerprint(category, v) for v in [existing.get("content", ""), *variants]}
+                if _fingerprint(category, content) not in known:
+                    variants = (variants + [content])[-MAX_VARIANTS:]
+                writes[rid] = {
+                    **existing, "tags": merged_tags, "variants": variants, "merged": existing.get("merged", 0) + 1,
+                }
+                results.append({"status": "merged", "id": rid, "category": category, "similarity": round(similarity, 2)})
+            self._append(list(writes.values()), sync=sync)
+            if writes or refreshed:
+                self.access_log().touch([*writes, *refreshed])
+            self._enforce_retention({r["category"] for r in writes.values()}, keep=writes, sync=sync)
+            if writes and (self._vectors is not None or semantic_enabled()):
+                self.vector_index()  # embed incrementally, off the query path
+            return results
+
+    def _near_duplicate(
+        self, category: str, content: str, threshold: Optional[float], index: Optional[NearDupIndex],
+        writes: dict[int, dict],
+    ) -> Optional[tuple[int, float]]:
+        """(id, similarity) of the closest record in the log or the pending batch, if close enough.
+        With `threshold` None only an exact duplicate (same normalized category and content) matches."""
+        cutoff = 1.0 if threshold is None else threshold  # identical token sets are the candidates when off
+        best = index.find(category, content, cutoff) if index is not None else None
+        items = shingles(content)
+        for rid, record in writes.items():
+            if record["category"] != category:
+                continue
+            score = jaccard(items, shingles(record["content"]))
+            if score >= cutoff and (best is None or score > best[1]):
+                best = (rid, score)
+        if threshold is None and best is not None:
+            # Only the same normalized text counts as a duplicate.
+            record = writes.get(best[0]) or self.get(best[0]) or {}
+            if _fingerprint(record.get("category", ""), record.get("content", "")) != _fingerprint(category, content):
+                return None
+        return best
+
+    def _enforce_retention(self, categories: set[str], keep: Iterable[int] = (), sync: bool = False) -> list[int]:
+        """Delete the least recently used records of categories over their MEMORY_RETENTION limit."""
+        limits = retention_limits()
+        victims: list[int] = []
+        for category in sorted(categories):
+            limit = limit_for(limits, category)
+            ids = sorted(self._by_category.get(category, ()))
+            if limit is not None and len(ids) > limit:
+                victims += self.access_log().least_recently_used(ids, len(ids) - limit, keep)
+        if victims:
+            self._append([{"id": rid, "deleted": True} for rid in victims], sync=sync)
+            self.access_log().forget(victims)
+        return victims
+
+    def prune(self) -> dict:
+        """Apply the retention limits to every category now."""
+        with self._locked():
+            self.refresh()
+            evicted = self._enforce_retention(set(self._by_category), sync=True)
+            return {"evicted": len(evicted), "records": len(self._offsets), "limits": retention_limits()}
+
+    def delete(self, rid: int) -> bool:
+        """Remove a record. Returns False if it does not exist."""
+        with self._locked():
+            self.refresh()
+            if rid not in self._offsets:
+                return False
+            self._append([{"id": rid, "deleted": True}])
+            self.access_log().forget([rid])
+            return True
+
+    def compact(self) -> dict:
+        """Rewrite the log with live records only (atomic rename, under the writer lock)."""
+        with self._locked():
+            index = self.search_index()
+            vectors = None
+            if memory_vectors.available() and memory_vectors.exists(self._vector_path()):
+                vectors = self.vector_index()
+            before = self._size
+            tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+            with tmp.open("wb") as out:
+                for record in self.records():
+                    out.write(json.dumps(record, ensure_ascii=False).encode("utf-8") + b"\n")
+                if self._max_id and self._max_id not in self._offsets:
+                    # Keep the high-water mark so deleted ids are never reused.
+                    out.write(json.dumps({"id": self._max_id, "deleted": True}).encode("utf-8") + b"\n")
+                out.flush()
+                os.fsync(out.fileno())
+            os.replace(tmp, self.path)
+            _fsync_dir(self.path.parent)
+            self._reset_index()
+            self.refresh()
+            index.rebase(self._inode, self._size)
+            if vectors is not None:
+                vectors.rebase(self._inode, self._size)
+            if self._dedup is not None:
+                self._dedup.rebase(self._inode, self._size)
+            self.access_log().retain(self._offsets)  # rows of ids deleted by other means
+            return {"records": len(self._offsets), "bytes_before": before, "bytes_after": self._size}
+
+    # -- reads -------------------------------------------------------------
+
+    def __len__(self) -> int:
+        with self._lock:
+            self.refresh()
+            return len(self._offsets)
+
+    def ids(self, category: Optional[str] = None) -> list[int]:
+        """Live record ids in store order, optionally restricted to a category."""
+        with self._lock:
+            self.refresh()
+            if category is None:
+                return sorted(self._offsets)
+            return sorted(self._by_category.get(category, ()))
+
+    def get_many(self, ids: list[int]) -> list[dict]:
+        """Fetch records by id, seeking directly to each line."""
+        with self._lock:
+            self.refresh()
+            spans = [(rid, self._offsets[rid]) for rid in ids if rid in self._offsets]
+            out = []
+            if not spans:
+                return out
+            with self.path.open("rb") as f:
+                for _, (offset, length) in spans:
+                    f.seek(offset)
+                    out.append(json.loads(f.read(length)))
+            return out
+
+    def get(self, rid: int) -> Optional[dict]:
+        found = self.get_many([rid])
+        return found[0] if found else None
+
+    def records(self, category: Optional[str] = None) -> Iterator[dict]:
+        """Iterate live records in store order."""
+        ids = self.ids(category)
+        for start in range(0, len(ids), 1000):
+            yield from self.get_many(ids[start:start + 1000])
+
+    def search_index(self) -> InvertedIndex:
+        """The BM25 index, caught up with every line appended so far."""
+        with self._lock:
+            self.refresh()
+            if self._search_index is None:
+                self._search_index = InvertedIndex(self.path.with_name(self.path.stem + ".index.sqlite"))
+            end = self._size
+            self._search_index.sync(
+                self._inode or 0, end, lambda offset: iter_log(self.path, offset, end)
+            )
+            return self._search_index
+
+    def dedup_index(self) -> NearDupIndex:
+        """The near-duplicate (MinHash/LSH) index, caught up with the log."""
+        with self._lock:
+            self.refresh()
+            if self._dedup is None:
+                self._dedup = NearDupIndex()
+            end = self._size
+            self._dedup.sync(self._inode or 0, end, lambda offset: iter_log(self.path, offset, end))
+            return self._dedup
+
+    def access_log(self) -> AccessLog:
+        with self._lock:
+            if self._access is None:
+                self._access = AccessLog(self.path.with_name(self.path.stem + ".access.sqlite"))
+            return self._access
+
+    def _vector_path(self) -> Path:
+        return self.path.with_name(self.path.stem + ".vectors")
+
+    def vector_index(self) -> "memory_vectors.VectorIndex":
+        """The embedding matrix, caught up with every line appended so far."""
+        with self._lock:
+            self.refresh()
+            if self._vectors is None:
+                self._vectors = memory_vectors.VectorIndex(self._vector_path())
+            end = self._size
+            self._vectors.sync(self._inode or 0, end, lambda offset: iter_log(self.path, offset, end))
+            return self._vectors
+
+    def search(self, query: str, category: Optional[str] = None, limit: int = 10) -> list[tuple[dict, float]]:
+        """Ranked (record, score) pairs for a keyword query, best first."""
+        hits = self.search_index().search(query, category, limit)
+        scores = dict(hits)
+        return [(r, scores[r["id"]]) for r in self.get_many([rid for rid, _ in hits])]
+
+    def retrieve(
+        self, query: str, category: Optional[str] = None, limit: int = 10, semantic: Optional[bool] = None
+    ) -> list[dict]:
+        """
+        Retrieve the decisions most relevant to query, optionally within a category.
+        semantic=True fuses BM25 hits with embedding recall (default: MEMORY_SEMANTIC).
+        """
+        if not tokenize(query):
+            # Nothing to rank on: fall back to the most recent decisions.
+            found = self.get_many(self.ids(category)[-limit:][::-1])
+        else:
+            if semantic is None:
+                semantic = semantic_enabled()
+            if not semantic:
+                found = [r for r, _ in self.search(query, category, limit)]
+            else:
+                pool = limit * 3
+                keyword = [rid for rid, _ in self.search_index().search(query, category, pool)]
+                similar = [rid for rid, _ in self.vector_index().search(query, category, pool)]
+                found = self.get_many(_fuse([keyword, similar], limit))
+        if found:
+            self.access_log().touch(r["id"] for r in found)  # retention evicts least recently retrieved
+        return found
+
+    def version(self) -> tuple:
+        """Changes whenever the log does (appends, deletes, compaction), in any process."""
+        with self._lock:
+            self.refresh()
+            return (self._inode, self._size)
+
+    def stats(self) -> dict:
+        with self._lock:
+            self.refresh()
+            return {
+                "path": str(self.path),
+                "records": len(self._offsets),
+                "bytes": self._size,
+                "dead_lines": self._dead_lines,
+                "categories": {c: len(ids) for c, ids in sorted(self._by_category.items()) if ids},
+                "retention": retention_limits(),
+            }
+
+
+_stores: dict[Path, MemoryStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_store(path: Optional[Path] = None) -> MemoryStore:
+    """Return the shared MemoryStore for `path` (default: the project memory log)."""
+    path = Path(path or MEMORY_FILE).resolve()
+    with _stores_lock:
+        if path not in _stores:
+            legacy = LEGACY_MEMORY_FILE if path == MEMORY_FILE.resolve() else None
+            _stores[path] = MemoryStore(path, legacy_path=legacy)
+        return _stores[path]
+
+
+def store(category: str, content: str, tags: Optional[list[str]] = None) -> int:
+    """Store a decision. Returns record id."""
+    return get_store().store(category, content, tags)
+
+
+def retrieve(
+    query: str, category: Optional[str] = None, limit: int = 10, semantic: Optional[bool] = None
+) -> list[dict]:
     """Retrieve decisions matching query/category."""
-    if not MEMORY_FILE.exists():
-        return []
-    try:
-        records = json.loads(MEMORY_FILE.read_text(encoding="utf-8"))
-    except Exception:
-        return []
-    if not isinstance(records, list):
-        return []
-
-    q = query.lower()
-    filtered = []
-    for r in records:
-        if category and r.get("category") != category:
-            continue
-        if q in (r.get("content", "") or "").lower():
-            filtered.append(r)
-        elif q in " ".join(r.get("tags", [])).lower():
-            filtered.append(r)
-    return filtered[-limit:]
+    return get_store().retrieve(query, category, limit, semantic)
+
+
+def store_many(decisions: list[dict]) -> list[dict]:
+    """Store several decisions at once, skipping duplicates."""
+    return get_store().store_many(decisions)
+
+
+def compact() -> dict:
+    """Compact the project memory log."""
+    return get_store().compact()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Project memory maintenance.")
+    parser.add_argument("command", choices=["compact", "prune", "stats"])
+    parser.add_argument("--path", type=Path, default=None, help="Memory log (default: memory/project_memory.jsonl)")
+    args = parser.parse_args()
+    s = get_store(args.path)
+    result = {"compact": s.compact, "prune": s.prune, "stats": s.stats}[args.command]()
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
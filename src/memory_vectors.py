@@ -0,0 +1,281 @@
+"""
+Offline semantic recall for project memory.
+Each decision is embedded as a hashed bag of word and character n-grams
+(no model download, no network), L2-normalized and stored as a row of a
+float32 matrix on disk that is memory-mapped for search. Cosine top-k is a
+batched matrix product over that memmap, so paraphrases that share word
+pieces ("Postgres pooling" / "use asyncpg pool") still meet.
+
+Like the BM25 index, the vector store remembers how far into the memory log
+it has read and embeds only newly appended records. Processes sharing the
+files serialize on a sidecar lock (<path>.lock): under it, the metadata is
+re-read, the files are reloaded if another process advanced them, and only
+then are new rows written at the recorded end. Requires numpy.
+"""
+import json
+import math
+import os
+import threading
+import zlib
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+from src.memory_index import tokenize
+from src.memory_writer import FileLock
+
+try:
+    import numpy as np
+except ImportError:  # semantic recall is optional
+    np = None
+
+DIM = 512
+# Character n-gram sizes taken from each "<word>" (with boundary markers).
+NGRAMS = (3, 4)
+# Whole-word features count double relative to a single n-gram.
+WORD_WEIGHT = 2.0
+# A hit needs MIN_SCORE and RELATIVE_SCORE x the query's best score. Cosine
+# falls with record length: a paraphrase of a one-sentence decision ("Postgres
+# pooling" / "Use asyncpg pool for database connections") scores ~0.16, while
+# chance n-gram overlap with unrelated decisions reaches 0.1 (90th percentile)
+# to 0.2 (99th); the relative cutoff drops that noise beside a clear match.
+MIN_SCORE = 0.12
+RELATIVE_SCORE = 0.6
+SEARCH_BATCH_ROWS = 65536
+
+
+def available() -> bool:
+    return np is not None
+
+
+def _stem(word: str) -> str:
+    for suffix in ("ing", "ed"):
+        if len(word) > len(suffix) + 2 and word.endswith(suffix):
+            return word[: -len(suffix)]
+    return word
+
+
+def _features(text: str) -> dict[str, float]:
+    counts: dict[str, float] = {}
+    for word in tokenize(text):
+        word = _stem(word)
+        counts["w:" + word] = counts.get("w:" + word, 0.0) + WORD_WEIGHT
+        marked = f"<{word}>"
+        for n in NGRAMS:
+            for i in range(len(marked) - n + 1):
+                gram = marked[i:i + n]
+                counts[gram] = counts.get(gram, 0.0) + 1.0
+    return counts
+
+
+def embed(texts: list[str], dim: int = DIM):
+    """Embed texts into an (n, dim) float32 matrix of unit vectors."""
+    out = np.zeros((len(texts), dim), dtype=np.float32)
+    for row, text in enumerate(texts):
+        for feat, count in _features(text).items():
+            h = zlib.crc32(feat.encode("utf-8"))
+            out[row, h % dim] += (1.0 + math.log(count)) * (1.0 if h & 0x80000000 else -1.0)
+    norms = np.linalg.norm(out, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return out / norms
+
+
+def _sibling(path: Path, suffix: str) -> Path:
+    return path.with_name(path.name + suffix)
+
+
+def exists(path: Path) -> bool:
+    """Whether a vector index has been built at `path`."""
+    return _sibling(Path(path), ".json").exists()
+
+
+def _record_text(record: dict) -> str:
+    return " ".join([record.get("content", "") or "", *(record.get("variants") or []), *(record.get("tags", []) or [])])
+
+
+class VectorIndex:
+    """Memory-mapped embedding matrix keyed by record id, synced from the log."""
+
+    def __init__(self, path: Path, dim: int = DIM):
+        if np is None:
+            raise ImportError("Semantic memory recall requires numpy (pip install numpy).")
+        self.path = Path(path)
+        self.dim = dim
+        self._rows_path = _sibling(self.path, ".f32")
+        self._ids_path = _sibling(self.path, ".ids")
+        self._meta_path = _sibling(self.path, ".json")
+        self._lock = threading.RLock()
+        self._file_lock = FileLock(_sibling(self.path, ".lock"))
+        self._meta: dict = {}
+        with self._file_lock.held():
+            self._load()
+
+    # -- persistence -------------------------------------------------------
+
+    def _read_meta(self) -> dict:
+        try:
+            return json.loads(self._meta_path.read_text(encoding="utf-8"))
+        except Exception:
+            return {}
+
+    def _load(self) -> None:
+        self._meta = self._read_meta()
+        if self._meta.get("dim") != self.dim:
+            self._clear()
+            return
+        n = self._meta.get("rows", 0)
+        self._ids = np.fromfile(self._ids_path, dtype=np.int64, count=2 * n).reshape(-1, 2) if n else np.zeros((0, 2), np.int64)
+        self._row_of = {int(rid): i for i, rid in enumerate(self._ids[:, 0]) if rid >= 0}
+        self._map()
+
+    def _map(self) -> None:
+        n = len(self._ids)
+        self._rows = (
+            np.memmap(self._rows_path, dtype=np.float32, mode="r", shape=(n, self.dim)) if n else None
+        )
+
+    def _clear(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._rows_path.write_bytes(b"")
+        self._ids_path.write_bytes(b"")
+        self._ids = np.zeros((0, 2), np.int64)
+        self._row_of: dict[int, int] = {}
+        self._rows = None
+        self._meta = {"dim": self.dim, "rows": 0, "categories": [], "log_inode": -1, "log_offset": 0}
+
+    def _write_meta(self) -> None:
+        tmp = _sibling(self._meta_path, ".tmp")
+        tmp.write_text(json.dumps(self._meta), encoding="utf-8")
+        os.replace(tmp, self._meta_path)
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        """This process's lock plus the inter-process lock; every write to the files holds both."""
+        with self._lock, self._file_lock.held():
+            yield
+
+    def _refresh(self) -> None:
+        """Reload if another process rewrote the metadata since we last read or wrote it."""
+        if self._read_meta() != self._meta:
+            self._load()
+
+    def _drop_row(self, row: int) -> None:
+        with self._ids_path.open("r+b") as f:
+            f.seek(row * 16)
+            f.write(np.array([-1, -1], dtype=np.int64).tobytes())
+        self._ids[row] = (-1, -1)
+
+    def apply(self, records: Iterable[dict]) -> None:
+        """Embed upserted records and drop deleted ones."""
+        with self._locked():
+            self._refresh()
+            self._apply(records)
+            self._write_meta()
+
+    def _apply(self, records: Iterable[dict]) -> None:
+        categories: list[str] = self._meta["categories"]
+        new_ids, texts = [], []
+        pending: dict[int, int] = {}
+        for record in records:
+            rid = int(record["id"])
+            if rid in self._row_of:
+                self._drop_row(self._row_of.pop(rid))
+            if rid in pending:
+                new_ids[pending.pop(rid)][0] = -1
+            if record.get("deleted"):
+                continue
+            category = record.get("category", "")
+            if category not in categories:
+                categories.append(category)
+            pending[rid] = len(new_ids)
+            new_ids.append([rid, categories.index(category)])
+            texts.append(_record_text(record))
+        if not new_ids:
+            return
+        start = len(self._ids)
+        vectors = embed(texts, self.dim)
+        ids = np.array(new_ids, dtype=np.int64)
+        # Write at the recorded end, dropping any tail left by a writer that died mid-append.
+        for path, data, width in ((self._rows_path, vectors, 4 * self.dim), (self._ids_path, ids, 16)):
+            with path.open("r+b") as f:
+                f.seek(start * width)
+                f.write(data.tobytes())
+                f.truncate()
+        self._ids = np.concatenate([self._ids, ids])
+        for i, rid in enumerate(ids[:, 0]):
+            if rid >= 0:
+                self._row_of[int(rid)] = start + i
+        self._meta["rows"] = len(self._ids)
+        self._map()
+
+    def sync(self, inode: int, size: int, read_from) -> None:
+        """Embed everything appended to the log at (inode, size) since the last sync."""
+        with self._lock:
+            if self._meta.get("log_inode") == inode and self._meta.get("log_offset") == size:
+                return
+        with self._locked():
+            self._refresh()  # another process may have advanced the files
+            if self._meta.get("log_inode") == inode and self._meta.get("log_offset") == size:
+                return
+            offset = self._meta.get("log_offset", 0)
+            if self._meta.get("log_inode") != inode or offset > size:
+                self._clear()
+                offset = 0
+            self._apply(read_from(offset))
+            self._meta.update(log_inode=inode, log_offset=size)
+            self._write_meta()
+
+    def rebase(self, inode: int, size: int) -> None:
+        """Point the index at a compacted log holding the same live records."""
+        with self._locked():
+            self._refresh()
+            self._meta.update(log_inode=inode, log_offset=size)
+            self._write_meta()
+
+    # -- queries -----------------------------------------------------------
+
+    def search_many(
+        self, queries: list[str], category: Optional[str] = None, limit: int = 10, min_score: float = MIN_SCORE
+    ) -> list[list[tuple[int, float]]]:
+        """Cosine top-k for a batch of queries: one list of (id, score) per query.
+
+        A hit needs at least `min_score` and RELATIVE_SCORE of the query's best score.
+        """
+        with self._lock:
+            if self._rows is None or not queries:
+                return [[] for _ in queries]
+            q = embed(queries, self.dim)
+            ids = self._ids[:, 0]
+            mask = ids >= 0
+            if category is not None:
+                categories = self._meta["categories"]
+                if category not in categories:
+                    return [[] for _ in queries]
+                mask &= self._ids[:, 1] == categories.index(category)
+            best_scores = np.full((len(queries), 0), -np.inf, dtype=np.float32)
+            best_rows = np.zeros((len(queries), 0), dtype=np.int64)
+            for start in range(0, len(ids), SEARCH_BATCH_ROWS):
+                block = np.asarray(self._rows[start:start + SEARCH_BATCH_ROWS])
+                scores = q @ block.T
+                scores[:, ~mask[start:start + SEARCH_BATCH_ROWS]] = -np.inf
+                k = min(limit, scores.shape[1])
+                top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+                best_scores = np.concatenate([best_scores, np.take_along_axis(scores, top, axis=1)], axis=1)
+                best_rows = np.concatenate([best_rows, top + start], axis=1)
+            results = []
+            for qi in range(len(queries)):
+                order = np.argsort(-best_scores[qi])[:limit]
+                cutoff = max(min_score, RELATIVE_SCORE * float(best_scores[qi, order[0]])) if len(order) else min_score
+                results.append([
+                    (int(ids[best_rows[qi, j]]), float(best_scores[qi, j]))
+                    for j in order if best_scores[qi, j] >= cutoff
+                ])
+            return results
+
+    def search(
+        self, query: str, category: Optional[str] = None, limit: int = 10, min_score: float = MIN_SCORE
+    ) -> list[tuple[int, float]]:
+        return self.search_many([query], category, limit, min_score)[0]
+
+    def __len__(self) -> int:
+        return len(self._row_of)
@@ -0,0 +1,111 @@
+"""
+Write coordination for the project memory log.
+
+  * FileLock: an exclusive advisory lock (fcntl.flock on <log>.lock) held
+    while a writer refreshes the log, picks ids and appends, so concurrent
+    processes never hand out the same id or append into a log that is being
+    compacted. Re-entrant within a process; a no-op where fcntl is missing.
+  * WriteQueue: a write-behind queue with group commit. Writers in any thread
+    enqueue and get a Future; one background thread drains everything that
+    queued up while the previous commit was running and commits it as a
+    single batch (one lock, one append, one fsync). Under concurrency the
+    batches grow on their own, and near-duplicates from different writers in
+    one batch are merged by the store.
+"""
+import atexit
+import os
+import threading
+from concurrent.futures import Future
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Iterator, Optional
+
+try:
+    import fcntl
+except ImportError:  # not available on Windows; writers in one process are still serialized
+    fcntl = None
+
+MAX_BATCH = 512
+
+
+class FileLock:
+    """Exclusive inter-process lock on a sidecar file, re-entrant per process."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._lock = threading.RLock()
+        self._depth = 0
+        self._fd: Optional[int] = None
+
+    @contextmanager
+    def held(self) -> Iterator[None]:
+        with self._lock:
+            if self._depth == 0 and fcntl is not None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+                fcntl.flock(self._fd, fcntl.LOCK_EX)
+            self._depth += 1
+            try:
+                yield
+            finally:
+                self._depth -= 1
+                if self._depth == 0 and self._fd is not None:
+                    fcntl.flock(self._fd, fcntl.LOCK_UN)
+                    os.close(self._fd)
+                    self._fd = None
+
+
+class WriteQueue:
+    """Group-commit queue: `commit(items)` returns one result per item, in order."""
+
+    def __init__(self, commit: Callable[[list[Any]], list[Any]], name: str = "memory-writer"):
+        self._commit = commit
+        self._name = name
+        self._items: list[tuple[Any, Future]] = []
+        self._cond = threading.Condition()
+        self._busy = False
+        self._thread: Optional[threading.Thread] = None
+        self.commits = 0
+        self.committed = 0
+
+    def submit(self, items: list[Any]) -> list[Future]:
+        futures = [Future() for _ in items]
+        with self._cond:
+            self._items.extend(zip(items, futures))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=self._name, daemon=True)
+                self._thread.start()
+                atexit.register(self.flush)
+            self._cond.notify_all()
+        return futures
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._items)
+                batch, self._items = self._items[:MAX_BATCH], self._items[MAX_BATCH:]
+                self._busy = True
+            try:
+                results = self._commit([item for item, _ in batch])
+            except BaseException as e:
+                for _, future in batch:
+                    future.set_exception(e)
+            else:
+                for (_, future), result in zip(batch, results):
+                    future.set_result(result)
+            with self._cond:
+                self._busy = False
+                self.commits += 1
+                self.committed += len(batch)
+                self._cond.notify_all()
+
+    def pending(self) -> bool:
+        with self._cond:
+            return bool(self._items) or self._busy
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until everything submitted so far is committed; False on timeout."""
+        with self._cond:
+            if threading.current_thread() is self._thread:
+                return True
+            return self._cond.wait_for(lambda: not self._items and not self._busy, timeout)
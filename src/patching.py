@@ -0,0 +1,292 @@
+"""
+Patch-mode fixes for the generated implementation.
+implementation.md is Markdown in which each file is a fenced code block
+labelled with its path: a heading, a backticked path such as `src/app.py` or a
+`FILE: <path>` line just above the fence, or the fence's info string. A name
+only counts as a path if it has a directory part or a known file extension,
+so prose like "e.g." or "Python 3.11" never names a block. In patch mode
+the Fixer outputs only what changed, as either
+
+  * a fenced ```diff block with `--- a/<path>` / `+++ b/<path>` headers and
+    unified-diff hunks, or
+  * `FILE: <path>` followed by a fenced block with the file's complete new content.
+
+apply_fix() validates every hunk against the stored implementation and
+returns the full updated document; patch_guardrail() plugs this into the fix
+task, asking for a complete rewrite when a patch does not apply.
+"""
+import os
+import re
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+
+FIX_MODES = ("patch", "rewrite")
+
+PATCH_INSTRUCTIONS = (
+    "Output ONLY the changes, not the whole implementation. For each file you change, either give "
+    "a ```diff block containing a unified diff with '--- a/<path>' and '+++ b/<path>' headers and "
+    "'@@' hunks with 2-3 unchanged context lines, or write 'FILE: <path>' followed by a fenced code "
+    "block with the complete new content of that file (also use this for new files). Use the file "
+    "paths exactly as they appear in the implementation. Do not repeat unchanged files."
+)
+
+_FENCE_RE = re.compile(r"^(\s*)(`{3,}|~{3,})(.*)$")
+_HEADING_RE = re.compile(r"^\s*#{1,6}\s+(.*)$")
+_BACKTICK_RE = re.compile(r"`([^`\s]+)`")
+_NAME_RE = re.compile(r"[\w.\-]+(?:/[\w.\-]+)*/?")
+# Extensions of files a generated project may contain; other names need a directory part.
+_EXTENSIONS = frozenset(
+    "py pyi ipynb js jsx mjs cjs ts tsx vue svelte json yaml yml toml ini cfg conf env example md rst txt "
+    "html htm css scss sass less sql sh bash zsh ps1 bat go rs java kt kts scala c h cc cpp hpp cs rb php "
+    "swift dart lua r xml csv tsv proto graphql gql tf hcl lock gitignore dockerignore editorconfig".split()
+)
+_BARE_NAMES = frozenset({"Dockerfile", "Makefile", "Procfile", "Gemfile", "Rakefile", "Jenkinsfile", "LICENSE"})
+_FILE_MARKER_RE = re.compile(r"^\s*(?:\*\*)?FILE:\s*`?([^`*\s]+)`?(?:\*\*)?\s*$", re.IGNORECASE)
+_HUNK_RE = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@")
+
+
+class PatchError(ValueError):
+    """A patch that does not apply cleanly to the stored implementation."""
+
+
+def fix_mode_from_env() -> str:
+    mode = os.getenv("FIX_MODE", "patch").strip().lower()
+    return mode if mode in FIX_MODES else "patch"
+
+
+@dataclass
+class FileBlock:
+    path: Optional[str]
+    start: int  # index of the opening fence line
+    end: int  # index of the closing fence line
+    lines: list[str] = field(default_factory=list)
+
+
+def _is_path(name: str) -> bool:
+    """Whether `name` looks like a file path: a directory part or a known extension."""
+    base = name.rstrip("/").rsplit("/", 1)[-1]
+    if base in _BARE_NAMES:
+        return True
+    if "/" in name:
+        return any(c.isalpha() for c in base)
+    stem, dot, ext = base.rpartition(".")
+    return bool(dot) and ext.lower() in _EXTENSIONS and (not stem or any(c.isalpha() for c in stem))
+
+
+def _first_path(text: str) -> Optional[str]:
+    return next((m.group(0) for m in _NAME_RE.finditer(text) if _is_path(m.group(0))), None)
+
+
+def _path_in(line: str) -> Optional[str]:
+    """The path named by a label line: a FILE: marker, a heading or a backticked path."""
+    marker = _FILE_MARKER_RE.match(line)
+    if marker:
+        return marker.group(1)
+    heading = _HEADING_RE.match(line)
+    if heading:
+        return _first_path(heading.group(1).replace("`", " "))
+    return next((m.group(1) for m in _BACKTICK_RE.finditer(line) if _is_path(m.group(1))), None)
+
+
+def parse_blocks(markdown: str) -> list[FileBlock]:
+    """Fenced code blocks of a Markdown document, with the file path that labels each."""
+    lines = markdown.splitlines()
+    blocks: list[FileBlock] = []
+    i = 0
+    while i < len(lines):
+        opening = _FENCE_RE.match(lines[i])
+        if not opening:
+            i += 1
+            continue
+        fence = opening.group(2)
+        info = opening.group(3).strip()
+        j = i + 1
+        while j < len(lines) and not lines[j].strip().startswith(fence):
+            j += 1
+        path = _first_path(info) if info else None  # e.g. ```python src/app.py
+        for k in range(i - 1, max(i - 4, -1), -1):  # label within the three lines above
+            if path or not lines[k].strip():
+                continue
+            path = _path_in(lines[k])
+            break
+        blocks.append(FileBlock(path, i, min(j, len(lines) - 1), lines[i + 1:j]))
+        i = j + 1
+    return blocks
+
+
+def _norm(path: Optional[str]) -> str:
+    path = (path or "").strip().strip("`")
+    for prefix in ("a/", "b/", "./"):
+        if path.startswith(prefix):
+            path = path[len(prefix):]
+    return path
+
+
+def _find_block(blocks: list[FileBlock], path: str) -> Optional[FileBlock]:
+    path = _norm(path)
+    exact = [b for b in blocks if _norm(b.path) == path]
+    if exact:
+        return exact[0]
+    suffix = [b for b in blocks if b.path and (_norm(b.path).endswith("/" + path) or path.endswith("/" + _norm(b.path)))]
+    return suffix[0] if len(suffix) == 1 else None
+
+
+def _apply_hunks(original: list[str], hunks: list[list[str]], path: str) -> list[str]:
+    """Apply unified-diff hunks, locating each by its context (line numbers are hints only)."""
+    result = list(original)
+    offset = 0
+    for hunk in hunks:
+        header = _HUNK_RE.match(hunk[0])
+        if not header:
+            raise PatchError(f"{path}: malformed hunk header {hunk[0]!r}")
+        old = [l[1:] for l in hunk[1:] if l[:1] in (" ", "-") or l == ""]
+        new = [l[1:] for l in hunk[1:] if l[:1] in (" ", "+") or l == ""]
+        hint = max(int(header.group(1)) - 1 + offset, 0)
+        at = _locate(result, old, hint)
+        if at is None:
+            raise PatchError(f"{path}: hunk {hunk[0].strip()} does not match the implementation")
+        result[at:at + len(old)] = new
+        offset += len(new) - len(old)
+    return result
+
+
+def _locate(lines: list[str], needle: list[str], hint: int) -> Optional[int]:
+    if not needle:
+        return min(hint, len(lines))
+    stripped = [l.rstrip() for l in needle]
+    candidates = sorted(range(len(lines) - len(needle) + 1), key=lambda i: abs(i - hint))
+    for i in candidates:
+        if [l.rstrip() for l in lines[i:i + len(needle)]] == stripped:
+            return i
+    return None
+
+
+def _is_file_header(lines: list[str], i: int) -> bool:
+    """A `--- a/x` / `+++ b/x` pair followed by a hunk, i.e. certainly the next file."""
+    return (
+        lines[i].startswith("--- ") and i + 2 < len(lines)
+        and lines[i + 1].startswith("+++ ") and lines[i + 2].startswith("@@")
+    )
+
+
+def _parse_diff(text: str) -> dict[str, list[list[str]]]:
+    """Hunks per target path from unified-diff text."""
+    patches: dict[str, list[list[str]]] = {}
+    path = None
+    old_left = new_left = 0  # lines the open hunk's header still promises
+    lines = text.splitlines()
+    for i, line in enumerate(lines):
+        if (old_left > 0 or new_left > 0) and not _is_file_header(lines, i):
+            # Inside a hunk "--- x" is a removed "-- x" line, not a header.
+            patches[path][-1].append(line)
+            if line.startswith("-"):
+                old_left -= 1
+            elif line.startswith("+"):
+                new_left -= 1
+            elif not line.startswith("\\"):  # "\ No newline at end of file" counts for neither
+                old_left, new_left = old_left - 1, new_left - 1
+            continue
+        old_left = new_left = 0
+        header = _HUNK_RE.match(line)
+        if line.startswith("--- "):
+            continue
+        if line.startswith("+++ "):
+            path = _norm(line[4:].split("\t")[0].strip())
+            patches.setdefault(path, [])
+        elif header and path is not None:
+            patches[path].append([line])
+            old_left, new_left = int(header.group(2) or 1), int(header.group(4) or 1)
+        elif path is not None and patches[path]:
+            patches[path][-1].append(line)  # past the promised length: header counts are hints
+    for hunks in patches.values():  # trailing blank lines belong to no hunk
+        for hunk in hunks:
+            while len(hunk) > 1 and hunk[-1] == "":
+                hunk.pop()
+    return patches
+
+
+def is_patch(text: str) -> bool:
+    return any(
+        (b.lines and b.lines[0].startswith(("--- ", "diff ", "+++ ")))
+        or any(_FILE_MARKER_RE.match(text.splitlines()[k]) for k in range(max(b.start - 3, 0), b.start))
+        for b in parse_blocks(text)
+    )
+
+
+@dataclass
+class FixResult:
+    text: str
+    mode: str  # "patch" or "rewrite"
+    files: list[str] = field(default_factory=list)
+
+
+def apply_fix(implementation: str, fix_output: str) -> FixResult:
+    """Apply a patch-mode fix to `implementation`; output without patches is a full rewrite."""
+    if not is_patch(fix_output):
+        return FixResult(fix_output, "rewrite")
+    doc = implementation.splitlines()
+    changed: list[str] = []
+    out_lines = fix_output.splitlines()
+    for block in parse_blocks(fix_output):
+        body = block.lines
+        if body and body[0].startswith(("--- ", "diff ", "+++ ")):
+            for path, hunks in _parse_diff("\n".join(body)).items():
+                target = _find_block(parse_blocks("\n".join(doc)), path)
+                if target is None:
+                    if _norm(path) in ("implementation.md", "output/implementation.md"):
+                        doc = _apply_hunks(doc, hunks, path)
+                        changed.append(path)
+                        continue
+                    raise PatchError(f"{path}: no such file in the implementation")
+                new_body = _apply_hunks(target.lines, hunks, path)
+                doc[target.start + 1:target.end] = new_body
+                changed.append(path)
+            continue
+        marker = next(
+            (_FILE_MARKER_RE.match(out_lines[k]) for k in range(block.start - 1, max(block.start - 4, -1), -1)
+             if _FILE_MARKER_RE.match(out_lines[k])),
+            None,
+        )
+        if marker is None:
+            continue  # illustrative snippet, not a file change
+        path = _norm(marker.group(1))
+        fence = out_lines[block.start].strip()
+        target = _find_block(parse_blocks("\n".join(doc)), path)
+        if target is None:
+            doc += ["", f"### `{path}`", "", fence, *body, "```"]
+        else:
+            doc[target.start + 1:target.end] = body
+        changed.append(path)
+    if not changed:
+        raise PatchError("the fix contains no applicable changes")
+    return FixResult("\n".join(doc) + "\n", "patch", changed)
+
+
+def patch_guardrail(base_task: Any) -> Callable[[Any], tuple[bool, Any]]:
+    """Fix-task guardrail that turns a patch into the full updated implementation.
+
+    `base_task` is the task whose output holds the implementation being fixed.
+    A patch that does not apply is rejected with a request for a full rewrite,
+    which the agent gets as feedback on its retry.
+    """
+
+    def note(output: Any, **details: Any) -> None:
+        budget = getattr(base_task, "budget", None)
+        if budget is not None and output.name:
+            budget.note(output.name, fix=details)
+
+    def apply_patch_guardrail(output: Any) -> tuple[bool, Any]:
+        base = base_task.output.raw if base_task.output is not None else ""
+        raw = output.raw or ""
+        try:
+            result = apply_fix(base, raw) if base else FixResult(raw, "rewrite")
+        except PatchError as e:
+            note(output, mode="rejected", error=str(e), output_chars=len(raw))
+            return False, (
+                f"The patch could not be applied: {e}. Output the complete corrected "
+                "implementation instead of a patch."
+            )
+        note(output, mode=result.mode, files=result.files, output_chars=len(raw), result_chars=len(result.text))
+        return True, result.text
+
+    return apply_patch_guardrail
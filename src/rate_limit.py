@@ -0,0 +1,76 @@
+"""
+Process-wide limits for calls to the LLM endpoint.
+Caps in-flight requests (LLM_MAX_CONCURRENCY) and request rate
+(LLM_RPM, requests per minute, token bucket) across every agent and every
+crew running in the process, e.g. under src.batch. 0 means unlimited.
+"""
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+
+class LLMLimiter:
+    """Concurrency cap plus a token-bucket request rate shared by all LLM calls."""
+
+    def __init__(self, max_concurrency: int = 0, rpm: float = 0):
+        self.max_concurrency = max_concurrency
+        self.rpm = rpm
+        self._slots = threading.BoundedSemaphore(max_concurrency) if max_concurrency > 0 else None
+        self._lock = threading.Lock()
+        self._tokens = 1.0
+        self._updated = time.monotonic()
+        self.waited = 0.0  # total seconds callers spent blocked on the limits
+
+    def _take_token(self) -> None:
+        if self.rpm <= 0:
+            return
+        rate = self.rpm / 60.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(1.0, self._tokens + (now - self._updated) * rate)
+                self._updated = now
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return
+                delay = (1.0 - self._tokens) / rate
+            time.sleep(delay)
+
+    @contextmanager
+    def slot(self) -> Iterator[None]:
+        """Hold one request slot for the duration of an LLM call."""
+        start = time.monotonic()
+        if self._slots:
+            self._slots.acquire()
+        try:
+            self._take_token()
+            with self._lock:
+                self.waited += time.monotonic() - start
+            yield
+        finally:
+            if self._slots:
+                self._slots.release()
+
+
+_limiter: Optional[LLMLimiter] = None
+_limiter_lock = threading.Lock()
+
+
+def configure(max_concurrency: Optional[int] = None, rpm: Optional[float] = None) -> LLMLimiter:
+    """Replace the process limiter; unspecified limits come from the environment."""
+    global _limiter
+    with _limiter_lock:
+        _limiter = LLMLimiter(
+            max_concurrency if max_concurrency is not None else int(os.getenv("LLM_MAX_CONCURRENCY", 0)),
+            rpm if rpm is not None else float(os.getenv("LLM_RPM", 0)),
+        )
+        return _limiter
+
+
+def get_limiter() -> LLMLimiter:
+    with _limiter_lock:
+        if _limiter is not None:
+            return _limiter
+    return configure()
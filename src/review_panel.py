@@ -0,0 +1,155 @@
+"""
+Parallel specialist reviews.
+In "parallel" review mode (REVIEW_MODE, default "single") each review stage
+is still one task, but its agent is a panel (src.agents.reviewer) that runs
+one focused pass per specialist concurrently on the same implementation and
+context: correctness, performance and security. Each pass ends with its own
+VERDICT line. merge_reviews() then combines the passes locally, without
+another LLM call, into the usual review_report.md shape: one section per
+pass in a fixed order, bullet points already reported by an earlier pass
+dropped, headings nested one level down, and a final VERDICT line with the
+summed severity counts. A dropped finding whose severity can be read (a
+leading "[high]"/"High:" label, "severity: high", or a severity heading above
+it) is taken off its pass's count, so a finding reported by two passes is
+counted once. The stage
+takes as long as its slowest pass, and each prompt covers a third of the
+checklist.
+"""
+import json
+import os
+import re
+from dataclasses import dataclass
+
+from src.review_loop import SEVERITIES, parse_verdict
+
+REVIEW_MODES = ("single", "parallel")
+
+
+@dataclass(frozen=True)
+class Specialist:
+    key: str
+    title: str
+    checklist: str
+
+
+SPECIALISTS = (
+    Specialist(
+        "correctness",
+        "Correctness",
+        "bugs, logic errors, unhandled edge cases and error paths, broken or missing imports, "
+        "type mismatches, and code that does not follow the architecture",
+    ),
+    Specialist(
+        "performance",
+        "Performance",
+        "algorithmic complexity, redundant work, blocking I/O, N+1 queries, missing indexes, "
+        "connection pooling, caching and memory use",
+    ),
+    Specialist(
+        "security",
+        "Security",
+        "input validation, injection (SQL, shell, path), secrets in code, authentication and "
+        "authorization, unsafe deserialization and insecure defaults",
+    ),
+)
+
+_VERDICT_RE = re.compile(r"\**VERDICT:\**\s*\{[^{}]*\}\**", re.IGNORECASE)
+_BULLET_RE = re.compile(r"^\s*(?:[-*]|\d+\.)\s+(.*)$")
+_HEADING_RE = re.compile(r"^#{1,5}\s")
+_LABEL_RE = re.compile(r"^\W*(?:critical|high|medium|low)\b\W*", re.IGNORECASE)
+_SEVERITY_RE = re.compile(
+    r"^\W*(critical|high|medium|low)\b|\bseverity\W{0,3}(critical|high|medium|low)\b", re.IGNORECASE
+)
+
+
+def review_mode_from_env() -> str:
+    mode = os.getenv("REVIEW_MODE", "single").strip().lower()
+    return mode if mode in REVIEW_MODES else "single"
+
+
+def specialist_description(specialist: Specialist, stage_description: str) -> str:
+    """The prompt of one pass: its checklist, then the stage's own instructions."""
+    return (
+        f"{specialist.title} pass. Check only for {specialist.checklist}; other reviewers cover the "
+        f"remaining concerns, so do not report them. {stage_description}"
+    )
+
+
+def specialist_expected_output(specialist: Specialist) -> str:
+    return (
+        f"{specialist.title} review: each issue with its severity, location and a concrete fix, "
+        "ending with the VERDICT severity line."
+    )
+
+
+def _normalize(line: str) -> str:
+    """Comparison key of a finding: no markup, case or leading severity label."""
+    return " ".join(_LABEL_RE.sub("", re.sub(r"[*_`]", "", line).lower()).split())
+
+
+def _severity(text: str) -> str:
+    match = _SEVERITY_RE.search(re.sub(r"[*_`]", "", text))
+    return (match.group(1) or match.group(2)).lower() if match else ""
+
+
+def _dedupe(text: str, seen: set[str]) -> tuple[list[str], dict[str, int]]:
+    """The report's lines without bullets in `seen`, and the dropped findings per severity."""
+    body: list[str] = []
+    dropped = dict.fromkeys(SEVERITIES, 0)
+    heading = ""
+    for line in _VERDICT_RE.sub("", text or "").strip().splitlines():
+        if _HEADING_RE.match(line):
+            heading = _severity(line.lstrip("#"))
+            body.append("#" + line)  # nest under the pass's section
+            continue
+        bullet = _BULLET_RE.match(line)
+        if bullet:
+            key = _normalize(bullet.group(1))
+            if key in seen:
+                # Nested bullets are details of a finding; only top-level ones inherit the heading.
+                severity = _severity(bullet.group(1)) or (heading if line[:1] not in " \t" else "")
+                if severity:
+                    dropped[severity] += 1
+                continue  # already reported by an earlier pass
+            seen.add(key)
+        body.append(line)
+    return body, dropped
+
+
+def merge_reviews(reports: list[tuple[Specialist, str]]) -> str:
+    """Combine specialist reports (in SPECIALISTS order) into one review report."""
+    seen: set[str] = set()
+    bodies = [_dedupe(text, seen) for _, text in reports]
+    verdicts = []
+    for (s, text), (_, dropped) in zip(reports, bodies):
+        v = parse_verdict(text)
+        for sev in SEVERITIES:
+            setattr(v, sev, max(getattr(v, sev) - dropped[sev], 0))
+        verdicts.append((s, v))
+    totals = {sev: sum(getattr(v, sev) for _, v in verdicts) for sev in SEVERITIES}
+    duplicates = sum(sum(dropped.values()) for _, dropped in bodies)
+    lines = [
+        "# Code Review Report",
+        "",
+        f"Merged from {len(reports)} specialist passes: {', '.join(s.key for s, _ in reports)}.",
+        "",
+        "| pass | " + " | ".join(SEVERITIES) + " |",
+        "|---|" + "---|" * len(SEVERITIES),
+    ]
+    for s, v in verdicts:
+        counts = [str(getattr(v, sev)) if v.source != "unknown" else "?" for sev in SEVERITIES]
+        lines.append(f"| {s.key} | " + " | ".join(counts) + " |")
+    lines.append("| **total** | " + " | ".join(str(totals[sev]) for sev in SEVERITIES) + " |")
+    if duplicates:
+        lines += ["", f"Counts exclude {duplicates} finding(s) already reported by an earlier pass."]
+
+    for (s, _), (body, _) in zip(reports, bodies):
+        lines += ["", f"## {s.title}", "", "\n".join(body).strip() or "No issues reported."]
+
+    unreadable = [s.key for s, v in verdicts if v.source == "unknown"]
+    if unreadable:
+        # The loop treats an unreadable review as blocking; keep that for the merged report.
+        lines += ["", f"Passes without severity counts: {', '.join(unreadable)}."]
+    verdict = dict(totals, **({"unreadable": len(unreadable)} if unreadable else {}))
+    lines += ["", f"VERDICT: {json.dumps(verdict)}"]
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,128 @@
+"""
+DAG scheduling for crew tasks.
+The dependency graph is derived from each task's `context=[...]`; a
+ConditionalTask additionally depends on the task before it, whose output its
+condition reads. schedule() orders tasks by dependency level and marks tasks
+that can run side by side as async, so crewai's sequential process starts
+them together and waits for them at the next synchronous task.
+
+timing_report() compares the measured wall time of a run with the
+sequential time (sum of task durations) and the critical path (longest
+dependency chain), i.e. the best any scheduler could do.
+"""
+from typing import Optional
+
+from crewai import Task
+from crewai.tasks.conditional_task import ConditionalTask
+
+
+def dependency_graph(tasks: list[Task]) -> dict[int, set[int]]:
+    """
+    Map each task index to the indexes of the tasks it depends on.
+    Raises ValueError if a task depends on itself or on a later task (which
+    includes every cycle): context must point back to tasks listed earlier.
+    """
+    index = {id(t): i for i, t in enumerate(tasks)}
+    graph: dict[int, set[int]] = {}
+    for i, task in enumerate(tasks):
+        context = task.context if isinstance(task.context, list) else []
+        deps = {index[id(c)] for c in context if id(c) in index}
+        if isinstance(task, ConditionalTask) and i > 0:
+            deps.add(i - 1)
+        if any(d >= i for d in deps):
+            later = min(d for d in deps if d >= i)
+            raise ValueError(
+                f"Task '{task.name or i + 1}' depends on '{tasks[later].name or later + 1}', "
+                "which does not run before it; task context must not form a cycle."
+            )
+        graph[i] = deps
+    return graph
+
+
+def _levels(tasks: list[Task], graph: dict[int, set[int]]) -> list[list[int]]:
+    """Group task indexes by dependency depth; one agent runs one task at a time."""
+    depth: dict[int, int] = {}
+    for i in range(len(tasks)):  # context tasks always precede their dependents
+        depth[i] = max((depth[d] + 1 for d in graph[i]), default=0)
+    levels: list[list[int]] = []
+    for level in range(max(depth.values(), default=-1) + 1):
+        pending = [i for i in depth if depth[i] == level]
+        while pending:
+            group, agents, rest = [], set(), []
+            for i in pending:
+                agent = getattr(tasks[i], "agent_key", None) or id(tasks[i].agent)
+                # A conditional task reads the output appended just before it, so it runs alone.
+                if isinstance(tasks[i], ConditionalTask):
+                    if not group:
+                        group = [i]
+                        break
+                    rest.append(i)
+                elif agent in agents:
+                    rest.append(i)
+                else:
+                    group.append(i)
+                    agents.add(agent)
+            rest += [i for i in pending if i not in group and i not in rest]
+            levels.append(group)
+            pending = rest
+    return levels
+
+
+def schedule(tasks: list[Task]) -> list[Task]:
+    """Reorder `tasks` by dependency level and set async_execution for concurrent groups."""
+    graph = dependency_graph(tasks)
+    feeds_condition = {i - 1 for i, t in enumerate(tasks) if isinstance(t, ConditionalTask)}
+    # The predecessor of a conditional task must be the last output of its group.
+    levels = [sorted(g, key=lambda i: (i in feeds_condition, i)) for g in _levels(tasks, graph)]
+    order = [i for group in levels for i in group]
+    for pos, i in enumerate(order):
+        if isinstance(tasks[i], ConditionalTask) and (pos == 0 or order[pos - 1] != i - 1):
+            return _sequential(tasks)  # cannot honour the condition's input; keep the given order
+
+    after_async = False
+    for n, group in enumerate(levels):
+        if len(group) == 1:
+            tasks[group[0]].async_execution = False
+            after_async = False
+            continue
+        for i in group:
+            tasks[i].async_execution = True
+        # A synchronous task waits for every pending async task: it is the barrier between groups.
+        if after_async:
+            tasks[group[0]].async_execution = False
+        if n == len(levels) - 1:
+            tasks[group[-1]].async_execution = False  # a crew may end with at most one async task
+        after_async = tasks[group[-1]].async_execution
+    return [tasks[i] for i in order]
+
+
+def _sequential(tasks: list[Task]) -> list[Task]:
+    for task in tasks:
+        task.async_execution = False
+    return list(tasks)
+
+
+def timing_report(tasks: list[Task], wall_time: Optional[float] = None) -> dict:
+    """Sequential vs critical-path time (seconds) of a finished run; skipped tasks count as 0."""
+    graph = dependency_graph(tasks)
+    durations = [t.execution_duration or 0.0 for t in tasks]
+    finish: dict[int, float] = {}
+    parent: dict[int, Optional[int]] = {}
+    for i in range(len(tasks)):
+        best = max(graph[i], key=lambda d: finish[d], default=None)
+        parent[i] = best
+        finish[i] = (finish[best] if best is not None else 0.0) + durations[i]
+    path: list[int] = []
+    node = max(finish, key=finish.get, default=None)
+    while node is not None:
+        path.append(node)
+        node = parent[node]
+    report = {
+        "sequential": round(sum(durations), 2),
+        "critical_path": round(max(finish.values(), default=0.0), 2),
+        "critical_tasks": [tasks[i].name or f"task {i + 1}" for i in reversed(path)],
+        "async_tasks": sum(1 for t in tasks if t.async_execution),
+    }
+    if wall_time is not None:
+        report["wall"] = round(wall_time, 2)
+    return report
@@ -0,0 +1,336 @@
+"""
+Elite AI Software Development Team - Server Entry Point.
+A long-running process that accepts development requests over HTTP (or a Unix
+socket) and runs them on a bounded worker pool. crewai is imported, and each
+worker's agents are built once at startup. LLM clients and their connection
+pools, the memory index and the tool cache stay warm between requests, so a
+request costs little more than its LLM time.
+
+    python -m src.server --port 8080 --workers 2
+    python -m src.server --socket /tmp/crew.sock
+
+    POST /runs              {"topic": "...", "id": "optional", "max_fix_cycles": 1}  -> 202 run status
+    GET  /runs              all runs
+    GET  /runs/<id>         one run's status
+    GET  /runs/<id>/events  status changes and finished tasks as JSON lines, until the run ends
+    GET  /runs/<id>/result  final output (409 until the run is done)
+    GET  /health            workers, queued and running counts
+
+Each run has a run directory under output/runs/<id>/ (checkpoint, artifacts,
+result.md). A failed run can be continued with `python -m src.main --resume <id>`.
+"""
+import argparse
+import json
+import os
+import queue
+import socketserver
+import sys
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Optional
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+from crewai.tasks.task_output import TaskOutput
+from dotenv import load_dotenv
+
+from src.batch import RunStatus, _slug
+from src.checkpoint import RUNS_DIR, RunCheckpoint, new_run_id
+from src.context_budget import ContextBudget
+from src.crew import AgentRegistry, create_elite_dev_crew
+from src.memory_store import get_store
+from src.rate_limit import configure as configure_llm_limits
+from src.review_loop import ReviewLoop, max_fix_cycles_from_env
+from src.review_panel import review_mode_from_env
+from src.tool_cache import ToolCache
+
+load_dotenv(ROOT / ".env")
+
+_FINISHED = ("done", "failed")
+
+
+class ServerRun:
+    """A submitted run: its status plus the event log streamed to /events."""
+
+    def __init__(self, status: RunStatus):
+        self.status = status
+        self.events: list[dict] = []
+        self.changed = threading.Condition()
+
+    def emit(self, event: dict) -> None:
+        with self.changed:
+            self.events.append({**event, "ts": round(time.time(), 3)})
+            self.changed.notify_all()
+
+    def events_after(self, seen: int, timeout: float = 15.0) -> tuple[list[dict], bool]:
+        """Events from index `seen` on, waiting up to `timeout` for one; and whether the run ended."""
+        with self.changed:
+            self.changed.wait_for(lambda: len(self.events) > seen or self.finished, timeout)
+            return self.events[seen:], self.finished
+
+    @property
+    def finished(self) -> bool:
+        return self.status.status in _FINISHED
+
+
+class CrewService:
+    """Runs topics on `workers` threads, each with its own warm AgentRegistry.
+
+    Runs never share agent instances: each crew gets copies of its worker's warm
+    agents (AgentRegistry.fork), which keep the LLM clients and tools but start with
+    no crew, callbacks or executor from an earlier run.
+    """
+
+    def __init__(self, workers: int = 2, max_queued: int = 100, max_fix_cycles: Optional[int] = None):
+        self.workers = max(1, workers)
+        self.max_queued = max_queued
+        self.max_fix_cycles = max_fix_cycles if max_fix_cycles is not None else max_fix_cycles_from_env()
+        self.runs: dict[str, ServerRun] = {}
+        self.tool_cache = ToolCache()  # results stay valid across runs; entries are checked against mtimes
+        self._registries: "queue.Queue[AgentRegistry]" = queue.Queue()
+        for _ in range(self.workers):
+            self._registries.put(AgentRegistry())
+        self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="crew")
+        self._lock = threading.Lock()
+
+    def warm_up(self) -> float:
+        """Build every agent of every worker and load the memory index; returns seconds taken."""
+        started = time.perf_counter()
+        registries = [self._registries.get() for _ in range(self.workers)]
+        # Only one of the two review roles is used, depending on REVIEW_MODE.
+        unused = "reviewer" if review_mode_from_env() == "parallel" else "review_panel"
+        try:
+            for registry in registries:
+                for role in AgentRegistry.FACTORIES:
+                    if role != unused:
+                        registry.get(role)
+        finally:
+            for registry in registries:
+                self._registries.put(registry)
+        store = get_store()
+        if store.path.exists():
+            store.search_index()
+        return time.perf_counter() - started
+
+    def counts(self) -> dict[str, int]:
+        with self._lock:
+            states = [r.status.status for r in self.runs.values()]
+        return {s: states.count(s) for s in ("queued", "running", "done", "failed")}
+
+    def submit(self, topic: str, run_id: Optional[str] = None, max_fix_cycles: Optional[int] = None) -> ServerRun:
+        run_id = _slug(run_id, 80) if run_id else new_run_id(topic)
+        with self._lock:
+            if run_id in self.runs or (Path(RUNS_DIR) / run_id).exists():
+                raise FileExistsError(f"Run '{run_id}' already exists.")
+            queued = sum(r.status.status == "queued" for r in self.runs.values())
+            if queued >= self.max_queued:
+                raise OverflowError(f"Queue is full ({queued} runs waiting).")
+            run = self.runs[run_id] = ServerRun(RunStatus(run_id, topic, f"{RUNS_DIR}/{run_id}"))
+        cycles = self.max_fix_cycles if max_fix_cycles is None else max_fix_cycles
+        run.emit({"event": "status", **asdict(run.status)})
+        self._pool.submit(self._run, run, cycles)
+        return run
+
+    def _update(self, run: ServerRun, **changes: Any) -> None:
+        for key, value in changes.items():
+            setattr(run.status, key, value)
+        out = Path(run.status.output_dir)
+        out.mkdir(parents=True, exist_ok=True)
+        (out / "status.json").write_text(json.dumps(asdict(run.status), indent=2), encoding="utf-8")
+        run.emit({"event": "status", **{k: v for k, v in asdict(run.status).items() if v is not None}})
+
+    def _run(self, run: ServerRun, max_fix_cycles: int) -> None:
+        registry = self._registries.get()
+        started = time.time()
+        self._update(run, status="running", started=started)
+        checkpoint = RunCheckpoint.create(run.status.topic, run_id=run.status.run_id, max_fix_cycles=max_fix_cycles)
+
+        def on_task(output: TaskOutput) -> None:
+            run.emit({"event": "task", "task": output.name, "agent": output.agent, "chars": len(output.raw or "")})
+
+        try:
+            loop = ReviewLoop(max_cycles=max_fix_cycles)
+            crew = create_elite_dev_crew(
+                loop=loop, output_dir=run.status.output_dir, verbose=False, checkpoint=checkpoint,
+                budget=ContextBudget(), agents=registry.fork(), on_task=on_task,
+            )
+            result = crew.kickoff(inputs={"topic": run.status.topic})
+            (checkpoint.dir / "result.md").write_text(str(result), encoding="utf-8")
+            checkpoint.update(status="done")
+            finished = time.time()
+            self._update(
+                run, status="done", finished=finished, elapsed=round(finished - started, 2),
+                fix_cycles=loop.cycles_run,
+            )
+        except Exception as e:
+            finished = time.time()
+            checkpoint.update(status="failed", error=f"{type(e).__name__}: {e}")
+            (checkpoint.dir / "error.txt").write_text(traceback.format_exc(), encoding="utf-8")
+            self._update(
+                run, status="failed", finished=finished, elapsed=round(finished - started, 2),
+                error=f"{type(e).__name__}: {e}",
+            )
+        finally:
+            self._registries.put(registry)
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=True, cancel_futures=True)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    service: CrewService  # set on the handler subclass built by make_server
+
+    def log_message(self, *args) -> None:
+        pass
+
+    def address_string(self) -> str:  # Unix sockets have no client address
+        return self.client_address[0] if isinstance(self.client_address, tuple) else "unix"
+
+    def _json(self, status: int, payload: Any) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _find(self, run_id: str) -> Optional[ServerRun]:
+        run = self.service.runs.get(run_id)
+        if run is None:
+            self._json(404, {"error": f"no run '{run_id}'"})
+        return run
+
+    def do_GET(self) -> None:
+        parts = [p for p in self.path.split("?", 1)[0].split("/") if p]
+        if parts == ["health"]:
+            self._json(200, {"status": "ok", "workers": self.service.workers, **self.service.counts()})
+        elif parts == ["runs"]:
+            self._json(200, [asdict(r.status) for r in list(self.service.runs.values())])
+        elif len(parts) == 2 and parts[0] == "runs":
+            run = self._find(parts[1])
+            if run:
+                self._json(200, asdict(run.status))
+        elif len(parts) == 3 and parts[0] == "runs" and parts[2] == "events":
+            run = self._find(parts[1])
+            if run:
+                self._stream(run)
+        elif len(parts) == 3 and parts[0] == "runs" and parts[2] == "result":
+            run = self._find(parts[1])
+            if run:
+                result = Path(run.status.output_dir) / "result.md"
+                if run.status.status != "done" or not result.exists():
+                    self._json(409, {"error": f"run is {run.status.status}", **asdict(run.status)})
+                else:
+                    self._json(200, {**asdict(run.status), "result": result.read_text(encoding="utf-8")})
+        else:
+            self._json(404, {"error": "not found"})
+
+    def _stream(self, run: ServerRun) -> None:
+        """JSON lines until the run finishes; the connection closes after the last event."""
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        seen = 0
+        while True:
+            events, finished = run.events_after(seen)
+            seen += len(events)
+            try:
+                for event in events:
+                    self.wfile.write((json.dumps(event) + "\n").encode("utf-8"))
+                self.wfile.flush()
+            except (BrokenPipeError, ConnectionResetError):
+                return  # client went away; the run carries on
+            if finished and not events:
+                return
+
+    def do_POST(self) -> None:
+        if self.path.rstrip("/") != "/runs":
+            self._json(404, {"error": "not found"})
+            return
+        try:
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        except ValueError:
+            self._json(400, {"error": "body must be JSON"})
+            return
+        topic = str(body.get("topic") or body.get("prompt") or "").strip() if isinstance(body, dict) else ""
+        if not topic:
+            self._json(400, {"error": "'topic' is required"})
+            return
+        cycles = body.get("max_fix_cycles")
+        if cycles is not None and (not isinstance(cycles, int) or isinstance(cycles, bool) or cycles < 0):
+            self._json(400, {"error": "'max_fix_cycles' must be a non-negative integer"})
+            return
+        try:
+            run = self.service.submit(topic, body.get("id"), cycles)
+        except FileExistsError as e:
+            self._json(409, {"error": str(e)})
+            return
+        except OverflowError as e:
+            self._json(429, {"error": str(e)})
+            return
+        self._json(202, asdict(run.status))
+
+
+class _UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def make_server(service: CrewService, port: int = 8080, host: str = "127.0.0.1", socket_path: Optional[str] = None):
+    """HTTP server for `service` on host:port, or on a Unix socket when `socket_path` is given."""
+    handler = type("CrewHandler", (_Handler,), {"service": service})
+    if socket_path:
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        return _UnixHTTPServer(socket_path, handler)
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve the Elite Dev Crew over HTTP with warm agents.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--socket", default=None, help="Listen on this Unix socket instead of host:port")
+    parser.add_argument("--workers", type=int, default=2, help="Crews running at once")
+    parser.add_argument("--max-queued", type=int, default=100, help="Waiting runs before POST /runs answers 429")
+    parser.add_argument("--llm-concurrency", type=int, default=None, help="Max in-flight LLM requests (all runs)")
+    parser.add_argument("--rpm", type=float, default=None, help="Max LLM requests per minute (all runs)")
+    parser.add_argument("--max-fix-cycles", type=int, default=None)
+    parser.add_argument("--no-warm-up", action="store_true", help="Build agents on first use instead of at startup")
+    args = parser.parse_args()
+
+    if not os.getenv("DEEPSEEK_API_KEY"):
+        print("Warning: DEEPSEEK_API_KEY not set. Set it in .env or environment.", file=sys.stderr)
+    configure_llm_limits(args.llm_concurrency, args.rpm)
+    os.environ.setdefault("LLM_STREAM", "0")  # nobody is watching a terminal
+    (ROOT / "output").mkdir(exist_ok=True)
+    (ROOT / "memory").mkdir(exist_ok=True)
+
+    service = CrewService(args.workers, args.max_queued, args.max_fix_cycles)
+    if not args.no_warm_up:
+        print(f"Warmed up {service.workers} worker(s) in {service.warm_up():.2f}s", file=sys.stderr)
+    server = make_server(service, args.port, args.host, args.socket)
+    where = args.socket or f"http://{args.host}:{server.server_address[1]}"
+    print(f"Crew server listening on {where}", file=sys.stderr)
+    with service.tool_cache.activated():
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            service.shutdown()
+            if args.socket and os.path.exists(args.socket):
+                os.unlink(args.socket)
+
+
+if __name__ == "__main__":
+    main()
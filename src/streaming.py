@@ -0,0 +1,109 @@
+"""
+Live output for a crew run.
+Listens to crewai's LLM stream-chunk events and echoes tokens to the terminal
+as they arrive, and appends them to `<output_file>.partial` next to each
+task's artifact so long code generation can be followed with `tail -f`.
+crewai writes the final artifact when the task completes; the partial file
+is removed then. The artifact itself is not overwritten mid-task because the
+Fixer reads the previous implementation.md while it works.
+"""
+import os
+import sys
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, Iterator, Optional, TextIO
+
+from crewai import Task
+from crewai.events import (
+    LLMStreamChunkEvent,
+    TaskCompletedEvent,
+    TaskFailedEvent,
+    crewai_event_bus,
+)
+
+PARTIAL_SUFFIX = ".partial"
+
+
+def stream_enabled() -> bool:
+    """LLM_STREAM=0 turns streaming off; it is on by default."""
+    return os.getenv("LLM_STREAM", "1").strip().lower() not in ("0", "false", "no", "off")
+
+
+class TokenStreamer:
+    """Routes streamed tokens of `tasks` to the terminal and to partial artifact files."""
+
+    def __init__(self, tasks: list[Task], echo: bool = True, out: TextIO = sys.stdout):
+        self.tasks = {str(t.id): t for t in tasks}
+        self.echo = echo
+        self.out = out
+        self.chunks = 0
+        self._lock = threading.Lock()
+        self._files: dict[str, IO[str]] = {}
+        self._current: Optional[str] = None  # task whose tokens were echoed last
+
+    def _partial_path(self, task: Task) -> Optional[Path]:
+        if not task.output_file:
+            return None
+        return Path(task.output_file.lstrip("/") + PARTIAL_SUFFIX)
+
+    def on_chunk(self, source, event: LLMStreamChunkEvent) -> None:
+        if not event.chunk or event.task_id not in self.tasks:
+            return
+        task = self.tasks[event.task_id]
+        with self._lock:
+            self.chunks += 1
+            if self.echo:
+                if self._current != event.task_id:  # concurrent tasks interleave; label each switch
+                    self.out.write(f"\n[{task.name or event.agent_role}] ")
+                    self._current = event.task_id
+                self.out.write(event.chunk)
+                self.out.flush()
+            path = self._partial_path(task)
+            if path is None:
+                return
+            handle = self._files.get(event.task_id)
+            if handle is None:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                handle = self._files[event.task_id] = path.open("w", encoding="utf-8")
+            handle.write(event.chunk)
+            handle.flush()
+
+    def on_task_end(self, source, event) -> None:
+        task_id = str(event.task.id) if event.task is not None else event.task_id
+        with self._lock:
+            handle = self._files.pop(task_id, None)
+            if handle is None:
+                return
+            handle.close()
+            # Completed: crewai has written the artifact. Failed: keep what was streamed.
+            if isinstance(event, TaskCompletedEvent):
+                Path(handle.name).unlink(missing_ok=True)
+            if self.echo and self._current == task_id:
+                self.out.write("\n")
+                self.out.flush()
+                self._current = None
+
+    def close(self) -> None:
+        with self._lock:
+            for handle in self._files.values():
+                handle.close()
+            self._files.clear()
+
+    @contextmanager
+    def attached(self) -> Iterator["TokenStreamer"]:
+        """Listen to the event bus for the duration of a kickoff."""
+        handlers = [
+            (LLMStreamChunkEvent, self.on_chunk),
+            (TaskCompletedEvent, self.on_task_end),
+            (TaskFailedEvent, self.on_task_end),
+        ]
+        for event_type, handler in handlers:
+            crewai_event_bus.register_handler(event_type, handler)
+        try:
+            yield self
+        finally:
+            crewai_event_bus.flush()  # task-end handlers run on the bus's worker threads
+            for event_type, handler in handlers:
+                crewai_event_bus.off(event_type, handler)
+            self.close()
@@ -0,0 +1,230 @@
+"""
+Run telemetry: where a crew run's time and tokens go.
+While attached, Telemetry records one JSON line per event to
+output/runs/<run_id>/telemetry.jsonl:
+
+  * task_start / task_end: wall time, and queue wait (time between the task's
+    dependencies finishing and the task starting),
+  * llm_call (reported by CrewLLM): model tier, latency, time blocked on the
+    endpoint limiter, prompt and completion tokens, response-cache hits,
+  * tool_call: tool name, latency, crewai tool-cache hits, errors,
+  * guardrail: each guardrail verdict; a failed one means the task is retried,
+  * run_end: the per-task, per-agent and per-tier summary plus the run's tool cache stats.
+
+Token counts use src.context_budget.count_tokens (tiktoken or ~4 chars/token).
+"""
+import json
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Iterator, Optional
+
+from crewai import Task
+from crewai.events import (
+    LLMCallFailedEvent,
+    LLMGuardrailCompletedEvent,
+    TaskCompletedEvent,
+    TaskFailedEvent,
+    TaskStartedEvent,
+    ToolUsageErrorEvent,
+    ToolUsageFinishedEvent,
+    crewai_event_bus,
+)
+
+from src.scheduler import dependency_graph
+
+TELEMETRY_FILE = "telemetry.jsonl"
+_TIER_COUNTERS = ("llm_calls", "llm_seconds", "prompt_tokens", "completion_tokens", "cache_hits")
+_COUNTERS = (
+    "llm_calls", "llm_seconds", "limiter_wait", "prompt_tokens", "completion_tokens",
+    "cache_hits", "tool_calls", "tool_seconds", "tool_errors", "retries", "llm_errors",
+)
+
+
+def _ts(value: Any) -> float:
+    return value.timestamp() if isinstance(value, datetime) else time.time()
+
+
+def _task_name(event: Any) -> Optional[str]:
+    task = getattr(event, "task", None) or getattr(event, "from_task", None)
+    return getattr(task, "name", None) or getattr(event, "task_name", None)
+
+
+class Telemetry:
+    """Collects per-task and per-LLM-call measurements for the tasks of one crew."""
+
+    def __init__(self, tasks: list[Task], path: Optional[Path] = None, tool_cache: Any = None):
+        self.path = Path(path) if path else None
+        self.tool_cache = tool_cache
+        self.started = time.time()
+        self._lock = threading.Lock()
+        self._file = None
+        graph = dependency_graph(tasks)
+        self._deps = {
+            t.name or f"task_{i}": [tasks[d].name or f"task_{d}" for d in graph[i]] for i, t in enumerate(tasks)
+        }
+        self._agents = {t.name: getattr(t.agent, "role", "") for t in tasks if t.name}
+        self.tasks: dict[str, dict] = {}
+        self.tiers: dict[str, dict] = {}
+
+    def _row(self, name: str) -> dict:
+        row = self.tasks.get(name)
+        if row is None:
+            row = self.tasks[name] = {
+                "task": name, "agent": self._agents.get(name, ""), "status": "pending",
+                "start": None, "end": None, "wall": 0.0, "queue_wait": 0.0,
+                **{c: 0 for c in _COUNTERS},
+            }
+        return row
+
+    def emit(self, kind: str, **fields: Any) -> None:
+        record = {"ts": round(time.time(), 4), "event": kind, **fields}
+        with self._lock:
+            if self._file is not None:
+                self._file.write(json.dumps(record, default=str) + "\n")
+                self._file.flush()
+
+    # -- recording ---------------------------------------------------------
+
+    def record_llm_call(
+        self, task: Optional[str], agent: Optional[str], latency: float, limiter_wait: float,
+        prompt_tokens: int, completion_tokens: int, cached: bool, tier: Optional[str] = None,
+    ) -> None:
+        """Called by CrewLLM after every call it serves (cache hits included)."""
+        name = task or "(no task)"
+        with self._lock:
+            stats = self.tiers.setdefault(tier or "(none)", {"tier": tier or "(none)", **{c: 0 for c in _TIER_COUNTERS}})
+            stats["llm_calls"] += 1
+            stats["llm_seconds"] += latency
+            stats["prompt_tokens"] += prompt_tokens
+            stats["completion_tokens"] += completion_tokens
+            stats["cache_hits"] += int(cached)
+            row = self._row(name)
+            if agent and not row["agent"]:
+                row["agent"] = agent
+            row["llm_calls"] += 1
+            row["llm_seconds"] += latency
+            row["limiter_wait"] += limiter_wait
+            row["prompt_tokens"] += prompt_tokens
+            row["completion_tokens"] += completion_tokens
+            row["cache_hits"] += int(cached)
+        self.emit(
+            "llm_call", task=name, agent=agent, tier=tier, latency=round(latency, 4), limiter_wait=round(limiter_wait, 4),
+            prompt_tokens=prompt_tokens, completion_tokens=completion_tokens, cached=cached,
+        )
+
+    def on_task_start(self, source, event: TaskStartedEvent) -> None:
+        name = _task_name(event) or "task"
+        start = _ts(event.timestamp)
+        with self._lock:
+            row = self._row(name)
+            ends = [self.tasks[d]["end"] for d in self._deps.get(name, []) if d in self.tasks]
+            ready = max([e for e in ends if e] or [self.started])
+            row.update(status="running", start=start, queue_wait=max(start - ready, 0.0))
+        self.emit("task_start", task=name, agent=row["agent"], queue_wait=round(row["queue_wait"], 4))
+
+    def on_task_end(self, source, event) -> None:
+        name = _task_name(event) or "task"
+        end = _ts(event.timestamp)
+        status = "done" if isinstance(event, TaskCompletedEvent) else "failed"
+        with self._lock:
+            row = self._row(name)
+            row.update(status=status, end=end, wall=end - (row["start"] or end))
+        self.emit("task_end", task=name, status=status, wall=round(row["wall"], 4),
+                  error=getattr(event, "error", None))
+
+    def on_tool(self, source, event) -> None:
+        name = _task_name(event) or "(no task)"
+        failed = isinstance(event, ToolUsageErrorEvent)
+        latency = 0.0
+        if not failed and event.started_at and event.finished_at:
+            latency = (event.finished_at - event.started_at).total_seconds()
+        with self._lock:
+            row = self._row(name)
+            row["tool_calls"] += 1
+            row["tool_seconds"] += latency
+            row["tool_errors"] += int(failed)
+        self.emit(
+            "tool_call", task=name, tool=event.tool_name, latency=round(latency, 4),
+            from_cache=bool(getattr(event, "from_cache", False)), error=str(event.error) if failed else None,
+        )
+
+    def on_guardrail(self, source, event: LLMGuardrailCompletedEvent) -> None:
+        name = _task_name(event) or "(no task)"
+        if not event.success:
+            with self._lock:
+                self._row(name)["retries"] += 1
+        self.emit("guardrail", task=name, success=event.success, retry_count=event.retry_count,
+                  error=event.error)
+
+    def on_llm_failed(self, source, event: LLMCallFailedEvent) -> None:
+        name = _task_name(event) or "(no task)"
+        with self._lock:
+            self._row(name)["llm_errors"] += 1
+        self.emit("llm_error", task=name, error=str(event.error))
+
+    # -- reporting ---------------------------------------------------------
+
+    def report(self) -> dict:
+        with self._lock:
+            tasks = [dict(r) for r in self.tasks.values()]
+            tiers = [dict(r) for r in self.tiers.values()]
+        agents: dict[str, dict] = {}
+        for row in tasks:
+            agent = agents.setdefault(row["agent"] or "(none)", {
+                "agent": row["agent"] or "(none)", "tasks": 0, "wall": 0.0, "queue_wait": 0.0,
+                **{c: 0 for c in _COUNTERS},
+            })
+            agent["tasks"] += 1
+            for key in ("wall", "queue_wait", *_COUNTERS):
+                agent[key] += row[key]
+        return {
+            "wall": time.time() - self.started,
+            "tasks": tasks,
+            "agents": sorted(agents.values(), key=lambda a: -a["wall"]),
+            "tiers": sorted(tiers, key=lambda t: t["tier"]),
+            "tool_cache": self.tool_cache.report() if self.tool_cache is not None else [],
+        }
+
+    @contextmanager
+    def attached(self) -> Iterator["Telemetry"]:
+        """Listen to the event bus and receive CrewLLM reports for the duration of a kickoff."""
+        global _active
+        handlers = [
+            (TaskStartedEvent, self.on_task_start),
+            (TaskCompletedEvent, self.on_task_end),
+            (TaskFailedEvent, self.on_task_end),
+            (ToolUsageFinishedEvent, self.on_tool),
+            (ToolUsageErrorEvent, self.on_tool),
+            (LLMGuardrailCompletedEvent, self.on_guardrail),
+            (LLMCallFailedEvent, self.on_llm_failed),
+        ]
+        if self.path is not None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = self.path.open("a", encoding="utf-8")
+        for event_type, handler in handlers:
+            crewai_event_bus.register_handler(event_type, handler)
+        previous, _active = _active, self
+        self.started = time.time()
+        self.emit("run_start", tasks=list(self._deps))
+        try:
+            yield self
+        finally:
+            _active = previous
+            crewai_event_bus.flush()  # handlers run on the bus's worker threads
+            for event_type, handler in handlers:
+                crewai_event_bus.off(event_type, handler)
+            self.emit("run_end", **self.report())
+            with self._lock:
+                if self._file is not None:
+                    self._file.close()
+                    self._file = None
+
+
+_active: Optional[Telemetry] = None
+
+
+def active() -> Optional[Telemetry]:
+    return _active
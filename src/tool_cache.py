@@ -0,0 +1,113 @@
+"""
+Run-scoped memoization for the read-only agent tools.
+Agents call read_file_tool, read_directory_tool and retrieve_decisions_tool
+with the same arguments many times per run. While a ToolCache is activated
+(src.main does this around kickoff), those tools return the stored result
+of an identical earlier call as long as its dependencies are unchanged:
+
+  * files by (mtime_ns, size), directory listings by the mtime of every
+    directory walked (src.file_index reports them),
+  * the memory log by its version (inode, size), which changes on every
+    store_decision_tool write, including writes by other processes.
+
+A cached memory retrieval still marks the records it returns as used in the
+access log (src.memory_retention), so retention sees every retrieval.
+Hits and misses are counted per tool and printed at the end of the run.
+"""
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Hashable, Iterator, Optional
+
+# A dependency is (kind, target, state at the time the result was computed);
+# kind is "path", "dir" or "memory".
+Dep = tuple[str, str, Any]
+
+
+def path_dep(path: Path) -> Dep:
+    return ("path", str(path), _state("path", str(path)))
+
+
+def memory_dep(store: Any) -> Dep:
+    return ("memory", str(store.path), store.version())
+
+
+def _state(kind: str, target: str) -> Any:
+    if kind == "path":
+        try:
+            st = os.stat(target)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+    if kind == "dir":
+        try:
+            return os.stat(target).st_mtime_ns
+        except OSError:
+            return None
+    if kind == "memory":
+        from src.memory_store import get_store
+
+        return get_store(Path(target)).version()
+    raise ValueError(f"unknown dependency kind: {kind}")
+
+
+class ToolCache:
+    """Results of tool calls, keyed by tool name and arguments, validated by their dependencies."""
+
+    def __init__(self):
+        self._entries: dict[tuple, tuple[str, list[Dep]]] = {}
+        self._stats: dict[str, dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def _count(self, tool: str, outcome: str) -> None:
+        with self._lock:
+            entry = self._stats.setdefault(tool, {"hits": 0, "misses": 0, "stale": 0})
+            entry[outcome] += 1
+
+    def call(self, tool: str, args: Hashable, compute: Callable[[], tuple[str, list[Dep]]]) -> str:
+        """Cached result of `tool(*args)`; `compute` returns the result and what it depends on."""
+        key = (tool, args)
+        with self._lock:
+            cached = self._entries.get(key)
+        if cached is not None:
+            result, deps = cached
+            if all(_state(kind, target) == state for kind, target, state in deps):
+                self._count(tool, "hits")
+                return result
+            self._count(tool, "stale")
+        else:
+            self._count(tool, "misses")
+        result, deps = compute()
+        with self._lock:
+            self._entries[key] = (result, deps)
+        return result
+
+    def report(self) -> list[dict]:
+        with self._lock:
+            rows = []
+            for tool, s in sorted(self._stats.items()):
+                calls = s["hits"] + s["misses"] + s["stale"]
+                rows.append({"tool": tool, "calls": calls, **s, "hit_rate": s["hits"] / calls if calls else 0.0})
+            return rows
+
+    @contextmanager
+    def activated(self) -> Iterator["ToolCache"]:
+        """Make this the cache the tools use for the duration of a run."""
+        global _active
+        previous, _active = _active, self
+        try:
+            yield self
+        finally:
+            _active = previous
+
+
+_active: Optional[ToolCache] = None
+
+
+def cached_call(tool: str, args: Hashable, compute: Callable[[], tuple[str, list[Dep]]]) -> str:
+    """Run a tool body through the active ToolCache, or directly when none is active."""
+    cache = _active
+    if cache is None:
+        return compute()[0]
+    return cache.call(tool, args, compute)
@@ -1,11 +1,21 @@
 """Custom tools for the Elite Dev Team."""
 
+from .artifact_tools import changed_files_tool, list_generated_files_tool
 from .docs_tools import read_file_tool, read_directory_tool
-from .memory_tools import store_decision_tool, retrieve_decisions_tool
+from .memory_tools import (
+    retrieve_decisions_bulk_tool,
+    retrieve_decisions_tool,
+    store_decision_tool,
+    store_decisions_bulk_tool,
+)
 
 __all__ = [
     "read_file_tool",
     "read_directory_tool",
     "store_decision_tool",
     "retrieve_decisions_tool",
+    "store_decisions_bulk_tool",
+    "retrieve_decisions_bulk_tool",
+    "changed_files_tool",
+    "list_generated_files_tool",
 ]
@@ -0,0 +1,66 @@
+"""
+Artifact tools for the Reviewer.
+Read the generated file tree (src.artifacts) instead of re-parsing the whole
+implementation.md: list it, or fetch only the files the last fix changed.
+"""
+from pathlib import Path
+
+from crewai.tools import tool
+
+from src.artifacts import FILES_DIR, load_manifest
+
+
+def _output_root(output_dir: str):
+    """The run's output directory, relative to the working directory like the crew writes it."""
+    root = Path.cwd().resolve()
+    path = (root / output_dir).resolve()
+    try:
+        path.relative_to(root)
+    except ValueError:
+        return None
+    return path
+
+
+@tool("Fetch changed files")
+def changed_files_tool(output_dir: str = "output") -> str:
+    """
+    Return the content of only the files changed by the latest code generation or fix,
+    plus the paths of removed files.
+    Input: the run's output directory (default 'output').
+    """
+    path = _output_root(output_dir)
+    if path is None:
+        return "Error: Directory must be within the working directory."
+    manifest = load_manifest(str(path))
+    if not manifest["generation"]:
+        return "No generated files yet."
+    parts = [f"Generation {manifest['generation']} (from {manifest.get('source') or 'unknown'}):"]
+    if not manifest["changed"] and not manifest["removed"]:
+        parts.append("No files changed.")
+    for name in manifest["changed"]:
+        try:
+            content = (path / FILES_DIR / name).read_text(encoding="utf-8", errors="replace")
+        except OSError as e:
+            content = f"(unreadable: {e})"
+        parts.append(f"### {name}\n```\n{content}```")
+    if manifest["removed"]:
+        parts.append("Removed: " + ", ".join(manifest["removed"]))
+    return "\n\n".join(parts)
+
+
+@tool("List generated files")
+def list_generated_files_tool(output_dir: str = "output") -> str:
+    """
+    List the generated file tree with size, sha256 prefix and the cycle that last changed each file.
+    Input: the run's output directory (default 'output').
+    """
+    path = _output_root(output_dir)
+    if path is None:
+        return "Error: Directory must be within the working directory."
+    manifest = load_manifest(str(path))
+    if not manifest["files"]:
+        return "No generated files yet."
+    return "\n".join(
+        f"  {name}  {entry['size']}B  {entry['sha256'][:12]}  gen {entry['generation']}"
+        for name, entry in sorted(manifest["files"].items())
+    )
@@ -2,21 +2,35 @@
 Documentation tools for the Research Agent.
 Enables reading project files and directories for technical context.
 """
+from itertools import islice
 from pathlib import Path
 from typing import Optional
 
 from crewai.tools import tool
 
+from src.file_index import file_index
+from src.file_reader import BinaryFileError, read_range
+from src.tool_cache import cached_call, path_dep
+
 
 _PROJECT_ROOT = Path(__file__).parent.parent.parent
+_LIST_LIMIT = 50
 
 
 @tool("Read file contents")
-def read_file_tool(file_path: str) -> str:
+def read_file_tool(
+    file_path: str,
+    offset: int = 0,
+    length: Optional[int] = None,
+    start_line: Optional[int] = None,
+    end_line: Optional[int] = None,
+) -> str:
     """
     Read the contents of a file from the project.
     Use this to fetch documentation, configs, or source code.
     Input: Absolute or relative file path (e.g., 'ARCHITECTURE.md', 'src/main.py').
+    Optional: offset/length (bytes) or start_line/end_line (1-based, inclusive) to read part
+    of a large file. Output is capped; a truncation marker says where to continue.
     """
     root = _PROJECT_ROOT.resolve()
     full_path = (root / file_path).resolve()
@@ -28,10 +42,17 @@ def read_file_tool(file_path: str) -> str:
         return f"Error: File not found: {file_path}"
     if full_path.is_dir():
         return "Error: Path is a directory. Use read_directory_tool instead."
-    try:
-        return full_path.read_text(encoding="utf-8", errors="replace")
-    except Exception as e:
-        return f"Error reading file: {e}"
+
+    def read() -> tuple[str, list]:
+        deps = [path_dep(full_path)]  # taken before reading, so a concurrent write invalidates
+        try:
+            return read_range(full_path, offset, length, start_line, end_line), deps
+        except BinaryFileError as e:
+            return f"Error: {e}; not shown.", deps
+        except Exception as e:
+            return f"Error reading file: {e}", deps
+
+    return cached_call("read_file_tool", (str(full_path), offset, length, start_line, end_line), read)
 
 
 @tool("List directory contents")
@@ -40,7 +61,8 @@ def read_directory_tool(directory: str, pattern: Optional[str] = None) -> str:
     List files and subdirectories in a directory.
     Use this to explore project structure and find relevant files.
     Input: Directory path (e.g., 'src/', '.').
-    Optional: pattern filter like '*.py' for Python files.
+    Optional: pattern filter like '*.py' for Python files (searched recursively).
+    Skips .git, virtualenvs, node_modules and anything in .gitignore.
     """
     root = _PROJECT_ROOT.resolve()
     path = (root / directory).resolve()
@@ -50,16 +72,25 @@ def read_directory_tool(directory: str, pattern: Optional[str] = None) -> str:
         return "Error: Directory must be within the project."
     if not path.exists() or not path.is_dir():
         return f"Error: Directory not found: {directory}"
-    try:
-        if pattern:
-            items = list(path.rglob(pattern))
-        else:
-            items = list(path.iterdir())
-        items.sort(key=lambda p: (not p.is_dir(), str(p)))
+    index = file_index(root)
+    rel = path.relative_to(root).as_posix() if path != root else ""
+
+    def listing() -> tuple[str, list]:
+        visited: list = []
+        try:
+            if pattern:
+                matches = index.find(pattern, rel, visited=visited)
+            else:
+                matches = index.walk(rel, recursive=False, visited=visited)
+            items = list(islice(matches, _LIST_LIMIT + 1))  # stop walking once over the limit
+        except Exception as e:
+            return f"Error listing directory: {e}", visited
         lines = []
-        for p in items[:50]:  # Limit output
-            rel = p.relative_to(path) if path != Path(".") else p
-            lines.append(f"  {'[DIR]' if p.is_dir() else '[FILE]'} {rel}")
-        return "\n".join(lines) if lines else "(empty)"
-    except Exception as e:
-        return f"Error listing directory: {e}"
+        for entry in items[:_LIST_LIMIT]:
+            shown = entry.path[len(rel) + 1:] if rel else entry.path
+            lines.append(f"  {'[DIR]' if entry.is_dir else '[FILE]'} {shown}")
+        if len(items) > _LIST_LIMIT:
+            lines.append(f"  ... more than {_LIST_LIMIT} entries; narrow the directory or pattern")
+        return ("\n".join(lines) if lines else "(empty)"), visited
+
+    return cached_call("read_directory_tool", (rel, pattern), listing)
@@ -1,35 +1,15 @@
 """
 Memory tools for the Memory Agent.
 Store and retrieve project decisions, architecture, and preferences.
+Backed by the shared append-only log in src.memory_store.
 """
 import json
-from pathlib import Path
 from typing import Optional
 
 from crewai.tools import tool
 
-MEMORY_DIR = Path(__file__).parent.parent.parent / "memory"
-MEMORY_FILE = MEMORY_DIR / "project_memory.json"
-
-
-def _ensure_memory_dir() -> None:
-    MEMORY_DIR.mkdir(parents=True, exist_ok=True)
-
-
-def _load_memory() -> list[dict]:
-    _ensure_memory_dir()
-    if not MEMORY_FILE.exists():
-        return []
-    try:
-        data = json.loads(MEMORY_FILE.read_text(encoding="utf-8"))
-        return data if isinstance(data, list) else []
-    except Exception:
-        return []
-
-
-def _save_memory(records: list[dict]) -> None:
-    _ensure_memory_dir()
-    MEMORY_FILE.write_text(json.dumps(records, indent=2), encoding="utf-8")
+from src.memory_store import get_store
+from src.tool_cache import cached_call, memory_dep
 
 
 @tool("Store project decision")
@@ -39,16 +19,66 @@ def store_decision_tool(category: str, content: str, tags: Optional[str] = None)
     Categories: architecture, api, library, preference, bug_fix, security.
     Tags: Optional comma-separated keywords for retrieval.
     """
-    records = _load_memory()
-    record = {
-        "category": category,
-        "content": content,
-        "tags": [t.strip() for t in (tags or "").split(",") if t.strip()],
-        "id": len(records) + 1,
-    }
-    records.append(record)
-    _save_memory(records)
-    return f"Stored decision #{record['id']} under category '{category}'"
+    try:
+        rid = get_store().store(
+            category,
+            content,
+            [t.strip() for t in (tags or "").split(",") if t.strip()],
+        )
+    except ValueError as e:
+        return f"Error: {e}"
+    return f"Stored decision #{rid} under category '{category}'"
+
+
+@tool("Store project decisions in bulk")
+def store_decisions_bulk_tool(decisions: str) -> str:
+    """
+    Store several decisions in one call. `decisions` is a JSON list of objects with
+    "category", "content" and optional "tags" (list or comma-separated string).
+    A decision that closely matches one already in memory (same category) updates that
+    record instead of adding a new one, so there is no need to retrieve first.
+    """
+    try:
+        items = json.loads(decisions)
+    except ValueError as e:
+        return f"Error: decisions must be a JSON list of objects ({e})"
+    if isinstance(items, dict):
+        items = [items]
+    if not isinstance(items, list) or not all(isinstance(d, dict) for d in items):
+        return "Error: decisions must be a JSON list of objects"
+    try:
+        results = get_store().store_many(items)
+    except ValueError as e:
+        return f"Error: {e}"
+    lines = []
+    for n, r in enumerate(results, 1):
+        if r["status"] == "stored":
+            lines.append(f"{n}. stored #{r['id']} under '{r['category']}'")
+        elif r["status"] == "merged":
+            lines.append(f"{n}. merged into #{r['id']} (similarity {r['similarity']})")
+        elif r["status"] == "duplicate":
+            lines.append(f"{n}. skipped: duplicate of #{r['id']}")
+        else:
+            lines.append(f"{n}. invalid: {r['error']}")
+    stored = sum(r["status"] == "stored" for r in results)
+    return f"Stored {stored} of {len(results)} decisions.\n" + "\n".join(lines)
+
+
+def _cached_retrieve(tool: str, query: str, category: Optional[str]) -> list[dict]:
+    """memory.retrieve() through the run's ToolCache; a cache hit still counts as a retrieval."""
+    memory = get_store()
+    computed = False
+
+    def search() -> tuple[str, list]:
+        nonlocal computed
+        computed = True
+        # any store, delete or compaction changes the version
+        return json.dumps(memory.retrieve(query, category, limit=10)), [memory_dep(memory)]
+
+    records = json.loads(cached_call(tool, (query, category), search))
+    if records and not computed:
+        memory.access_log().touch(r["id"] for r in records)  # retention evicts least recently retrieved
+    return records
 
 
 @tool("Retrieve past decisions")
@@ -57,23 +87,40 @@ def retrieve_decisions_tool(query: str, category: Optional[str] = None) -> str:
     Retrieve relevant past project decisions by keyword or category.
     Use when the user asks about prior choices, architecture, or preferences.
     """
-    records = _load_memory()
+    records = _cached_retrieve("retrieve_decisions_tool", query, category)
     if not records:
-        return "No stored decisions yet."
+        return "No stored decisions yet." if not len(get_store()) else "No matching decisions found."
+    return "\n\n".join(f"[{r.get('category', '')}] {r.get('content', '')[:200]}..." for r in records)
 
-    query_lower = query.lower()
-    filtered = []
-    for r in records:
-        if category and r.get("category") != category:
-            continue
-        content = r.get("content", "").lower()
-        tags = " ".join(r.get("tags", [])).lower()
-        if query_lower in content or query_lower in tags:
-            filtered.append(r)
 
-    if not filtered:
-        return "No matching decisions found."
-    lines = []
-    for r in filtered[-10:]:  # Last 10
-        lines.append(f"[{r.get('category', '')}] {r.get('content', '')[:200]}...")
-    return "\n\n".join(lines)
+@tool("Retrieve past decisions in bulk")
+def retrieve_decisions_bulk_tool(queries: str) -> str:
+    """
+    Run several retrievals in one call. `queries` is a JSON list of query strings or
+    {"query": ..., "category": ...} objects. Each decision is shown once, under the
+    first query that found it.
+    """
+    try:
+        items = json.loads(queries)
+    except ValueError:
+        items = [q for q in queries.split(",") if q.strip()]  # tolerate a plain comma list
+    if not isinstance(items, list):
+        items = [items]
+    seen: set[int] = set()
+    sections = []
+    for n, item in enumerate(items, 1):
+        query, category = (item.get("query", ""), item.get("category")) if isinstance(item, dict) else (item, None)
+        if not isinstance(query, str) or not isinstance(category, (str, type(None))):
+            sections.append(
+                f"## Query {n}\nError: expected a query string or an object with a string \"query\" "
+                "and an optional string \"category\""
+            )
+            continue
+        records = _cached_retrieve("retrieve_decisions_bulk_tool", query, category)
+        fresh = [r for r in records if r["id"] not in seen]
+        seen.update(r["id"] for r in fresh)
+        body = "\n".join(f"#{r['id']} [{r.get('category', '')}] {r.get('content', '')[:200]}" for r in fresh)
+        sections.append(f"## {query}" + (f" ({category})" if category else "") + "\n" + (body or ("Only decisions listed above." if records else "No matching decisions.")))
+    if not sections:
+        return "No queries given."
+    return "\n\n".join(sections)
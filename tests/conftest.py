@@ -0,0 +1,13 @@
+import pytest
+
+from src.memory_store import MemoryStore
+
+_MEMORY_ENV = ("MEMORY_DEDUP_THRESHOLD", "MEMORY_RETENTION", "MEMORY_SEMANTIC")
+
+
+@pytest.fixture
+def memory(tmp_path, monkeypatch):
+    """A fresh MemoryStore in a temporary directory, with the memory settings at their defaults."""
+    for name in _MEMORY_ENV:
+        monkeypatch.delenv(name, raising=False)
+    return MemoryStore(tmp_path / "memory.jsonl")
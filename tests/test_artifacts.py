@@ -0,0 +1,34 @@
+import pytest
+
+from src.artifacts import load_manifest, materialize
+
+DOC = "### `src/app.py`\n```python\nprint(1)\n```\n\n### `README.md`\n```\nhello\n```\n"
+
+
+def test_materialize_writes_only_changed_files(tmp_path):
+    out = tmp_path / "output"
+    first = materialize(DOC, str(out), source="code_generator")
+    assert sorted(first.written) == ["README.md", "src/app.py"]
+    assert (out / "files" / "src" / "app.py").read_text() == "print(1)\n"
+
+    second = materialize(DOC.replace("print(1)", "print(2)").replace("### `README.md`\n```\nhello\n```\n", ""), str(out))
+    assert second.written == ["src/app.py"] and second.removed == ["README.md"]
+    manifest = load_manifest(str(out))
+    assert manifest["generation"] == 2 and manifest["changed"] == ["src/app.py"]
+    assert not (out / "files" / "README.md").exists()
+
+
+def test_unsafe_paths_are_skipped(tmp_path):
+    doc = "### `../escape.py`\n```python\nx = 1\n```\n"
+    assert materialize(doc, str(tmp_path / "output")).written == []
+
+
+def test_changed_files_tool_reads_the_cwd_relative_output(tmp_path, monkeypatch):
+    pytest.importorskip("crewai")
+    from src.tools.artifact_tools import changed_files_tool
+
+    monkeypatch.chdir(tmp_path)
+    materialize(DOC, "output/runs/r1", source="fixer")
+    report = changed_files_tool.run(output_dir="output/runs/r1")
+    assert "Generation 1 (from fixer)" in report and "print(1)" in report
+    assert changed_files_tool.run(output_dir="../elsewhere").startswith("Error")
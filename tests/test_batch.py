@@ -0,0 +1,97 @@
+import io
+import json
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("crewai")
+
+from src import batch
+from src.batch import BatchRunner, read_topics
+from src.rate_limit import LLMLimiter
+
+
+def test_read_topics():
+    lines = [
+        "# comment",
+        "",
+        '{"topic": "Build a REST API", "id": "My API"}',
+        '{"prompt": "CLI tool"}',
+        '{"topic": "  "}',
+        "Plain text topic",
+        '{"topic": "Duplicate id", "id": "my-api"}',
+    ]
+    assert read_topics(lines) == [
+        ("my-api", "Build a REST API"),
+        ("0004-cli-tool", "CLI tool"),
+        ("0006-plain-text-topic", "Plain text topic"),
+        ("my-api-x", "Duplicate id"),
+    ]
+
+
+class FakeCrew:
+    running = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def __init__(self, topic_fails):
+        self.topic_fails = topic_fails
+
+    def kickoff(self, inputs):
+        with FakeCrew.lock:
+            FakeCrew.running += 1
+            FakeCrew.peak = max(FakeCrew.peak, FakeCrew.running)
+        time.sleep(0.05)
+        with FakeCrew.lock:
+            FakeCrew.running -= 1
+        if inputs["topic"] == self.topic_fails:
+            raise RuntimeError("rate limited")
+        return f"built {inputs['topic']}"
+
+
+def test_batch_runs_with_bounded_concurrency(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(batch, "create_elite_dev_crew", lambda **kwargs: FakeCrew("topic 3"))
+    FakeCrew.peak = 0
+    stream = io.StringIO()
+    topics = [(f"run-{i}", f"topic {i}") for i in range(6)]
+    runs = BatchRunner(workers=2, max_fix_cycles=0, stream=stream).run(topics)
+
+    assert FakeCrew.peak == 2
+    assert [r.status for r in runs] == ["done", "done", "done", "failed", "done", "done"]
+    assert runs[3].error == "RuntimeError: rate limited"
+    assert (tmp_path / "output/runs/run-0/result.md").read_text() == "built topic 0"
+    assert "RuntimeError" in (tmp_path / "output/runs/run-3/error.txt").read_text()
+    assert json.loads((tmp_path / "output/runs/run-3/status.json").read_text())["status"] == "failed"
+    events = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert [e["status"] for e in events if e["run_id"] == "run-0"] == ["queued", "running", "done"]
+
+
+def test_limiter_caps_concurrency():
+    limiter, running, peak, lock = LLMLimiter(max_concurrency=2), [0], [0], threading.Lock()
+
+    def call():
+        with limiter.slot():
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+            time.sleep(0.02)
+            with lock:
+                running[0] -= 1
+
+    threads = [threading.Thread(target=call) for _ in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert peak[0] == 2 and limiter.waited > 0
+
+
+def test_limiter_spaces_requests_by_rate():
+    limiter = LLMLimiter(rpm=1200)  # one request per 50 ms after the first
+    start = time.monotonic()
+    for _ in range(3):
+        with limiter.slot():
+            pass
+    assert time.monotonic() - start >= 0.09
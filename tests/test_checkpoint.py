@@ -0,0 +1,77 @@
+import pytest
+
+pytest.importorskip("crewai")
+
+from crewai.tasks.task_output import TaskOutput
+
+from src.checkpoint import RunCheckpoint, new_run_id
+from src.context_budget import BudgetedConditionalTask, BudgetedTask
+
+
+def _task(name, context=None, condition=None, **kwargs):
+    if condition is not None:
+        return BudgetedConditionalTask(
+            description=name, expected_output=name, name=name, context=context or [], condition=condition, **kwargs
+        )
+    return BudgetedTask(description=name, expected_output=name, name=name, context=context or [], **kwargs)
+
+
+def _output(name, raw):
+    return TaskOutput(name=name, description=name, agent="Agent", raw=raw)
+
+
+@pytest.fixture
+def checkpoint(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    return RunCheckpoint.create("Build a REST API", runs_dir="runs", run_id="r1")
+
+
+def test_new_run_id():
+    assert new_run_id("Build a REST API!").endswith("-build-a-rest-api")
+    assert new_run_id("???").endswith("-run")
+
+
+def test_create_and_load(checkpoint):
+    loaded = RunCheckpoint.load("r1", runs_dir="runs")
+    assert loaded.meta["topic"] == "Build a REST API" and loaded.meta["status"] == "running"
+    loaded.update(status="failed")
+    assert checkpoint.meta["status"] == "failed"
+    with pytest.raises(FileNotFoundError):
+        RunCheckpoint.load("missing", runs_dir="runs")
+
+
+def test_restore_skips_finished_tasks(checkpoint, tmp_path):
+    replayed = []
+    research = _task("research")
+    code = _task("code", [research], output_file="out/implementation.md", callback=replayed.append)
+    review = _task("review", [code])
+    checkpoint.save(_output("research", "findings"))
+    checkpoint.save(_output("code", "print('hi')"))
+    checkpoint.save(TaskOutput(description="unnamed", agent="Agent", raw="ignored"))
+    assert set(checkpoint.completed()) == {"research", "code"}
+
+    pending = checkpoint.restore([research, code, review])
+    assert pending == [review]
+    assert checkpoint.restored == ["research", "code"]
+    assert research.output.raw == "findings" and code.output.raw == "print('hi')"
+    assert [o.raw for o in replayed] == ["print('hi')"]
+    assert (tmp_path / "out" / "implementation.md").read_text() == "print('hi')"
+
+
+def test_restore_resolves_a_leading_conditional_task(checkpoint):
+    review = _task("review")
+    fix = _task("fix", [review], condition=lambda output: "critical" in output.raw)
+    final = _task("final", [fix])
+    checkpoint.save(_output("review", "1 critical issue"))
+    pending = checkpoint.restore([review, fix, final])
+    assert [t.name for t in pending] == ["fix", "final"]
+    assert type(pending[0]) is BudgetedTask  # a crew cannot start with a ConditionalTask
+    assert final.context == [pending[0]]
+
+
+def test_restore_drops_a_leading_conditional_task_that_would_be_skipped(checkpoint):
+    review = _task("review")
+    fix = _task("fix", [review], condition=lambda output: "critical" in output.raw)
+    final = _task("final", [review])
+    checkpoint.save(_output("review", "no issues"))
+    assert checkpoint.restore([review, fix, final]) == [final]
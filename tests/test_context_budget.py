@@ -0,0 +1,76 @@
+import pytest
+
+pytest.importorskip("crewai")
+
+from crewai.tasks.task_output import TaskOutput
+
+from src.context_budget import DIVIDER, BudgetedTask, ContextBudget, count_tokens, summarize
+
+REVIEW = "\n".join(
+    ["# Review", "VERDICT: FAIL", "- critical: SQL injection in the login query"]
+    + [f"Some explanation sentence number {i} about style." for i in range(60)]
+)
+
+
+def _done(name, agent, raw):
+    task = BudgetedTask(description=name, expected_output=name, name=name)
+    task.output = TaskOutput(name=name, description=name, agent=agent, raw=raw)
+    return task
+
+
+def _consumer(*sources):
+    return BudgetedTask(description="fix", expected_output="fix", name="fix", context=list(sources))
+
+
+def test_count_tokens_edges():
+    assert count_tokens("") == 0 and count_tokens("a") == 1
+
+
+def test_summarize_keeps_structure_and_collapses_code():
+    text = "# Title\nplain prose\n```python\nx = 1\ny = 2\n```\n- item\nA high severity bug"
+    assert summarize(text, 100).splitlines() == ["# Title", "[code block: 2 lines omitted]", "- item", "A high severity bug"]
+    assert count_tokens(summarize(REVIEW, 5)) <= 5
+
+
+def test_no_sources_passes_the_context_through():
+    assert ContextBudget(100).assemble(_consumer(), "given") == "given"
+    empty = _done("review", "Reviewer", "   ")
+    assert ContextBudget(100).assemble(_consumer(empty), None) is None
+
+
+def test_within_budget_nothing_is_compressed():
+    review, code = _done("review", "Reviewer", REVIEW), _done("code", "Coder", "print('hi')")
+    exact = count_tokens(REVIEW) + count_tokens("print('hi')")
+    for budget in (0, exact):  # unlimited, and exactly at the budget
+        assembled = ContextBudget(budget).assemble(_consumer(review, code), None)
+        assert assembled == REVIEW + DIVIDER + "print('hi')"
+
+
+def test_one_token_over_budget_compresses_older_outputs_only():
+    review, code = _done("review", "Reviewer", REVIEW), _done("code", "Coder", "print('hi')")
+    budget = ContextBudget(count_tokens(REVIEW) + count_tokens("print('hi')") - 1)
+    assembled = budget.assemble(_consumer(review, code), None)
+    summary, newest = assembled.split(DIVIDER)
+    assert summary.startswith("[review: summary]\n# Review\nVERDICT: FAIL\n- critical")
+    assert newest == "print('hi')"
+    assert budget.stats["fix"]["compressed"] == ["review"]
+
+
+def test_the_newest_output_is_kept_whole_even_over_budget():
+    review = _done("review", "Reviewer", REVIEW)
+    assert ContextBudget(10).assemble(_consumer(review), None) == REVIEW
+
+
+def test_older_output_of_the_same_agent_becomes_a_diff():
+    newer = REVIEW.replace("number 30 ", "number thirty ")
+    first, second = _done("review_1", "Reviewer", REVIEW), _done("review_2", "Reviewer", newer)
+    assembled = ContextBudget(count_tokens(REVIEW)).assemble(_consumer(first, second), None)
+    older, newest = assembled.split(DIVIDER)
+    assert older.startswith("[review_1: diff against review_2]\n--- older\n+++ newer")
+    assert "+Some explanation sentence number thirty about style." in older
+    assert newest == newer
+
+
+def test_identical_outputs_are_sent_once():
+    code, fix = _done("code", "Coder", "print('hi')"), _done("fix_1", "Fixer", "print('hi')")
+    assert ContextBudget(0).assemble(_consumer(code, fix), None) == "print('hi')"
@@ -0,0 +1,60 @@
+from src.file_index import FileIndex, parse_gitignore
+
+
+def _ignored(rules_text: str, path: str, is_dir: bool = False) -> bool:
+    ignored = False
+    for rule in parse_gitignore(rules_text):
+        if rule.dir_only and not is_dir:
+            continue
+        if rule.regex.match(path):
+            ignored = not rule.negate
+    return ignored
+
+
+def test_unanchored_pattern_matches_at_any_depth():
+    assert _ignored("*.log", "app.log")
+    assert _ignored("*.log", "logs/deep/app.log")
+    assert not _ignored("*.log", "app.log.txt")
+
+
+def test_anchored_pattern_matches_from_root_only():
+    assert _ignored("/build", "build", is_dir=True)
+    assert not _ignored("/build", "src/build", is_dir=True)
+    assert _ignored("docs/*.md", "docs/a.md")
+    assert not _ignored("docs/*.md", "docs/sub/a.md")
+
+
+def test_anchored_dir_pattern():
+    assert _ignored("/build/", "build", is_dir=True)
+    assert not _ignored("/build/", "src/build", is_dir=True)
+    assert _ignored("build/", "src/build", is_dir=True)
+    assert _ignored("/bench_results/", "bench_results", is_dir=True)
+
+
+def test_double_star():
+    assert _ignored("**/cache", "a/b/cache", is_dir=True)
+    assert _ignored("out/**", "out/x/y.txt")
+    assert _ignored("a/**/z", "a/z") and _ignored("a/**/z", "a/b/c/z")
+
+
+def test_dir_only_negation_and_classes():
+    assert _ignored("tmp/", "tmp", is_dir=True)
+    assert not _ignored("tmp/", "tmp", is_dir=False)
+    assert not _ignored("*.log\n!keep.log", "keep.log")
+    assert _ignored("file[0-9].txt", "file3.txt") and not _ignored("file[0-9].txt", "filex.txt")
+    assert not _ignored("# comment\n\n", "comment")
+
+
+def test_walk_applies_nested_gitignore(tmp_path):
+    (tmp_path / ".gitignore").write_text("*.log\nbuild/\n/dist/\n")
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / ".gitignore").write_text("generated.py\n!keep.log\n")
+    names = (
+        "app.log", "src/main.py", "src/generated.py", "src/keep.log", "build/out.txt",
+        "dist/a.whl", "src/dist/keep.py", "node_modules/x.js",
+    )
+    for name in names:
+        (tmp_path / name).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / name).write_text("x")
+    files = {e.path for e in FileIndex(tmp_path).walk() if not e.is_dir}
+    assert files == {".gitignore", "src/.gitignore", "src/main.py", "src/keep.log", "src/dist/keep.py"}
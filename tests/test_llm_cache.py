@@ -0,0 +1,64 @@
+import pickle
+import sqlite3
+
+from src.llm_cache import ResponseCache, cache_key
+
+
+def test_cache_key_covers_every_output_affecting_setting():
+    messages = [{"role": "user", "content": "Write a REST API"}]
+    key = cache_key("deepseek-chat", messages, temperature=0.2)
+    assert key == cache_key("deepseek-chat", [dict(m) for m in messages], temperature=0.2)
+    assert key != cache_key("deepseek-coder", messages, temperature=0.2)
+    assert key != cache_key("deepseek-chat", messages, temperature=0.7)
+    assert key != cache_key("deepseek-chat", messages, temperature=0.2, stop=["END"])
+    assert key != cache_key("deepseek-chat", messages, tools=[{"name": "read_file"}], temperature=0.2)
+
+
+def test_hit_miss_and_json_round_trip(tmp_path):
+    cache = ResponseCache(tmp_path / "responses.sqlite")
+    assert cache.get("k") == (False, None)
+    value = {"text": "héllo", "tool_calls": [{"name": "read_file", "args": {"path": "a.py"}}]}
+    cache.put("k", value)
+    assert cache.get("k") == (True, value)
+    reopened = ResponseCache(tmp_path / "responses.sqlite")
+    assert reopened.get("k") == (True, value)
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+
+def test_values_that_are_not_json_are_not_cached(tmp_path):
+    cache = ResponseCache(tmp_path / "responses.sqlite")
+    cache.put("obj", object())
+    cache.put("nan", float("nan"))
+    assert cache.get("obj") == (False, None) and cache.get("nan") == (False, None)
+    assert cache.stats()["entries"] == 0
+
+
+def test_pickled_rows_are_dropped_as_misses(tmp_path):
+    path = tmp_path / "responses.sqlite"
+    cache = ResponseCache(path)
+    blob = pickle.dumps("old response")
+    with sqlite3.connect(path) as db:
+        db.execute(
+            "INSERT INTO responses (key, value, size, created, accessed) VALUES ('k', ?, ?, 0, 0)",
+            (blob, len(blob)),
+        )
+    cache = ResponseCache(path)
+    assert cache.get("k") == (False, None)
+    assert cache.stats()["entries"] == 0 and cache.stats()["bytes"] == 0
+
+
+def test_expired_entries_are_misses(tmp_path):
+    cache = ResponseCache(tmp_path / "responses.sqlite", ttl=-1)
+    cache.put("k", "text")
+    assert cache.get("k") == (False, None)
+
+
+def test_size_bound_evicts_least_recently_used(tmp_path):
+    cache = ResponseCache(tmp_path / "responses.sqlite", max_bytes=80)
+    cache.put("a", "x" * 20)
+    cache.put("b", "y" * 20)
+    cache.get("a")  # b is now the least recently used
+    cache.put("c", "z" * 20)
+    assert cache.get("a")[0] and cache.get("c")[0]
+    assert cache.get("b") == (False, None)
+    assert cache.stats()["evictions"] == 1 and cache.stats()["bytes"] <= 80
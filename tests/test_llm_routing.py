@@ -0,0 +1,60 @@
+import pytest
+
+from src.llm_routing import DEFAULT_ROUTES, routes, tier_for, tier_settings
+
+
+@pytest.fixture(autouse=True)
+def clean_env(monkeypatch):
+    monkeypatch.delenv("LLM_ROUTES", raising=False)
+    monkeypatch.delenv("DEEPSEEK_MODEL", raising=False)
+    for tier in ("LIGHT", "STANDARD", "STRONG", "TINY"):
+        for key in ("MODEL", "MAX_TOKENS", "TEMPERATURE", "TIMEOUT"):
+            monkeypatch.delenv(f"LLM_TIER_{tier}_{key}", raising=False)
+
+
+def test_routes_parsing():
+    assert routes(DEFAULT_ROUTES)["research"] == "light"
+    assert routes(" reviewer = Strong , =light, fixer= ") == {"reviewer": "strong", "*": "light"}
+    assert routes("light") == {"*": "light"}
+    assert routes("") == {}
+
+
+def test_default_tiers():
+    assert tier_for("memory") == tier_for("research") == "light"
+    assert tier_for("code_generator") == tier_for("fixer") == "strong"
+    assert tier_for("architect") == tier_for("reviewer") == tier_for(None) == "standard"
+
+
+def test_routes_from_env(monkeypatch):
+    monkeypatch.setenv("LLM_ROUTES", "reviewer=strong")
+    assert tier_for("reviewer") == "strong"
+    assert tier_for("fixer") == "standard"  # no "*": the default tier
+
+
+def test_tier_settings(monkeypatch):
+    light = tier_settings("light")
+    assert (light.model, light.max_tokens, light.temperature, light.timeout) == ("deepseek-chat", 4096, 0.2, 120.0)
+    monkeypatch.setenv("DEEPSEEK_MODEL", "deepseek-reasoner")
+    monkeypatch.setenv("LLM_TIER_LIGHT_MODEL", "deepseek-chat")
+    monkeypatch.setenv("LLM_TIER_LIGHT_MAX_TOKENS", "none")
+    monkeypatch.setenv("LLM_TIER_LIGHT_TIMEOUT", "not a number")
+    light = tier_settings("light")
+    assert (light.model, light.max_tokens, light.timeout) == ("deepseek-chat", None, 120.0)
+    assert tier_settings("strong").model == "deepseek-reasoner"
+    tiny = tier_settings("tiny")  # unknown tiers start from the standard defaults
+    assert (tiny.name, tiny.max_tokens, tiny.timeout) == ("tiny", None, 300.0)
+
+
+def test_get_llm_uses_the_agent_tier(monkeypatch):
+    pytest.importorskip("crewai")
+    from src import llm
+
+    seen = []
+    monkeypatch.setenv("DEEPSEEK_API_KEY", "test")
+    monkeypatch.setenv("LLM_TIER_STRONG_MODEL", "deepseek-reasoner")
+    provider_llm = llm._provider_llm
+    monkeypatch.setattr(llm, "_provider_llm", lambda *args: seen.append(args) or provider_llm(*args))
+    monkeypatch.setattr(llm, "cache_enabled_for", lambda agent: False)
+    client = llm.get_llm("fixer")
+    assert seen[0][0] == "deepseek-reasoner" and seen[0][3:] == (8192, 0.0, 600.0)
+    assert client.tier == "strong" and client.inner.model == "deepseek-reasoner"
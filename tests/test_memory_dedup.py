@@ -0,0 +1,55 @@
+import pytest
+
+from src.memory_dedup import DEFAULT_THRESHOLD, jaccard, shingles, threshold_from_env
+from src.memory_store import MemoryStore
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.delenv("MEMORY_DEDUP_THRESHOLD", raising=False)
+    monkeypatch.delenv("MEMORY_RETENTION", raising=False)
+    return MemoryStore(tmp_path / "memory.jsonl")
+
+
+def test_threshold_from_env(monkeypatch):
+    monkeypatch.delenv("MEMORY_DEDUP_THRESHOLD", raising=False)
+    assert threshold_from_env() == DEFAULT_THRESHOLD
+    for raw, expected in (("0.9", 0.9), ("0", None), ("off", None), ("7", 1.0), ("junk", DEFAULT_THRESHOLD)):
+        monkeypatch.setenv("MEMORY_DEDUP_THRESHOLD", raw)
+        assert threshold_from_env() == expected, raw
+
+
+def test_near_identical_wording_is_merged(store):
+    first = store.store("api", "Use FastAPI for the HTTP API", ["web"])
+    result = store.store_many([{"category": "api", "content": "Use FastAPI for the HTTP API layer", "tags": "http"}])[0]
+    assert result["status"] == "merged" and result["id"] == first
+    record = store.get(first)
+    assert record["content"] == "Use FastAPI for the HTTP API"  # never overwritten
+    assert record["variants"] == ["Use FastAPI for the HTTP API layer"]
+    assert set(record["tags"]) == {"web", "http"} and record["merged"] == 1
+    assert len(store) == 1
+
+
+def test_different_decisions_are_kept_apart(store):
+    texts = [
+        "Use FastAPI for the HTTP API",
+        "Use Flask for the HTTP API",
+        "Do not store secrets in the repository",
+        "Store secrets in the repository",
+    ]
+    results = store.store_many([{"category": "api", "content": t} for t in texts])
+    assert [r["status"] for r in results] == ["stored"] * 4
+    assert jaccard(shingles(texts[2]), shingles(texts[3])) < DEFAULT_THRESHOLD
+
+
+def test_same_category_only(store):
+    store.store("api", "Use FastAPI for the HTTP API")
+    assert store.store_many([{"category": "library", "content": "Use FastAPI for the HTTP API"}])[0]["status"] == "stored"
+
+
+def test_exact_duplicate_and_merging_off(store, monkeypatch):
+    rid = store.store("api", "Use FastAPI for the HTTP API")
+    assert store.store_many([{"category": "api", "content": "use  FastAPI for the HTTP API"}])[0]["status"] == "duplicate"
+    monkeypatch.setenv("MEMORY_DEDUP_THRESHOLD", "off")
+    result = store.store_many([{"category": "api", "content": "Use FastAPI for the HTTP API layer"}])[0]
+    assert result["status"] == "stored" and result["id"] != rid
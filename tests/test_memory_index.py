@@ -0,0 +1,71 @@
+import json
+
+from src.memory_index import InvertedIndex, iter_log, tokenize
+from src.memory_store import MemoryStore
+
+
+def test_tokenize():
+    assert tokenize("Use the Redis caches for C++ and C# APIs") == ["redi", "cache", "c++", "c#", "api"]
+
+
+def test_search_before_anything_is_stored(memory):
+    assert memory.retrieve("redis") == []
+    assert not memory.path.exists()
+
+
+def test_bm25_ranks_the_more_specific_record_first(memory):
+    memory.store("database", "Cache query results in Redis")
+    best = memory.store("database", "Redis cluster for sessions; Redis sentinel for failover", ["redis"])
+    memory.store("api", "Version the REST API under /v1")
+    hits = memory.search_index().search("redis")
+    assert [rid for rid, _ in hits][:1] == [best] and len(hits) == 2
+    assert hits[0][1] > hits[1][1] > 0
+    assert memory.search_index().search("redis", category="api") == []
+
+
+def test_index_catches_up_with_an_external_append(memory, tmp_path):
+    memory.store("api", "Version the REST API under /v1")
+    index = memory.search_index()
+    other = MemoryStore(tmp_path / "memory.jsonl")  # e.g. another process
+    rid = other.store("library", "Use httpx for outgoing HTTP calls")
+    with (tmp_path / "memory.jsonl").open("a") as f:  # a raw append by a foreign writer
+        f.write(json.dumps({"id": rid + 1, "category": "library", "content": "Use orjson for fast JSON"}) + "\n")
+    assert index.search("httpx") == []  # not synced yet
+    assert [rid for rid, _ in memory.search_index().search("httpx")] == [rid]
+    assert [r["id"] for r in memory.retrieve("orjson")] == [rid + 1]
+
+
+def test_index_follows_updates_and_deletes(memory):
+    rid = memory.store("api", "Version the REST API under /v1")
+    memory.store("api", "Paginate with cursors")
+    memory.delete(rid)
+    assert memory.search_index().search("REST") == []
+    assert len(memory.search_index()) == 1
+
+
+def test_index_is_rebuilt_after_the_log_is_replaced(memory, tmp_path):
+    memory.store("api", "Version the REST API under /v1")
+    memory.search_index()
+    log = tmp_path / "memory.jsonl"
+    replacement = tmp_path / "new.jsonl"
+    replacement.write_text(json.dumps({"id": 7, "category": "api", "content": "Use gRPC between services"}) + "\n")
+    replacement.replace(log)  # a new inode, as after another process's compaction
+    assert [rid for rid, _ in memory.search_index().search("gRPC")] == [7]
+    assert memory.search_index().search("REST") == []
+
+
+def test_persisted_index_resumes_from_its_offset(memory, tmp_path):
+    memory.store("api", "Version the REST API under /v1")
+    memory.search_index()
+    index = InvertedIndex(tmp_path / "memory.index.sqlite")
+    seen = []
+
+    def read_from(offset):
+        seen.append(offset)
+        return iter_log(tmp_path / "memory.jsonl", offset, size)
+
+    rid = memory.store("api", "Paginate with cursors")
+    size = (tmp_path / "memory.jsonl").stat().st_size
+    index.sync((tmp_path / "memory.jsonl").stat().st_ino, size, read_from)
+    assert seen and seen[0] > 0  # only the new line was read
+    assert [r for r, _ in index.search("cursor")] == [rid]
@@ -0,0 +1,60 @@
+from src.memory_retention import AccessLog, limit_for, retention_limits
+
+
+def test_retention_limits():
+    assert retention_limits("") == {} and retention_limits("none") == {} and retention_limits("0") == {}
+    limits = retention_limits("architecture=2, library=x, *=5")
+    assert limits == {"architecture": 2, "*": 5}
+    assert limit_for(limits, "architecture") == 2 and limit_for(limits, "api") == 5
+    assert limit_for({}, "api") is None
+
+
+def test_least_recently_used_order(tmp_path):
+    log = AccessLog(tmp_path / "access.sqlite")
+    log.touch([1], when=30.0)
+    log.touch([2], when=10.0)
+    log.touch([3], when=20.0)
+    assert log.least_recently_used([1, 2, 3, 4], 2) == [4, 2]  # never used counts as oldest
+    assert log.least_recently_used([1, 2, 3], 2, keep=[2]) == [3, 1]
+    log.forget([2])
+    assert log.retain([1]) == 1 and log.last_used([1, 2, 3]) == {1: 30.0}
+
+
+def test_unlimited_by_default(memory):
+    for i in range(20):
+        memory.store("notes", f"note {i} about subject {i * 13}")
+    assert len(memory) == 20
+
+
+def test_store_evicts_the_least_recently_used(memory, monkeypatch):
+    monkeypatch.setenv("MEMORY_RETENTION", "notes=3")
+    ids = [memory.store("notes", text) for text in ("Use Redis for sessions", "Use Kafka for events", "Use S3 for uploads")]
+    memory.access_log().touch([ids[0]], when=3.0)
+    memory.access_log().touch([ids[1]], when=1.0)
+    memory.access_log().touch([ids[2]], when=2.0)
+    new = memory.store("notes", "Use Celery for background jobs")
+    assert memory.ids("notes") == [ids[0], ids[2], new]  # ids[1] was used longest ago
+
+    memory.retrieve("S3 uploads")  # a retrieval counts as a use
+    newest = memory.store("notes", "Use Sentry for error tracking")
+    assert memory.ids("notes") == [ids[2], new, newest]
+    assert memory.store("other", "Unlimited category") and len(memory) == 4
+
+
+def test_prune_applies_a_new_limit(memory, monkeypatch):
+    for i, when in enumerate((5.0, 1.0, 4.0, 2.0, 3.0)):
+        rid = memory.store("notes", f"Decision {i} about component {i * 11}")
+        memory.access_log().touch([rid], when=when)
+    monkeypatch.setenv("MEMORY_RETENTION", "2")
+    assert memory.prune()["evicted"] == 3
+    assert memory.ids() == [1, 3]
+
+
+def test_delete_and_compact_forget_access_rows(memory):
+    a = memory.store("notes", "Use Redis for sessions")
+    b = memory.store("notes", "Use Kafka for events")
+    memory.delete(a)
+    assert memory.access_log().last_used([a]) == {}
+    memory.access_log().touch([99])  # a row for an id that no longer exists
+    memory.compact()
+    assert set(memory.access_log().last_used([a, b, 99])) == {b}
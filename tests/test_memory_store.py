@@ -0,0 +1,78 @@
+import json
+
+import pytest
+
+from src.memory_store import MemoryStore
+
+
+def test_store_get_and_retrieve(memory):
+    a = memory.store("architecture", "Use a hexagonal architecture with ports and adapters", ["design"])
+    b = memory.store("database", "Use PostgreSQL with asyncpg connection pooling")
+    assert (a, b) == (1, 2)
+    assert memory.get(a)["tags"] == ["design"]
+    assert [r["id"] for r in memory.retrieve("asyncpg pooling")] == [b]
+    assert [r["id"] for r in memory.retrieve("", category="architecture")] == [a]
+    assert len(memory) == 2
+
+
+def test_store_many_reports_each_decision(memory):
+    results = memory.store_many([
+        {"category": "api", "content": "Version the REST API under /v1"},
+        {"category": "api", "content": ""},
+        {"category": "library", "content": "Use httpx for outgoing HTTP", "tags": "http, client"},
+    ])
+    assert [r["status"] for r in results] == ["stored", "invalid", "stored"]
+    assert memory.get(results[2]["id"])["tags"] == ["http", "client"]
+
+
+def test_store_rejects_empty_content(memory):
+    with pytest.raises(ValueError):
+        memory.store("api", "   ")
+
+
+def test_delete(memory):
+    rid = memory.store("api", "Version the REST API under /v1")
+    assert memory.delete(rid)
+    assert not memory.delete(rid)
+    assert memory.get(rid) is None and memory.retrieve("REST API") == []
+    assert memory.store("api", "Use GraphQL for the admin dashboard") == rid + 1
+
+
+def test_log_is_append_only_and_reopens(memory, tmp_path):
+    rid = memory.store("api", "Version the REST API under /v1")
+    memory.delete(rid)
+    lines = [json.loads(line) for line in (tmp_path / "memory.jsonl").read_text().splitlines()]
+    assert lines[-1] == {"id": rid, "deleted": True} and lines[0]["content"] == "Version the REST API under /v1"
+    other = memory.store("library", "Use httpx for outgoing HTTP")
+    reopened = MemoryStore(tmp_path / "memory.jsonl")
+    assert reopened.ids() == [other]
+
+
+def test_half_written_line_is_ignored_until_complete(memory, tmp_path):
+    memory.store("api", "Version the REST API under /v1")
+    log = tmp_path / "memory.jsonl"
+    line = json.dumps({"id": 2, "category": "api", "content": "Paginate with cursors"})
+    with log.open("a") as f:
+        f.write(line[:20])
+    assert memory.ids() == [1]
+    with log.open("a") as f:
+        f.write(line[20:] + "\n")
+    assert memory.ids() == [1, 2]
+
+
+def test_compaction_keeps_live_records_and_the_max_id(memory, tmp_path):
+    keep = memory.store("api", "Version the REST API under /v1")
+    for i in range(5):
+        memory.store("notes", f"Scratch note number {i} about unrelated topic {i * 7}")
+    memory.delete(keep + 5)  # the highest id
+    for rid in range(keep + 1, keep + 5):
+        memory.delete(rid)
+    result = memory.compact()
+    lines = [json.loads(line) for line in (tmp_path / "memory.jsonl").read_text().splitlines()]
+    assert result["records"] == 1 and result["bytes_after"] < result["bytes_before"]
+    assert [line["id"] for line in lines] == [keep, keep + 5]
+    assert lines[1] == {"id": keep + 5, "deleted": True}
+    assert memory.stats()["dead_lines"] == 1
+    assert [r["id"] for r in memory.retrieve("REST API")] == [keep]
+    assert memory.store("api", "Paginate list endpoints with cursors") == keep + 6
+    assert MemoryStore(tmp_path / "memory.jsonl").store("api", "Rate limit per client") == keep + 7
@@ -0,0 +1,95 @@
+import json
+
+import pytest
+
+pytest.importorskip("crewai")
+
+from src.memory_store import get_store
+from src.tool_cache import ToolCache
+from src.tools import memory_tools
+from src.tools.memory_tools import (
+    retrieve_decisions_bulk_tool,
+    retrieve_decisions_tool,
+    store_decision_tool,
+    store_decisions_bulk_tool,
+)
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    for name in ("MEMORY_DEDUP_THRESHOLD", "MEMORY_RETENTION", "MEMORY_SEMANTIC"):
+        monkeypatch.delenv(name, raising=False)
+    shared = get_store(tmp_path / "memory.jsonl")
+    monkeypatch.setattr(memory_tools, "get_store", lambda: shared)
+    return shared
+
+
+def test_store_decision(store):
+    assert store_decision_tool.run(category="api", content="REST with JSON bodies", tags="rest, json") == (
+        "Stored decision #1 under category 'api'"
+    )
+    assert store.get(1)["tags"] == ["rest", "json"]
+    assert store_decision_tool.run(category="api", content="  ").startswith("Error:")
+
+
+def test_store_decisions_bulk(store):
+    decisions = [
+        {"category": "database", "content": "Use PostgreSQL as the primary database", "tags": "db"},
+        {"category": "cache", "content": "Use Redis for caching sessions", "tags": ["redis"]},
+        {"category": "database", "content": "Use PostgreSQL as the primary database"},
+        {"category": "", "content": "No category"},
+    ]
+    report = store_decisions_bulk_tool.run(decisions=json.dumps(decisions))
+    assert report.splitlines() == [
+        "Stored 2 of 4 decisions.",
+        "1. stored #1 under 'database'",
+        "2. stored #2 under 'cache'",
+        "3. skipped: duplicate of #1",
+        report.splitlines()[4],
+    ]
+    assert report.splitlines()[4].startswith("4. invalid: ")
+    assert len(store) == 2
+    single = store_decisions_bulk_tool.run(decisions=json.dumps({"category": "api", "content": "GraphQL for the admin UI"}))
+    assert single.startswith("Stored 1 of 1 decisions.")
+
+
+@pytest.mark.parametrize("payload", ["not json", "[1, 2]", '"text"'])
+def test_store_decisions_bulk_rejects_bad_input(store, payload):
+    assert store_decisions_bulk_tool.run(decisions=payload).startswith("Error: decisions must be a JSON list")
+    assert len(store) == 0
+
+
+def test_retrieve_decisions(store):
+    assert retrieve_decisions_tool.run(query="redis") == "No stored decisions yet."
+    store.store("cache", "Use Redis for caching sessions")
+    assert "[cache] Use Redis for caching sessions" in retrieve_decisions_tool.run(query="redis")
+    assert retrieve_decisions_tool.run(query="kubernetes") == "No matching decisions found."
+
+
+def test_retrieve_decisions_bulk_shows_each_record_once(store):
+    store.store("cache", "Use Redis for caching sessions")
+    store.store("database", "Use PostgreSQL with Redis as a read cache")
+    report = retrieve_decisions_bulk_tool.run(
+        queries=json.dumps(["redis", {"query": "postgresql", "category": "database"}, {"query": 5}, "kubernetes"])
+    )
+    sections = report.split("\n\n")
+    assert sections[0].startswith("## redis") and "#1 " in sections[0] and "#2 " in sections[0]
+    assert sections[1] == "## postgresql (database)\nOnly decisions listed above."
+    assert sections[2].startswith("## Query 3\nError:")
+    assert sections[3] == "## kubernetes\nNo matching decisions."
+    assert retrieve_decisions_bulk_tool.run(queries="redis, postgresql").count("## ") == 2
+    assert retrieve_decisions_bulk_tool.run(queries="[]") == "No queries given."
+
+
+def test_cached_retrieval_sees_new_writes_and_counts_as_use(store):
+    store.store("cache", "Use Redis for caching sessions")
+    cache = ToolCache()
+    with cache.activated():
+        retrieve_decisions_tool.run(query="redis")
+        store.access_log().touch([1], when=1.0)
+        retrieve_decisions_tool.run(query="redis")  # a hit, but still a use
+        assert store.access_log().last_used([1])[1] > 1.0
+        store.store("cache", "Use Redis streams for the job queue")
+        assert "job queue" in retrieve_decisions_tool.run(query="redis")
+    stats = cache.report()[0]
+    assert (stats["hits"], stats["misses"], stats["stale"]) == (1, 1, 1)
@@ -0,0 +1,53 @@
+import pytest
+
+pytest.importorskip("numpy")
+
+from src import memory_vectors  # noqa: E402
+from src.memory_store import MemoryStore  # noqa: E402
+
+DECISIONS = [
+    ("database", "Use asyncpg pool for database connections"),
+    ("api", "Use FastAPI for the HTTP API layer with pydantic models for request validation"),
+    ("security", "Passwords are hashed with bcrypt, cost factor 12"),
+    ("ops", "Deploy as a Docker container behind nginx; one image per service"),
+    ("frontend", "Frontend is React with TypeScript and Vite, state kept in Zustand stores"),
+]
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = MemoryStore(tmp_path / "memory.jsonl")
+    store.store_many([{"category": c, "content": text} for c, text in DECISIONS])
+    return store
+
+
+def test_paraphrase_recalls_full_sentence(store):
+    found = store.retrieve("Postgres pooling", semantic=True)
+    assert found and found[0]["content"] == "Use asyncpg pool for database connections"
+
+
+def test_unrelated_query_finds_nothing(store):
+    index = store.vector_index()
+    assert index.search("kubernetes autoscaling") == []
+
+
+def test_search_respects_category(store):
+    index = store.vector_index()
+    assert index.search("Postgres pooling", category="frontend") == []
+    assert [rid for rid, _ in index.search("Postgres pooling", category="database")] == [1]
+
+
+def test_index_follows_deletes_and_new_records(store):
+    index = store.vector_index()
+    assert len(index) == len(DECISIONS)
+    store.delete(1)
+    rid = store.store("database", "Use a pgbouncer pool in front of Postgres")
+    index = store.vector_index()
+    assert len(index) == len(DECISIONS)
+    assert index.search("Postgres pooling")[0][0] == rid
+
+
+def test_reopened_index_matches(store, tmp_path):
+    store.vector_index()
+    reopened = memory_vectors.VectorIndex(tmp_path / "memory.vectors")
+    assert len(reopened) == len(DECISIONS)
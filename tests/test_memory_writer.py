@@ -0,0 +1,96 @@
+import multiprocessing
+import os
+import threading
+
+import pytest
+
+from src.memory_store import MemoryStore
+from src.memory_writer import FileLock, WriteQueue, fcntl
+
+
+def test_file_lock_is_reentrant(tmp_path):
+    lock = FileLock(tmp_path / "log.lock")
+    with lock.held():
+        with lock.held():
+            pass
+        assert lock._fd is not None
+    assert lock._fd is None
+
+
+@pytest.mark.skipif(fcntl is None, reason="needs fcntl")
+def test_file_lock_excludes_other_processes(tmp_path):
+    path = tmp_path / "log.lock"
+    with FileLock(path).held():
+        fd = os.open(path, os.O_RDWR)
+        try:
+            with pytest.raises(BlockingIOError):
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        finally:
+            os.close(fd)
+
+
+def test_write_queue_groups_commits_and_keeps_order():
+    gate = threading.Event()
+    batches = []
+
+    def commit(items):
+        gate.wait()
+        batches.append(list(items))
+        return [item * 10 for item in items]
+
+    queue = WriteQueue(commit)
+    first = queue.submit([1])
+    rest = [queue.submit([i, i + 1]) for i in (2, 4, 6)]
+    gate.set()
+    assert queue.flush(timeout=5)
+    assert first[0].result() == 10
+    assert [f.result() for futures in rest for f in futures] == [20, 30, 40, 50, 60, 70]
+    assert queue.committed == 7 and queue.commits == len(batches) <= 2
+    assert not queue.pending()
+
+
+def test_write_queue_propagates_errors():
+    def commit(items):
+        raise ValueError("disk full")
+
+    queue = WriteQueue(commit)
+    futures = queue.submit(["a", "b"])
+    assert queue.flush(timeout=5)
+    for future in futures:
+        with pytest.raises(ValueError, match="disk full"):
+            future.result()
+
+
+def test_concurrent_threads_lose_nothing(memory):
+    def writer(n):
+        for i in range(25):
+            memory.store("notes", f"writer {n} decision {i} {n * 1000 + i}")
+
+    threads = [threading.Thread(target=writer, args=(n,)) for n in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(memory) == 200
+    assert memory.ids() == list(range(1, 201))
+
+
+def _write_from_process(path, n):
+    store = MemoryStore(path)
+    for i in range(20):
+        store.store("notes", f"process {n} decision {i} {n * 1000 + i}")
+
+
+@pytest.mark.skipif(fcntl is None, reason="needs fcntl")
+def test_concurrent_processes_get_unique_ids(tmp_path, monkeypatch):
+    monkeypatch.delenv("MEMORY_DEDUP_THRESHOLD", raising=False)
+    path = tmp_path / "memory.jsonl"
+    ctx = multiprocessing.get_context("fork")
+    procs = [ctx.Process(target=_write_from_process, args=(path, n)) for n in range(4)]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join(30)
+        assert p.exitcode == 0
+    store = MemoryStore(path)
+    assert store.ids() == list(range(1, 81))
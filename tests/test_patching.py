@@ -0,0 +1,120 @@
+import pytest
+
+from src.patching import PatchError, apply_fix, is_patch, parse_blocks
+
+IMPLEMENTATION = """# Implementation
+
+Targets Python 3.11, e.g. for the new typing features.
+
+```bash
+pip install fastapi
+```
+
+### `src/app.py`
+```python
+def handler(x):
+    value = x * 2
+    return value
+```
+
+### `src/config.py`
+```python
+DEBUG = True
+```
+"""
+
+
+def test_parse_blocks_labels():
+    paths = [b.path for b in parse_blocks(IMPLEMENTATION)]
+    assert paths == [None, "src/app.py", "src/config.py"]
+
+
+def test_prose_does_not_name_a_block():
+    doc = "We use Python 3.11 here, e.g.\n```python\nprint(1)\n```\n"
+    assert parse_blocks(doc)[0].path is None
+
+
+def test_fence_info_and_file_marker_labels():
+    doc = "```python tests/test_app.py\npass\n```\n\nFILE: Dockerfile\n```\nFROM python:3.11\n```\n"
+    assert [b.path for b in parse_blocks(doc)] == ["tests/test_app.py", "Dockerfile"]
+
+
+def test_apply_unified_diff():
+    fix = """```diff
+--- a/src/app.py
++++ b/src/app.py
+@@ -1,3 +1,3 @@
+ def handler(x):
+-    value = x * 2
++    value = x * 3
+     return value
+```
+"""
+    result = apply_fix(IMPLEMENTATION, fix)
+    assert result.mode == "patch" and result.files == ["src/app.py"]
+    assert "value = x * 3" in result.text and "value = x * 2" not in result.text
+    assert "DEBUG = True" in result.text
+
+
+def test_apply_file_replacement_and_new_file():
+    fix = "FILE: src/config.py\n```python\nDEBUG = False\n```\n\nFILE: src/db.py\n```python\nPOOL = 5\n```\n"
+    result = apply_fix(IMPLEMENTATION, fix)
+    assert result.files == ["src/config.py", "src/db.py"]
+    blocks = {b.path: b.lines for b in parse_blocks(result.text)}
+    assert blocks["src/config.py"] == ["DEBUG = False"]
+    assert blocks["src/db.py"] == ["POOL = 5"]
+    assert blocks["src/app.py"][1] == "    value = x * 2"
+
+
+def test_full_rewrite_passes_through():
+    result = apply_fix(IMPLEMENTATION, "# Implementation\n\nAll new.\n")
+    assert result.mode == "rewrite" and result.text == "# Implementation\n\nAll new.\n"
+    assert not is_patch(result.text)
+
+
+def test_mismatched_hunk_is_rejected():
+    fix = "```diff\n--- a/src/app.py\n+++ b/src/app.py\n@@ -1,2 +1,2 @@\n def handler(x):\n-    return None\n+    return 0\n```\n"
+    with pytest.raises(PatchError):
+        apply_fix(IMPLEMENTATION, fix)
+
+
+def test_unknown_file_is_rejected():
+    fix = "```diff\n--- a/src/missing.py\n+++ b/src/missing.py\n@@ -1 +1 @@\n-a\n+b\n```\n"
+    with pytest.raises(PatchError):
+        apply_fix(IMPLEMENTATION, fix)
+
+
+def test_removed_line_that_looks_like_a_header():
+    implementation = "### `db/schema.sql`\n```sql\n-- users table\nCREATE TABLE users (id int);\n-- todo: drop\nSELECT 1;\n```\n"
+    fix = """```diff
+--- a/db/schema.sql
++++ b/db/schema.sql
+@@ -1,4 +1,3 @@
+ -- users table
+ CREATE TABLE users (id int);
+--- todo: drop
+ SELECT 1;
+```
+"""
+    result = apply_fix(implementation, fix)
+    assert result.files == ["db/schema.sql"]
+    assert parse_blocks(result.text)[0].lines == ["-- users table", "CREATE TABLE users (id int);", "SELECT 1;"]
+
+
+def test_diff_with_several_files():
+    fix = """```diff
+--- a/src/app.py
++++ b/src/app.py
+@@ -2,1 +2,1 @@
+-    value = x * 2
++    value = x * 4
+--- a/src/config.py
++++ b/src/config.py
+@@ -1 +1 @@
+-DEBUG = True
++DEBUG = False
+```
+"""
+    result = apply_fix(IMPLEMENTATION, fix)
+    assert result.files == ["src/app.py", "src/config.py"]
+    assert "value = x * 4" in result.text and "DEBUG = False" in result.text
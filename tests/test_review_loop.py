@@ -0,0 +1,54 @@
+from src.review_loop import ReviewLoop, parse_verdict
+
+
+def test_verdict_line():
+    v = parse_verdict('Looks fine.\nVERDICT: {"critical": 0, "high": 2, "medium": 1, "low": 0}')
+    assert (v.critical, v.high, v.medium, v.low, v.source) == (0, 2, 1, 0, "verdict")
+    assert v.blocking
+
+
+def test_last_verdict_line_wins():
+    v = parse_verdict('VERDICT: {"high": 3}\nAfter re-checking:\nVERDICT: {"high": 0, "low": 1}')
+    assert (v.high, v.low, v.blocking) == (0, 1, False)
+
+
+def test_unreadable_merged_review_blocks():
+    v = parse_verdict('VERDICT: {"critical": 0, "high": 0, "medium": 0, "low": 0, "unreadable": 1}')
+    assert v.source == "unknown" and v.blocking
+
+
+def test_count_lines_fallback():
+    v = parse_verdict("## Summary\n- **Critical:** 0\n- **High issues:** 1\nLow: 4 issues\n")
+    assert (v.critical, v.high, v.low, v.source) == (0, 1, 4, "counts")
+
+
+def test_counts_in_prose_are_ignored():
+    for text in (
+        "Found high latency in 3 places.",
+        "Targets Python 3.11, e.g. 2 critical paths were profiled.",
+        "High: 2 endpoints lack authentication.",
+    ):
+        assert parse_verdict(text).source == "unknown", text
+
+
+def test_approved_without_counts():
+    assert parse_verdict("Approved, no further changes.").source == "approved"
+    assert parse_verdict("Not approved: changes requested.").source == "unknown"
+
+
+class _Output:
+    def __init__(self, raw: str):
+        self.raw = raw
+
+
+def test_loop_stops_when_no_blocking_issues():
+    loop = ReviewLoop(max_cycles=2)
+    assert loop.should_fix(_Output('VERDICT: {"high": 1}'))
+    assert not loop.should_fix(_Output('VERDICT: {"high": 0, "low": 2}'))
+    assert loop.cycles_run == 1
+
+
+def test_loop_respects_cycle_cap():
+    loop = ReviewLoop(max_cycles=1)
+    assert loop.should_fix(_Output('VERDICT: {"critical": 1}'))
+    assert not loop.should_fix(_Output('VERDICT: {"critical": 1}'))
@@ -0,0 +1,56 @@
+import json
+
+from src.review_loop import parse_verdict
+from src.review_panel import SPECIALISTS, merge_reviews, review_mode_from_env
+
+CORRECTNESS, PERFORMANCE, SECURITY = SPECIALISTS
+
+
+def _verdict(report):
+    return json.loads(report.rstrip().splitlines()[-1].split("VERDICT:", 1)[1])
+
+
+def test_review_mode_from_env(monkeypatch):
+    monkeypatch.delenv("REVIEW_MODE", raising=False)
+    assert review_mode_from_env() == "single"
+    monkeypatch.setenv("REVIEW_MODE", " Parallel ")
+    assert review_mode_from_env() == "parallel"
+    monkeypatch.setenv("REVIEW_MODE", "both")
+    assert review_mode_from_env() == "single"
+
+
+def test_merge_sums_the_passes():
+    report = merge_reviews([
+        (CORRECTNESS, '- [high] Off-by-one in pagination\nVERDICT: {"critical": 0, "high": 1, "medium": 0, "low": 0}'),
+        (PERFORMANCE, 'No issues found.\nVERDICT: {"critical": 0, "high": 0, "medium": 0, "low": 0}'),
+        (SECURITY, '- [critical] SQL injection in login\nVERDICT: {"critical": 1, "high": 0, "medium": 0, "low": 0}'),
+    ])
+    assert _verdict(report) == {"critical": 1, "high": 1, "medium": 0, "low": 0}
+    assert report.index("## Correctness") < report.index("## Performance") < report.index("## Security")
+    assert "| **total** | 1 | 1 | 0 | 0 |" in report
+    assert parse_verdict(report).blocking
+
+
+def test_a_finding_reported_twice_is_counted_once():
+    shared = "SQL query built by string concatenation in `get_user`"
+    report = merge_reviews([
+        (CORRECTNESS, f'## High\n- {shared}\n- Missing null check\nVERDICT: {{"critical": 0, "high": 2, "medium": 0, "low": 0}}'),
+        (PERFORMANCE, f'- **Medium:** Missing index on users.email\nVERDICT: {{"critical": 0, "high": 0, "medium": 1, "low": 0}}'),
+        (SECURITY, f'- [critical] {shared}\n  - details stay\nVERDICT: {{"critical": 1, "high": 0, "medium": 0, "low": 0}}'),
+    ])
+    assert _verdict(report) == {"critical": 0, "high": 2, "medium": 1, "low": 0}
+    assert report.count("string concatenation") == 1
+    assert "- details stay" in report
+    assert "### High" in report  # headings nest under the pass's section
+    assert "Counts exclude 1 finding(s) already reported by an earlier pass." in report
+
+
+def test_a_pass_without_a_verdict_keeps_the_review_blocking():
+    report = merge_reviews([
+        (CORRECTNESS, 'VERDICT: {"critical": 0, "high": 0, "medium": 0, "low": 0}'),
+        (SECURITY, "The model ran out of tokens before"),
+    ])
+    assert _verdict(report)["unreadable"] == 1
+    assert "Passes without severity counts: security." in report
+    assert "No issues reported." in report
+    assert parse_verdict(report).blocking
@@ -0,0 +1,85 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+pytest.importorskip("crewai")
+
+from src.context_budget import BudgetedConditionalTask, BudgetedTask
+from src.scheduler import dependency_graph, schedule, timing_report
+
+
+def _task(name, agent_key, context=None, conditional=False):
+    cls = BudgetedConditionalTask if conditional else BudgetedTask
+    extra = {"condition": lambda _: True} if conditional else {}
+    return cls(
+        description=f"{name} task", expected_output=f"{name} output", name=name,
+        agent_key=agent_key, context=context or [], **extra,
+    )
+
+
+def _pipeline():
+    research = _task("research", "research")
+    preload = _task("preload", "memory")
+    architect = _task("architect", "architect", [research, preload])
+    code = _task("code", "code_generator", [architect])
+    review = _task("review", "reviewer", [code])
+    fix = _task("fix", "fixer", [code, review], conditional=True)
+    memory = _task("memory", "memory", [research, architect, review])
+    return [research, preload, architect, code, review, fix, memory]
+
+
+def test_dependency_graph():
+    tasks = _pipeline()
+    graph = dependency_graph(tasks)
+    assert graph[0] == set() and graph[2] == {0, 1}
+    assert graph[5] == {3, 4}  # the conditional fix also reads the task just before it
+    assert graph[6] == {0, 2, 4}
+
+
+def test_schedule_orders_by_level_and_runs_independent_tasks_together():
+    tasks = _pipeline()
+    ordered = schedule(tasks)
+    names = [t.name for t in ordered]
+    assert names[:2] == ["research", "preload"]
+    for task in ordered:
+        for dep in task.context:
+            assert names.index(dep.name) < names.index(task.name)
+    assert [t.name for t in ordered if t.async_execution] == ["research", "preload"]
+    assert names.index("fix") == names.index("review") + 1
+    assert not ordered[-1].async_execution
+
+
+def test_one_agent_runs_one_task_at_a_time():
+    first = _task("first", "memory")
+    second = _task("second", "memory")
+    other = _task("other", "research")
+    ordered = schedule([first, second, other])
+    assert [t.name for t in ordered] == ["first", "other", "second"]
+    assert first.async_execution and other.async_execution
+    assert not second.async_execution  # the barrier that waits for both
+
+
+@pytest.mark.parametrize("make", ["cycle", "self", "forward"])
+def test_cycles_and_forward_references_are_rejected(make):
+    a, b = _task("a", "research"), _task("b", "architect")
+    if make == "cycle":
+        b.context = [a]
+        a.context = [b]
+    elif make == "self":
+        a.context = [a]
+    else:
+        a.context = [b]
+    with pytest.raises(ValueError, match="must not form a cycle"):
+        schedule([a, b])
+
+
+def test_timing_report_follows_the_critical_path():
+    tasks = _pipeline()
+    start = datetime(2024, 1, 1)
+    for task, duration in zip(tasks, (10, 2, 5, 20, 4, None, 3)):
+        if duration is not None:  # the fix was skipped
+            task.start_time, task.end_time = start, start + timedelta(seconds=duration)
+    report = timing_report(tasks, wall_time=40.0)
+    assert report["sequential"] == 44 and report["wall"] == 40.0
+    assert report["critical_path"] == 42
+    assert report["critical_tasks"] == ["research", "architect", "code", "review", "memory"]
@@ -0,0 +1,115 @@
+import http.client
+import json
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("crewai")
+
+from src.server import CrewService, make_server
+
+
+class FakeService(CrewService):
+    """CrewService whose runs finish at once instead of running a crew."""
+
+    def __init__(self, **kwargs):
+        super().__init__(workers=1, **kwargs)
+        self.submitted = []
+        self.release = threading.Event()
+        self.release.set()
+
+    def _run(self, run, max_fix_cycles):
+        self.submitted.append((run.status.topic, max_fix_cycles))
+        self._update(run, status="running")
+        self.release.wait(5)
+        (Path(run.status.output_dir) / "result.md").write_text(f"built {run.status.topic}", encoding="utf-8")
+        self._update(run, status="done", fix_cycles=0)
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv("MAX_FIX_CYCLES", raising=False)
+    service = FakeService(max_queued=1)
+    yield service
+    service.release.set()
+    service.shutdown()
+
+
+@pytest.fixture
+def request_(service):
+    server = make_server(service, port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    def send(method, path, body=None):
+        conn = http.client.HTTPConnection("127.0.0.1", server.server_address[1], timeout=10)
+        data = body if isinstance(body, (bytes, type(None))) else json.dumps(body).encode("utf-8")
+        conn.request(method, path, body=data, headers={"Content-Length": str(len(data or b""))})
+        response = conn.getresponse()
+        text = response.read().decode("utf-8")
+        conn.close()
+        if response.getheader("Content-Type") == "application/json":
+            return response.status, json.loads(text)
+        return response.status, text
+
+    yield send
+    server.shutdown()
+    server.server_close()
+
+
+def _wait_for(service, run_id, *states):
+    run = service.runs[run_id]
+    deadline = time.time() + 5
+    while run.status.status not in states and time.time() < deadline:
+        time.sleep(0.01)
+    return run
+
+
+@pytest.mark.parametrize("body, error", [
+    (b"not json", "body must be JSON"),
+    ({}, "'topic' is required"),
+    ({"topic": "   "}, "'topic' is required"),
+    (["a list"], "'topic' is required"),
+    ({"topic": "API", "max_fix_cycles": True}, "'max_fix_cycles' must be a non-negative integer"),
+    ({"topic": "API", "max_fix_cycles": -1}, "'max_fix_cycles' must be a non-negative integer"),
+    ({"topic": "API", "max_fix_cycles": "2"}, "'max_fix_cycles' must be a non-negative integer"),
+    ({"topic": "API", "max_fix_cycles": 1.5}, "'max_fix_cycles' must be a non-negative integer"),
+])
+def test_post_rejects_invalid_input(service, request_, body, error):
+    assert request_("POST", "/runs", body) == (400, {"error": error})
+    assert not service.runs
+
+
+def test_run_lifecycle(service, request_):
+    status, run = request_("POST", "/runs", {"topic": "Build a REST API", "id": "api run", "max_fix_cycles": 0})
+    assert status == 202 and run["run_id"] == "api-run"
+    _wait_for(service, "api-run", "done")
+    assert service.submitted == [("Build a REST API", 0)]
+    assert request_("GET", "/runs/api-run")[1]["status"] == "done"
+    assert request_("GET", "/runs/api-run/result")[1]["result"] == "built Build a REST API"
+    status, events = request_("GET", "/runs/api-run/events")
+    assert status == 200
+    assert [json.loads(line)["status"] for line in events.splitlines()] == ["queued", "running", "done"]
+    assert request_("GET", "/health")[1] == {"status": "ok", "workers": 1, "queued": 0, "running": 0, "done": 1, "failed": 0}
+    assert request_("POST", "/runs", {"topic": "Again", "id": "api-run"})[0] == 409
+
+
+def test_prompt_alias_and_default_cycles(service, request_):
+    status, run = request_("POST", "/runs", {"prompt": "CLI tool"})
+    assert status == 202
+    _wait_for(service, run["run_id"], "done")
+    assert service.submitted == [("CLI tool", service.max_fix_cycles)]
+
+
+def test_result_before_done_and_unknown_runs(service, request_):
+    service.release.clear()
+    request_("POST", "/runs", {"topic": "Slow", "id": "slow"})
+    _wait_for(service, "slow", "running")  # the only worker is busy from here on
+    assert request_("GET", "/runs/slow/result")[0] == 409
+    assert request_("POST", "/runs", {"topic": "Queued", "id": "queued"})[0] == 202
+    assert request_("POST", "/runs", {"topic": "Overflow", "id": "overflow"})[0] == 429
+    assert request_("GET", "/runs/missing") == (404, {"error": "no run 'missing'"})
+    assert request_("GET", "/nowhere")[0] == 404
+    assert request_("POST", "/elsewhere", {"topic": "x"})[0] == 404
@@ -0,0 +1,83 @@
+import json
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("crewai")
+
+from crewai.events import TaskCompletedEvent, TaskFailedEvent
+from crewai.tasks.task_output import TaskOutput
+
+from src.context_budget import BudgetedTask
+from src.telemetry import Telemetry, active
+
+
+def _tasks():
+    research = BudgetedTask(description="research", expected_output="notes", name="research")
+    code = BudgetedTask(description="code", expected_output="code", name="code", context=[research])
+    return research, code
+
+
+def _at(seconds):
+    return datetime.fromtimestamp(1_700_000_000 + seconds)
+
+
+def test_task_timing_and_queue_wait():
+    research, code = _tasks()
+    telemetry = Telemetry([research, code])
+    telemetry.started = _at(0).timestamp()
+    telemetry.on_task_start(None, SimpleNamespace(task=research, timestamp=_at(1)))
+    output = TaskOutput(name="research", description="research", agent="Researcher", raw="notes")
+    telemetry.on_task_end(None, TaskCompletedEvent(task=research, output=output, timestamp=_at(11)))
+    telemetry.on_task_start(None, SimpleNamespace(task=code, timestamp=_at(14)))
+    telemetry.on_task_end(None, TaskFailedEvent(task=code, error="timeout", timestamp=_at(20)))
+
+    rows = {r["task"]: r for r in telemetry.report()["tasks"]}
+    assert (rows["research"]["status"], rows["research"]["wall"], rows["research"]["queue_wait"]) == ("done", 10, 1)
+    assert (rows["code"]["status"], rows["code"]["wall"], rows["code"]["queue_wait"]) == ("failed", 6, 3)
+
+
+def test_llm_calls_are_summed_per_task_agent_and_tier():
+    research, code = _tasks()
+    telemetry = Telemetry([research, code])
+    telemetry.record_llm_call("research", "Researcher", 2.0, 0.5, 100, 20, False, tier="light")
+    telemetry.record_llm_call("research", "Researcher", 0.0, 0.0, 100, 20, True, tier="light")
+    telemetry.record_llm_call("code", "Coder", 5.0, 0.0, 300, 900, False, tier="strong")
+    telemetry.record_llm_call(None, None, 1.0, 0.0, 10, 1, False)
+    report = telemetry.report()
+
+    rows = {r["task"]: r for r in report["tasks"]}
+    assert rows["research"]["llm_calls"] == 2 and rows["research"]["cache_hits"] == 1
+    assert rows["research"]["limiter_wait"] == 0.5 and rows["(no task)"]["prompt_tokens"] == 10
+    tiers = {t["tier"]: t for t in report["tiers"]}
+    assert set(tiers) == {"light", "strong", "(none)"}
+    assert (tiers["light"]["prompt_tokens"], tiers["strong"]["completion_tokens"]) == (200, 900)
+    agents = {a["agent"]: a for a in report["agents"]}
+    assert agents["Coder"]["llm_seconds"] == 5.0 and agents["Researcher"]["tasks"] == 1
+
+
+def test_tool_guardrail_and_error_counters():
+    research, _ = _tasks()
+    telemetry = Telemetry([research])
+    start = datetime(2024, 1, 1, 0, 0, 0)
+    finish = datetime(2024, 1, 1, 0, 0, 2)
+    telemetry.on_tool(None, SimpleNamespace(task=research, tool_name="read_file_tool", started_at=start, finished_at=finish))
+    telemetry.on_guardrail(None, SimpleNamespace(task=research, success=False, retry_count=0, error="bad patch"))
+    telemetry.on_guardrail(None, SimpleNamespace(task=research, success=True, retry_count=1, error=None))
+    telemetry.on_llm_failed(None, SimpleNamespace(task=research, error="429"))
+    row = telemetry.report()["tasks"][0]
+    assert (row["tool_calls"], row["tool_seconds"], row["retries"], row["llm_errors"]) == (1, 2.0, 1, 1)
+
+
+def test_attached_writes_jsonl(tmp_path):
+    research, code = _tasks()
+    telemetry = Telemetry([research, code], path=tmp_path / "run" / "telemetry.jsonl")
+    with telemetry.attached():
+        assert active() is telemetry
+        telemetry.record_llm_call("code", "Coder", 1.0, 0.0, 10, 5, False, tier="strong")
+    assert active() is None
+    events = [json.loads(line) for line in (tmp_path / "run" / "telemetry.jsonl").read_text().splitlines()]
+    assert [e["event"] for e in events] == ["run_start", "llm_call", "run_end"]
+    assert events[0]["tasks"] == ["research", "code"]
+    assert events[-1]["tiers"][0]["tier"] == "strong"
@@ -0,0 +1,101 @@
+import os
+
+import pytest
+
+from src.tool_cache import ToolCache, cached_call, memory_dep, path_dep
+
+
+def _bump_mtime(path):
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+def _reader(path, calls):
+    def compute():
+        calls.append(path)
+        return path.read_text(), [path_dep(path)]
+    return compute
+
+
+def test_without_an_active_cache_every_call_computes(tmp_path):
+    path, calls = tmp_path / "a.txt", []
+    path.write_text("one")
+    assert cached_call("read", (str(path),), _reader(path, calls)) == "one"
+    assert cached_call("read", (str(path),), _reader(path, calls)) == "one"
+    assert len(calls) == 2
+
+
+def test_file_results_are_invalidated_when_the_file_changes(tmp_path):
+    path, calls = tmp_path / "a.txt", []
+    path.write_text("one")
+    cache = ToolCache()
+    with cache.activated():
+        assert cached_call("read", (str(path),), _reader(path, calls)) == "one"
+        assert cached_call("read", (str(path),), _reader(path, calls)) == "one"
+        path.write_text("two")  # same size: caught by the mtime
+        _bump_mtime(path)
+        assert cached_call("read", (str(path),), _reader(path, calls)) == "two"
+        path.unlink()
+        path.write_text("three!")
+        assert cached_call("read", (str(path),), _reader(path, calls)) == "three!"
+    assert len(calls) == 3
+    assert cache.report() == [{"tool": "read", "calls": 4, "hits": 1, "misses": 1, "stale": 2, "hit_rate": 0.25}]
+
+
+def test_arguments_are_part_of_the_key(tmp_path):
+    path, calls = tmp_path / "a.txt", []
+    path.write_text("one")
+    with ToolCache().activated():
+        cached_call("read", (str(path), 0), _reader(path, calls))
+        cached_call("read", (str(path), 1), _reader(path, calls))
+        cached_call("other", (str(path), 0), _reader(path, calls))
+    assert len(calls) == 3
+
+
+def test_directory_listings_are_invalidated_when_an_entry_is_added(tmp_path):
+    calls = []
+
+    def listing():
+        calls.append(1)
+        return ",".join(sorted(p.name for p in tmp_path.iterdir())), [("dir", str(tmp_path), os.stat(tmp_path).st_mtime_ns)]
+
+    (tmp_path / "a.py").write_text("")
+    with ToolCache().activated():
+        assert cached_call("ls", (), listing) == "a.py"
+        assert cached_call("ls", (), listing) == "a.py"
+        (tmp_path / "b.py").write_text("")
+        _bump_mtime(tmp_path)
+        assert cached_call("ls", (), listing) == "a.py,b.py"
+    assert len(calls) == 2
+
+
+def test_memory_results_are_invalidated_by_a_write(memory):
+    calls = []
+
+    def search():
+        calls.append(1)
+        return str(len(memory)), [memory_dep(memory)]
+
+    memory.store("api", "REST with JSON bodies")
+    with ToolCache().activated():
+        assert cached_call("retrieve", (), search) == "1"
+        assert cached_call("retrieve", (), search) == "1"
+        memory.store("api", "GraphQL for the admin UI")
+        assert cached_call("retrieve", (), search) == "2"
+    assert len(calls) == 2
+
+
+def test_read_file_tool_sees_edits(tmp_path, monkeypatch):
+    pytest.importorskip("crewai")
+    from src.tools import docs_tools
+
+    monkeypatch.setattr(docs_tools, "_PROJECT_ROOT", tmp_path)
+    path = tmp_path / "notes.md"
+    path.write_text("first version")
+    with ToolCache().activated() as cache:
+        assert "first version" in docs_tools.read_file_tool.run(file_path="notes.md")
+        assert "first version" in docs_tools.read_file_tool.run(file_path="notes.md")
+        path.write_text("second version, longer")
+        assert "second version" in docs_tools.read_file_tool.run(file_path="notes.md")
+    stats = cache.report()[0]
+    assert (stats["hits"], stats["misses"], stats["stale"]) == (1, 1, 1)